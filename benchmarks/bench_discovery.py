@@ -0,0 +1,74 @@
+"""
+Benchmark of the file discovery on a synthetic tree.
+
+    python -m benchmarks.bench_discovery --entries 100000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from pycaro.api.files import gen_python_files, get_gitignore
+
+# Share of the generated files per suffix
+SUFFIXES = [".py"] * 6 + [".pyi", ".txt", ".json", ".cfg"]
+# Directories created in each package, pruned by the discovery
+PRUNED_DIRS = [".venv", "node_modules", "build", "__pycache__"]
+
+
+def generate_tree(root: Path, entries: int, files_per_dir: int = 40) -> int:
+    """
+    Create about `entries` files and directories under `root`, half of them in
+    directories that discovery should prune. Returns the number of entries created.
+    """
+    root.joinpath(".gitignore").write_text("*.log\n/ignored/\n")
+    created = 1
+    package = 0
+    while created < entries:
+        package_dir = root.joinpath(f"pkg{package // 50}", f"sub{package}")
+        package_dir.mkdir(parents=True)
+        created += 1
+        for i in range(files_per_dir // 2):
+            package_dir.joinpath(f"module{i}{SUFFIXES[i % len(SUFFIXES)]}").touch()
+        created += files_per_dir // 2
+
+        pruned = package_dir.joinpath(PRUNED_DIRS[package % len(PRUNED_DIRS)])
+        pruned.mkdir()
+        for i in range(files_per_dir // 2):
+            pruned.joinpath(f"vendored{i}.py").touch()
+        created += 1 + files_per_dir // 2
+        package += 1
+
+    return created
+
+
+def run(entries: int, repeat: int = 3):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp).resolve()
+        created = generate_tree(root, entries=entries)
+
+        timings = []
+        for _ in range(repeat):
+            get_gitignore.cache_clear()
+            start = time.perf_counter()
+            found = sum(
+                1
+                for _ in gen_python_files(
+                    paths=[root], root=root, gitignore=get_gitignore(root)
+                )
+            )
+            timings.append(time.perf_counter() - start)
+
+    print(
+        f"{created} entries, {found} files found, "
+        f"best of {repeat}: {min(timings):.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(entries=args.entries, repeat=args.repeat)
@@ -0,0 +1,116 @@
+"""
+Synthetic corpus generator for the benchmarks.
+
+    python -m benchmarks.corpus /tmp/corpus --modules 200 --functions 20 --unbound 3
+"""
+
+import argparse
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+CORPUS_PACKAGE = "bench_corpus"
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """
+    Shape of a generated corpus
+    """
+
+    # Number of modules
+    modules: int = 200
+    # Number of functions per module
+    functions: int = 20
+    # Number of unbound names per function
+    unbound: int = 3
+    # Bounds of the number of filler lines per function, to vary file sizes
+    min_filler: int = 0
+    max_filler: int = 20
+    # Depth of the package tree the modules are spread in
+    depth: int = 2
+    seed: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _function_source(
+    index: int,
+    unbound: int,
+    filler: int,
+) -> str:
+    lines = [
+        f"def function_{index}(arg):",
+        '    """Generated function"""',
+        "    local = arg",
+    ]
+    for i in range(filler):
+        lines.append(f"    local = local + {i}  # filler {i}")
+    lines.append("    values = [path.join(str(v), 'x') for v in range(local)]")
+    lines.append("    helper(values, CONSTANT)")
+    for i in range(unbound):
+        lines.append(f"    print(unbound_{index}_{i}, arg.attribute_{i})")
+    lines.append("    return local")
+    return "\n".join(lines) + "\n"
+
+
+def module_source(spec: CorpusSpec, rng: random.Random) -> str:
+    parts = [
+        "from os import path\n",
+        "CONSTANT = 1\n",
+        "\ndef helper(*args):\n    return args\n",
+    ]
+    for index in range(spec.functions):
+        parts.append("\n\n")
+        parts.append(
+            _function_source(
+                index=index,
+                unbound=spec.unbound,
+                filler=rng.randint(spec.min_filler, spec.max_filler),
+            )
+        )
+    parts.append("\n\nif __name__ == '__main__':\n")
+    parts.append(
+        "".join(
+            f"    unbound_{index}_{i} = 1\n"
+            for index in range(spec.functions)
+            for i in range(spec.unbound)
+        )
+        or "    pass\n"
+    )
+    return "".join(parts)
+
+
+def generate_corpus(root: Path, spec: CorpusSpec) -> Path:
+    """
+    Write a corpus following `spec` in `root`, which becomes a project root. Modules
+    are importable as `bench_corpus.*` when `root` is in `sys.path`.
+    :return: the directory of the corpus package
+    """
+    rng = random.Random(spec.seed)
+    root.mkdir(parents=True, exist_ok=True)
+    root.joinpath("pyproject.toml").touch()
+    package = root.joinpath(CORPUS_PACKAGE)
+
+    for index in range(spec.modules):
+        directory = package
+        for level in range(spec.depth):
+            directory = directory.joinpath(f"pkg_{level}_{index % (3 + level)}")
+        directory.mkdir(parents=True, exist_ok=True)
+        directory.joinpath(f"module_{index}.py").write_text(module_source(spec, rng))
+
+    for directory in [package, *package.rglob("pkg_*")]:
+        directory.joinpath("__init__.py").touch()
+
+    return package
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("root", type=Path)
+    for name, default in CorpusSpec().as_dict().items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+    args = vars(parser.parse_args())
+    root = args.pop("root")
+    print(generate_corpus(root, CorpusSpec(**args)))
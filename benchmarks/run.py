@@ -0,0 +1,188 @@
+"""
+Time each stage of the pycaro pipeline on a synthetic corpus, and store the results
+as JSON to compare commits on the same machine.
+
+    python -m benchmarks.run --engine static --output before.json
+    python -m benchmarks.run --engine static --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+from benchmarks.corpus import CORPUS_PACKAGE, CorpusSpec, generate_corpus
+from pycaro.api.constants import ENGINES, ENGINE_STATIC
+from pycaro.api.files import find_project_root, get_files
+from pycaro.api.pycaro_types import UnstableModule, UnstableModuleObject
+from pycaro.api.validate import ModuleChecker
+from pycaro.render import StdoutSummary
+
+STAGES = [
+    "discovery",
+    "construction",
+    "get_method_var_names",
+    "get_var_name_first_usage",
+    "render",
+]
+
+
+class StageTimer:
+    def __init__(self):
+        self.timings: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - start
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return (
+            subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                cwd=Path(__file__).parent,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                check=True,
+            )
+            .stdout.decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _forget_corpus():
+    for name in list(sys.modules):
+        if name == CORPUS_PACKAGE or name.startswith(CORPUS_PACKAGE + "."):
+            del sys.modules[name]
+
+
+def run_once(corpus: Path, engine: str) -> dict:
+    timer = StageTimer()
+    counts = {"modules": 0, "functions": 0, "names": 0, "unstable_vars": 0}
+    _forget_corpus()
+
+    with timer.stage("discovery"):
+        paths = list(get_files([corpus.as_posix()]))
+
+    unstable_modules = []
+    for path in paths:
+        with timer.stage("construction"):
+            checker = ModuleChecker(path, engine=engine)
+        counts["modules"] += 1
+
+        unstable_module_objects = []
+        for module_object in sorted(checker.module_objects):
+            counts["functions"] += 1
+            with timer.stage("get_method_var_names"):
+                var_names = checker.get_method_var_names(module_object)
+            counts["names"] += len(var_names)
+
+            unbound = [
+                var_name
+                for var_name in var_names
+                if not checker.is_valid_name(var_name)
+            ]
+            with timer.stage("get_var_name_first_usage"):
+                unstable_vars = [
+                    checker.get_var_name_first_usage(module_object, var_name)
+                    for var_name in unbound
+                ]
+            counts["unstable_vars"] += len(unstable_vars)
+            if unstable_vars:
+                unstable_module_objects.append(
+                    UnstableModuleObject(
+                        module_object=module_object, unstable_vars=unstable_vars
+                    )
+                )
+
+        if unstable_module_objects:
+            unstable_modules.append(
+                UnstableModule(
+                    module_path=path.as_posix(),
+                    unstable_module_objects=unstable_module_objects,
+                )
+            )
+
+    with timer.stage("render"):
+        lines = sum(1 for _ in StdoutSummary().render(entries=unstable_modules))
+    counts["lines"] = lines
+
+    return {"stages": timer.timings, "counts": counts}
+
+
+def run(spec: CorpusSpec, engine: str, repeat: int) -> dict:
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp).resolve()
+        corpus = generate_corpus(root, spec)
+
+        # The corpus is a project on its own, importable by the `import` engine
+        os.chdir(root)
+        sys.path.insert(0, root.as_posix())
+        find_project_root.cache_clear()
+        try:
+            runs = [run_once(corpus.relative_to(root), engine) for _ in range(repeat)]
+        finally:
+            os.chdir(cwd)
+            sys.path.remove(root.as_posix())
+            find_project_root.cache_clear()
+            _forget_corpus()
+
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "engine": engine,
+        "corpus": spec.as_dict(),
+        "repeat": repeat,
+        # Best of all runs for each stage
+        "stages": {
+            stage: min(result["stages"][stage] for result in runs) for stage in STAGES
+        },
+        "counts": runs[0]["counts"],
+    }
+
+
+def compare(result: dict, reference: dict):
+    print(f"{'stage':<28}{'reference':>12}{'current':>12}{'ratio':>8}")
+    for stage in STAGES:
+        before = reference["stages"].get(stage)
+        after = result["stages"][stage]
+        ratio = f"{after / before:.2f}" if before else "-"
+        before = f"{before:.4f}" if before is not None else "-"
+        print(f"{stage:<28}{before:>12}{after:>12.4f}{ratio:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    for name, default in CorpusSpec().as_dict().items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+    parser.add_argument("--engine", choices=ENGINES, default=ENGINE_STATIC)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="JSON file to write results to")
+    parser.add_argument("--compare", type=Path, help="JSON results to compare with")
+    args = vars(parser.parse_args())
+
+    options = {key: args.pop(key) for key in ["engine", "repeat", "output", "compare"]}
+    result = run(CorpusSpec(**args), engine=options["engine"], repeat=options["repeat"])
+
+    if options["output"] is not None:
+        options["output"].write_text(json.dumps(result, indent=2))
+    if options["compare"] is not None:
+        compare(result, json.loads(options["compare"].read_text()))
+    else:
+        print(json.dumps(result, indent=2))
@@ -1,22 +1,22 @@
 from typing import Tuple
 
-from pycaro import ModuleChecker
-from pycaro.files import get_files
+from pycaro.api.files import BatchContext, get_files
+from pycaro.api.validate import get_module_checker_generator
 from pycaro.render import StdoutSummary
 
 
 def check(src: Tuple[str, ...]):
     prepared_writer = StdoutSummary()
+    context = BatchContext()
 
     for line in prepared_writer.render(
-        entries=(
-            ModuleChecker(path).as_unstable_module
-            for path in get_files(src)
-            if ModuleChecker(path).as_unstable_module
+        entries=get_module_checker_generator(
+            get_files(src, context=context),
+            context=context,
         )
     ):
         print(line)
 
 
 if __name__ == "__main__":
-    check(src=("tests/assets/",))
+    check(src=("tests/use_cases/assets/",))
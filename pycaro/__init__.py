@@ -1,7 +1,20 @@
-from pycaro.api.validate import ModuleChecker
+import sys
 
-__all__ = [
-    "ModuleChecker"
-]
+__all__ = ["ModuleChecker"]
 
 __version__ = "0.0.1.dev1"
+
+
+# `pycaro.api.validate` is only imported once `ModuleChecker` is used, so that
+# importing `pycaro` (and starting the CLI) stays cheap
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name: str):
+        if name == "ModuleChecker":
+            from pycaro.api.validate import ModuleChecker
+
+            return ModuleChecker
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+else:
+    from pycaro.api.validate import ModuleChecker
@@ -0,0 +1,91 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import AsyncIterator, Deque, Iterable, Optional, Tuple
+
+from pycaro.api.constants import ASYNC_CONCURRENCY, ENGINE_STATIC
+from pycaro.api.files import BatchContext
+from pycaro.api.pycaro_types import UnstableModule
+from pycaro.api.source import SourceFile
+from pycaro.api.validate import ModuleCollectionCheck
+
+# `asyncio.get_running_loop` is only available from python 3.7
+_get_running_loop = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)
+
+
+def _read_source(path: Path) -> str:
+    # Decoded with the encoding of the source (PEP 263), as `SourceFile` does
+    with open(path.as_posix(), "rb") as f:
+        return SourceFile(f.read()).text()
+
+
+async def check_paths_async(
+    paths: Iterable[Path],
+    concurrency: int = ASYNC_CONCURRENCY,
+    engine: str = ENGINE_STATIC,
+    context: Optional[BatchContext] = None,
+) -> AsyncIterator[UnstableModule]:
+    """
+    Same as `get_module_checker_generator`, as an asynchronous generator that never
+    blocks the event loop.
+
+    Up to `concurrency` module sources are read ahead by a pool of threads, while
+    the modules already read are checked one at a time by another thread: reads
+    overlap with the analysis. `paths` are iterated by a thread as well, since
+    discovery may walk the filesystem. Results are yielded in the order of `paths`.
+
+    Closing the generator, or cancelling the task iterating over it, cancels the
+    pending reads. A check already running is left to complete in its thread.
+    :param paths: paths of the modules to check, see `get_files`
+    :param concurrency: maximum number of sources read or waiting to be checked
+    :param engine: engine used to get each module namespace: only the static
+    engine checks the sources read ahead
+    :param context: context shared by the checks of all `paths`, created once for
+    them by default
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    if engine != ENGINE_STATIC:
+        raise ValueError(
+            f"Unsupported engine `{engine}`: the `{ENGINE_STATIC}` engine only "
+            f"checks the sources read ahead"
+        )
+
+    loop = _get_running_loop()
+    run = ModuleCollectionCheck([], engine=engine, context=context)
+    paths = iter(paths)
+
+    readers = ThreadPoolExecutor(max_workers=concurrency)
+    # Checks share the symbol index: never run concurrently
+    checker = ThreadPoolExecutor(max_workers=1)
+    discovery = ThreadPoolExecutor(max_workers=1)
+    reads: Deque[Tuple[Path, "asyncio.Future[str]"]] = deque()
+
+    async def read_ahead():
+        next_paths = islice(paths, concurrency - len(reads))
+        for path in await loop.run_in_executor(discovery, list, next_paths):
+            reads.append((path, loop.run_in_executor(readers, _read_source, path)))
+
+    try:
+        await read_ahead()
+        while reads:
+            path, read = reads.popleft()
+            source = await read
+            check = loop.run_in_executor(
+                checker,
+                partial(run.check, path, source=source),
+            )
+            await read_ahead()
+
+            unstable = await check
+            if unstable:
+                yield unstable
+    finally:
+        for _, read in reads:
+            read.cancel()
+        readers.shutdown(wait=False)
+        checker.shutdown(wait=False)
+        discovery.shutdown(wait=False)
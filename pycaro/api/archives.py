@@ -0,0 +1,331 @@
+import os
+import re
+import tarfile
+import zipfile
+from functools import partial
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pycaro.api.constants import (
+    ARCHIVE_MEMBER_SEPARATOR,
+    ENGINE_STATIC,
+    EXCLUDED_DIRS,
+    PYTHON_FILE_SUFFIXES,
+)
+from pycaro.api.files import BatchContext, find_project_root
+from pycaro.api.pycaro_types import UnstableModule
+from pycaro.api.source import SourceFile
+from pycaro.api.static import StaticModule
+from pycaro.api.symbols import SymbolIndex, exports_entry
+from pycaro.api.validate import ModuleChecker, ModuleCollectionCheck
+
+try:
+    import importlib.metadata as importlib_metadata
+except ImportError:  # python < 3.8
+    import importlib_metadata
+
+# An archive path, or the name of an installed distribution
+Target = Tuple[str, str]
+TARGET_ARCHIVE = "archive"
+TARGET_DISTRIBUTION = "distribution"
+
+# Errors of the archives and distributions that cannot be read
+_READ_ERRORS = (
+    OSError,
+    EOFError,
+    zipfile.BadZipFile,
+    tarfile.TarError,
+    importlib_metadata.PackageNotFoundError,
+)
+# Errors of the modules that cannot be parsed
+_MODULE_ERRORS = (SyntaxError, ValueError, UnicodeDecodeError, LookupError)
+# Top level directory of the members of an sdist, `name-version/`
+_SDIST_TOP_DIR_PATTERN = re.compile(r"[^/]+-\d[^/]*/")
+
+# Run of the archives checked by a worker process, set once when it starts
+_worker_run: Optional[ModuleCollectionCheck] = None
+
+
+def _is_python_member(member: str) -> bool:
+    parts = PurePosixPath(member).parts
+    return (
+        member.endswith(PYTHON_FILE_SUFFIXES)
+        and ".." not in parts
+        and not any(part in EXCLUDED_DIRS for part in parts[:-1])
+    )
+
+
+def gen_archive_sources(path: Path) -> Iterator[Tuple[str, bytes]]:
+    """
+    Path and source of each python module of a wheel, zip, zipapp or gzipped tar
+    archive, read from the archive without extracting it. Tar archives are read
+    as a stream, in a single pass.
+    """
+    if path.name.lower().endswith((".tar.gz", ".tgz")):
+        with tarfile.open(path.as_posix(), "r|*") as archive:
+            for info in archive:
+                if info.isfile() and _is_python_member(info.name):
+                    yield info.name, archive.extractfile(info).read()
+        return
+
+    with zipfile.ZipFile(path.as_posix()) as archive:
+        for info in archive.infolist():
+            if not info.is_dir() and _is_python_member(info.filename):
+                yield info.filename, archive.read(info)
+
+
+def gen_distribution_sources(
+    distribution: "importlib_metadata.Distribution",
+) -> Iterator[Tuple[str, bytes]]:
+    """
+    Path and source of each python module installed by `distribution`, as listed
+    in its RECORD, read where it is installed
+    """
+    for file in distribution.files or []:
+        member = file.as_posix()
+        if _is_python_member(member):
+            yield member, distribution.locate_file(file).read_bytes()
+
+
+def get_import_paths(members: List[str]) -> List[str]:
+    """
+    Paths of `members` relative to the directory their modules are imported from:
+    the top level `name-version/` directory of sdists is left out
+    """
+    top_dirs = {member.partition("/")[0] + "/" for member in members}
+    if len(top_dirs) != 1:
+        return members
+    (top_dir,) = top_dirs
+    if not _SDIST_TOP_DIR_PATTERN.fullmatch(top_dir) or not all(
+        "/" in member for member in members
+    ):
+        return members
+    return [member[len(top_dir) :] for member in members]
+
+
+def _module_name(import_path: str) -> Tuple[str, bool]:
+    """
+    Name of the module of a file, and whether it is a package
+    """
+    parts = os.path.splitext(import_path)[0].split("/")
+    if parts[-1] == "__init__":
+        return ".".join(parts[:-1]), True
+    return ".".join(parts), False
+
+
+class ArchiveSymbolIndex(SymbolIndex):
+    """
+    Symbol index of the modules of an archive or an installed distribution,
+    resolved from their sources only: star imports of other modules are never
+    resolved, so that findings do not depend on the current environment.
+    """
+
+    def __init__(self, sources: Dict[str, bytes], root: Optional[Path] = None):
+        """
+        :param sources: source of each module, by import path (see
+        `get_import_paths`)
+        """
+        super().__init__(root=root)
+        self.sources = {}
+        # Stubs are only used without the module source
+        for import_path in sorted(sources, key=lambda path: path.endswith(".py")):
+            self.sources[_module_name(import_path)] = sources[import_path]
+
+    def _entry(self, module: str) -> Optional[dict]:
+        if module in self.entries:
+            return self.entries[module]
+
+        for is_package in (True, False):
+            data = self.sources.get((module, is_package))
+            if data is not None:
+                break
+        else:
+            return None
+
+        try:
+            source_file = SourceFile(data)
+            static_module = StaticModule(
+                path=Path(module), source=source_file.text(), source_file=source_file
+            )
+        except _MODULE_ERRORS:
+            self.entries[module] = None
+            return None
+
+        self.entries[module] = exports_entry(module, static_module, is_package)
+        return self.entries[module]
+
+
+class ArchiveMemberChecker(ModuleChecker):
+    """
+    Check of a module of an archive or an installed distribution, with the static
+    engine, from its source read by the caller.
+
+    The module is reported as `archive!member`. Its name, used to resolve its
+    relative star imports, comes from `import_path`, the member by default.
+    """
+
+    def __init__(
+        self,
+        archive: str,
+        member: str,
+        data: bytes,
+        import_path: Optional[str] = None,
+        **kwargs,
+    ):
+        self.archive = archive
+        self.member = member
+        self.data = data
+        self.import_path = import_path or member
+        super().__init__(
+            Path(f"{archive}{ARCHIVE_MEMBER_SEPARATOR}{member}"),
+            engine=ENGINE_STATIC,
+            **kwargs,
+        )
+
+    def _init_paths(self, context: Optional[BatchContext]):
+        self.root = context.root if context is not None else find_project_root(())
+        self.absolute_path = self.file_path
+        self.file_path_normalized = self.file_path.as_posix()
+        self.importable_module_path = os.path.splitext(self.import_path)[0].replace(
+            "/", "."
+        )
+
+    def _static_module(self) -> StaticModule:
+        source_file = SourceFile(self.data)
+        return StaticModule(
+            path=self.absolute_path,
+            source=source_file.text(),
+            source_file=source_file,
+        )
+
+
+def _error(module_path: str, error: BaseException) -> UnstableModule:
+    return UnstableModule(
+        module_path=module_path,
+        unstable_module_objects=[],
+        error=f"{type(error).__name__}: {error}",
+    )
+
+
+def _target_sources(target: Target) -> Tuple[str, Iterator[Tuple[str, bytes]]]:
+    """
+    Name the modules of `target` are reported under, and their sources
+    """
+    kind, name = target
+    if kind == TARGET_ARCHIVE:
+        return name, gen_archive_sources(Path(name))
+
+    distribution = importlib_metadata.distribution(name)
+    label = f"{distribution.metadata['Name']}-{distribution.version}"
+    return label, gen_distribution_sources(distribution)
+
+
+def check_target(target: Target, run: ModuleCollectionCheck) -> List[UnstableModule]:
+    """
+    Findings of the modules of an archive or an installed distribution. Modules
+    that cannot be parsed, and archives that cannot be read, are reported with an
+    `error`.
+
+    All the sources of the target are read before they are checked: their star
+    imports are resolved with an `ArchiveSymbolIndex` of the target.
+    :param target: (`TARGET_ARCHIVE`, path) or (`TARGET_DISTRIBUTION`, name)
+    :param run: run the modules are checked in, with the static engine
+    """
+    label = target[1]
+    sources: List[Tuple[str, bytes]] = []
+    read_error: Optional[UnstableModule] = None
+    try:
+        label, target_sources = _target_sources(target)
+        sources.extend(target_sources)
+    except _READ_ERRORS as e:
+        # Modules read until then are checked all the same
+        read_error = _error(label, e)
+
+    import_paths = get_import_paths([member for member, _ in sources])
+    symbols = ArchiveSymbolIndex(
+        {import_path: data for import_path, (_, data) in zip(import_paths, sources)},
+        root=run.context.root,
+    )
+    results = []
+    for import_path, (member, data) in zip(import_paths, sources):
+        module_path = f"{label}{ARCHIVE_MEMBER_SEPARATOR}{member}"
+        try:
+            unstable = run.run_checker(
+                partial(
+                    ArchiveMemberChecker,
+                    label,
+                    member,
+                    data,
+                    import_path=import_path,
+                    symbols=symbols,
+                    context=run.context,
+                    previews=run.previews,
+                    baseline=run.baseline,
+                    collection=run,
+                )
+            )
+        except _MODULE_ERRORS as e:
+            unstable = _error(module_path, e)
+        if unstable:
+            results.append(unstable)
+    if read_error is not None:
+        results.append(read_error)
+    return results
+
+
+def _init_worker(context: BatchContext, previews: bool):
+    global _worker_run
+    _worker_run = ModuleCollectionCheck(
+        [], engine=ENGINE_STATIC, context=context, previews=previews
+    )
+
+
+def _check_in_worker(target: Target) -> List[UnstableModule]:
+    return check_target(target, _worker_run)
+
+
+def get_archive_module_checker_generator(
+    archives: Iterable[Path] = (),
+    distributions: Iterable[str] = (),
+    jobs: int = 1,
+    context: Optional[BatchContext] = None,
+    previews: bool = True,
+) -> Iterator[UnstableModule]:
+    """
+    Same as `get_module_checker_generator`, for the modules of archives (wheels,
+    sdists, zipapps, see `ARCHIVE_SUFFIXES`) and of installed distributions.
+    Sources are read from the archives and from the installed files in place,
+    without extracting anything, and checked with the static engine: no code of
+    the checked packages is ever run.
+
+    With more than one job, each archive or distribution is checked by one of a
+    pool of `jobs` worker processes. Results are yielded in the order of
+    `archives`, then `distributions`.
+    :param archives: paths of the archives
+    :param distributions: names of the installed distributions
+    :param jobs: number of worker processes
+    :param context: context shared by the checks, for the project root
+    :param previews: find the first occurrence of each unstable variable
+    """
+    targets = [(TARGET_ARCHIVE, path.as_posix()) for path in archives] + [
+        (TARGET_DISTRIBUTION, name) for name in distributions
+    ]
+    context = context or BatchContext()
+
+    if jobs == 1 or len(targets) < 2:
+        run = ModuleCollectionCheck(
+            [], engine=ENGINE_STATIC, context=context, previews=previews
+        )
+        for target in targets:
+            yield from check_target(target, run)
+        return
+
+    import multiprocessing
+
+    with multiprocessing.Pool(
+        processes=min(jobs, len(targets)),
+        initializer=_init_worker,
+        initargs=(context, previews),
+    ) as pool:
+        for results in pool.imap(_check_in_worker, targets):
+            yield from results
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable, Optional, Set
+
+from pycaro.api.files import BatchContext
+from pycaro.api.pycaro_types import UnstableModule
+
+_MAGIC = b"PYCAROB1"
+
+
+def fingerprint(module_path: str, module_object: str, var_name: str) -> int:
+    """
+    Stable fingerprint of a finding, whatever the line it is found at
+    :param module_path: path of the module from the project root
+    :param module_object: function the variable is used in
+    :param var_name: unstable variable
+    """
+    key = "\0".join([module_path, module_object, var_name]).encode("utf-8")
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "little")
+
+
+class Baseline:
+    """
+    Fingerprints of known findings, to only report new ones.
+
+    Findings are identified by their module path from the project root, their
+    function and their variable: they stay known when lines are added or removed
+    around them, and known findings can be dropped before their first occurrence
+    is looked up. The baseline file is the sorted array of the fingerprints.
+    """
+
+    def __init__(self, fingerprints: Iterable[int] = ()):
+        self.fingerprints: Set[int] = set(fingerprints)
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def is_known(self, module_path: str, module_object: str, var_name: str) -> bool:
+        return fingerprint(module_path, module_object, var_name) in self.fingerprints
+
+    def _sorted(self) -> array:
+        return array("Q", sorted(self.fingerprints))
+
+    @property
+    def digest(self) -> str:
+        """
+        Digest of the fingerprints, for the results cached with this baseline
+        """
+        return hashlib.sha256(self._sorted().tobytes()).hexdigest()[:16]
+
+    @classmethod
+    def from_findings(
+        cls,
+        entries: Iterable[UnstableModule],
+        context: Optional[BatchContext] = None,
+    ) -> "Baseline":
+        """
+        Baseline of all the findings of `entries`. Modules that could not be
+        checked are ignored.
+        """
+        context = context or BatchContext()
+        baseline = cls()
+        for unstable in entries:
+            module_path = context.path_from_root(Path(unstable.module_path))
+            if module_path is None:
+                continue
+            for unstable_module_object in unstable.unstable_module_objects:
+                for unstable_var in unstable_module_object.unstable_vars:
+                    baseline.fingerprints.add(
+                        fingerprint(
+                            module_path,
+                            unstable_module_object.module_object,
+                            unstable_var.var_name,
+                        )
+                    )
+        return baseline
+
+    @classmethod
+    def load(cls, path: Path) -> "Baseline":
+        """
+        :raise ValueError: if `path` is not a baseline file
+        """
+        with path.open("rb") as f:
+            data = f.read()
+        if not data.startswith(_MAGIC) or (len(data) - len(_MAGIC)) % 8:
+            raise ValueError(f"{path} is not a pycaro baseline")
+
+        fingerprints = array("Q")
+        fingerprints.frombytes(data[len(_MAGIC) :])
+        if sys.byteorder == "big":
+            fingerprints.byteswap()
+        return cls(fingerprints)
+
+    def save(self, path: Path):
+        fingerprints = self._sorted()
+        if sys.byteorder == "big":
+            fingerprints.byteswap()
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("wb") as f:
+            f.write(_MAGIC)
+            f.write(fingerprints.tobytes())
+        os.replace(tmp_path, path)
+
+
+_baseline: Optional[Baseline] = None
+
+
+def get_baseline() -> Optional[Baseline]:
+    """
+    Baseline of the checks of the current process, if any
+    """
+    return _baseline
+
+
+def set_baseline(baseline: Optional[Baseline]):
+    """
+    Drop the findings of `baseline` from the next checks of the current process.
+    Worker processes forked afterwards use it as well.
+    """
+    global _baseline
+    _baseline = baseline
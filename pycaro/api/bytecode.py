@@ -0,0 +1,107 @@
+import dis
+import sys
+from dataclasses import dataclass, field
+from types import CodeType
+from typing import Dict, Set
+
+_GLOBAL, _BINDING, _ATTRIBUTE = range(3)
+
+_OPNAMES = {
+    # Names looked up in the module namespace, then in builtins
+    _GLOBAL: [
+        "LOAD_GLOBAL",
+        "LOAD_NAME",
+        # python 3.12+, class bodies
+        "LOAD_FROM_DICT_OR_GLOBALS",
+    ],
+    # Names bound in a class body (or module) namespace
+    _BINDING: ["STORE_NAME", "DELETE_NAME"],
+    # Attributes of objects, and imported modules and names
+    _ATTRIBUTE: [
+        "LOAD_ATTR",
+        "LOAD_METHOD",
+        "STORE_ATTR",
+        "DELETE_ATTR",
+        # python 3.12+, `super().name`
+        "LOAD_SUPER_ATTR",
+        "IMPORT_NAME",
+        "IMPORT_FROM",
+    ],
+}
+_KINDS: Dict[int, int] = {
+    dis.opmap[opname]: kind
+    for kind, opnames in _OPNAMES.items()
+    for opname in opnames
+    if opname in dis.opmap
+}
+
+# Low bits of the argument used as flags, before the index in `co_names`
+_FLAG_BITS: Dict[int, int] = {}
+if sys.version_info >= (3, 11):
+    _FLAG_BITS[dis.opmap["LOAD_GLOBAL"]] = 1
+if sys.version_info >= (3, 12):
+    _FLAG_BITS[dis.opmap["LOAD_ATTR"]] = 1
+    _FLAG_BITS[dis.opmap["LOAD_SUPER_ATTR"]] = 2
+
+
+@dataclass
+class CodeNames:
+    """
+    Names of `co_names` of a code object and its nested code objects, by use
+    """
+
+    # Read from the module namespace or builtins
+    global_names: Set[str] = field(default_factory=set)
+    # Attributes of objects, and imported modules and names
+    attribute_names: Set[str] = field(default_factory=set)
+
+
+def _classify(code: CodeType, names: CodeNames):
+    co_names = code.co_names
+    if co_names:
+        loaded: Set[str] = set()
+        bound: Set[str] = set()
+
+        # Instructions are (opcode, argument) pairs of bytes, with EXTENDED_ARG
+        # prefixes for arguments over 255, and inline caches (CACHE opcode) from
+        # python 3.11
+        co_code = code.co_code
+        extended_arg = 0
+        for opcode, arg in zip(co_code[::2], co_code[1::2]):
+            if opcode == dis.EXTENDED_ARG:
+                extended_arg = (extended_arg | arg) << 8
+                continue
+            arg |= extended_arg
+            extended_arg = 0
+
+            kind = _KINDS.get(opcode)
+            if kind is None:
+                continue
+            name = co_names[arg >> _FLAG_BITS.get(opcode, 0)]
+            if kind == _GLOBAL:
+                loaded.add(name)
+            elif kind == _BINDING:
+                bound.add(name)
+            else:
+                names.attribute_names.add(name)
+
+        # In a class body, names bound in the body are read with LOAD_NAME as well
+        names.global_names.update(loaded.difference(bound))
+
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _classify(const, names)
+
+
+def classify_names(code: CodeType) -> CodeNames:
+    """
+    Classify the names used by `code` from its bytecode, in a single traversal of
+    `code` and of the code objects nested in it (closures, lambdas,
+    comprehensions, classes and their methods).
+
+    Local and enclosing scope variables are not names of `co_names`, and are never
+    returned.
+    """
+    names = CodeNames()
+    _classify(code, names)
+    return names
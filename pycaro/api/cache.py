@@ -0,0 +1,343 @@
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pycaro import __version__
+from pycaro.api.baseline import get_baseline
+from pycaro.api.constants import (
+    CACHE_DIR_NAME,
+    CACHE_MAX_SIZE,
+    CHECK_BATCH_SIZE,
+    ENGINE_IMPORT,
+    ENGINE_STATIC,
+)
+from pycaro.api.files import BatchContext, find_project_root
+from pycaro.api.logger import get_logger
+from pycaro.api.parallel import imap_unstable_modules
+from pycaro.api.pycaro_types import UnstableModule
+from pycaro.api.source import SourceFile
+from pycaro.api.static import StaticModule
+from pycaro.api.symbols import SymbolIndex, get_symbol_index, resolve_star_import
+
+_logger = get_logger()
+
+# Returned by `ResultCache.get` when there is nothing cached for a path, since
+# None is a valid cached result (stable module)
+MISS = object()
+
+# Sources that may star import a module, only parsed for their dependencies then
+_STAR_IMPORT_PATTERN = re.compile(rb"\bimport\s*\*")
+
+
+def default_cache_dir() -> Path:
+    return find_project_root(()).joinpath(CACHE_DIR_NAME)
+
+
+class ResultCache:
+    """
+    On-disk cache of module findings, keyed by the hash of the module content and of
+    the run configuration (pycaro version, python version, engine, and baseline of
+    the process when there is one).
+
+    The index maps each module to its last known (mtime, size, digest): unchanged
+    modules are found with a single `stat`. Findings are stored in one file per
+    digest, and the least recently used ones are evicted once their total size goes
+    over `max_size`. Stable modules have no findings file at all.
+
+    With the static engine, findings of a module also depend on the names its
+    star imports bind: the index keeps the star imported modules and a digest of
+    their exports, resolved with `symbols`, and findings are only used while the
+    exports are unchanged. Nothing tracks the modules the import engine imports.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        engine: str = ENGINE_IMPORT,
+        max_size: int = CACHE_MAX_SIZE,
+        context: Optional[BatchContext] = None,
+        previews: bool = True,
+        symbols: Optional[SymbolIndex] = None,
+    ):
+        self.cache_dir = cache_dir
+        self.engine = engine
+        self.previews = previews
+        self.symbols = symbols
+        baseline = get_baseline()
+        self.context = context or BatchContext()
+        self.root = self.context.root
+        self.max_size = max_size
+
+        self.config_key = ":".join(
+            [
+                __version__,
+                "{}.{}".format(*sys.version_info[:2]),
+                engine,
+            ]
+            # Findings without their first occurrence, cached apart
+            + ([] if previews else ["no-previews"])
+            # Findings of a baseline are dropped by the checks
+            + ([] if baseline is None else [f"baseline-{baseline.digest}"])
+        )
+        config_digest = hashlib.sha256(self.config_key.encode()).hexdigest()[:16]
+        self.index_path = self.cache_dir.joinpath(f"index-{config_digest}.json")
+        self.results_dir = self.cache_dir.joinpath("results")
+
+        # normalized path -> [mtime_ns, size, digest, has findings, dependencies]
+        self.index: Dict[str, list] = self._load_index()
+        self._written = False
+
+    def _load_index(self) -> Dict[str, list]:
+        try:
+            with self.index_path.open(encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _key(self, path: Path) -> Optional[str]:
+        try:
+            return self.context.path_from_root(path)
+        except ValueError:
+            # Outside of the project root
+            return None
+
+    def _digest(self, data: bytes) -> str:
+        content_hash = hashlib.sha256(self.config_key.encode())
+        content_hash.update(data)
+        return content_hash.hexdigest()
+
+    def _exports_digest(self, modules: List[Optional[str]]) -> Optional[str]:
+        """
+        Digest of the names bound by star imports of `modules`, None if they
+        cannot be known statically
+        """
+        symbols = self.symbols or get_symbol_index()
+        names = symbols.star_imported_names(modules)
+        if names is None:
+            return None
+        return hashlib.sha256("\n".join(sorted(names)).encode()).hexdigest()
+
+    def _dependencies(self, key: str, data: bytes) -> Optional[list]:
+        """
+        Modules star imported by the module of `data`, and the digest of their
+        exports. None without star imports, or with the import engine.
+        """
+        if self.engine != ENGINE_STATIC or not _STAR_IMPORT_PATTERN.search(data):
+            return None
+        try:
+            static_module = StaticModule(path=Path(key), source=SourceFile(data).text())
+        except (SyntaxError, ValueError, UnicodeDecodeError, LookupError):
+            # Reported by the check, and never cached
+            return None
+        if not static_module.star_imports:
+            return None
+
+        # Same package as the checks, see `ModuleChecker._star_imported_names`
+        package = os.path.splitext(key)[0].replace("/", ".").rpartition(".")[0]
+        modules = [
+            resolve_star_import(star_import, package)
+            for star_import in static_module.star_imports
+        ]
+        return [modules, self._exports_digest(modules)]
+
+    def _is_current(self, entry: Optional[list]) -> bool:
+        """
+        Whether `entry` is complete, and the exports of its star imported modules
+        are the same as when it was checked
+        """
+        if entry is None or len(entry) < 5 or entry[3] is None:
+            # Pending: looked up earlier but never `set`, or from an index without
+            # dependencies
+            return False
+        dependencies = entry[4]
+        return dependencies is None or (
+            self._exports_digest(dependencies[0]) == dependencies[1]
+        )
+
+    def _result_path(self, digest: str) -> Path:
+        return self.results_dir.joinpath(digest[:2], f"{digest}.json")
+
+    def _read_result(self, path: Path, digest: str, has_findings: bool):
+        if not has_findings:
+            return None
+
+        result_path = self._result_path(digest)
+        try:
+            with result_path.open(encoding="utf-8") as f:
+                data = json.load(f)
+            # Mark as recently used, for the eviction
+            os.utime(result_path)
+        except (OSError, ValueError):
+            return MISS
+
+        # Cached findings may come from another spelling of the same path
+        data["module_path"] = path.as_posix()
+        return UnstableModule.from_dict(data)
+
+    def get(self, path: Path):
+        """
+        Get the cached findings of the module at `path`, or `MISS`
+        """
+        key = self._key(path)
+        if key is None:
+            return MISS
+
+        absolute_path = self.context.absolute_path(path)
+        try:
+            stat = os.stat(absolute_path)
+        except OSError:
+            # Deleted since it was found: left to the check
+            return MISS
+        entry = self.index.get(key)
+        if not self._is_current(entry):
+            entry = None
+
+        if entry is not None and entry[:2] == [stat.st_mtime_ns, stat.st_size]:
+            return self._read_result(path, digest=entry[2], has_findings=entry[3])
+
+        # Touched but maybe not modified: compare content
+        with open(absolute_path.as_posix(), "rb") as f:
+            data = f.read()
+        digest = self._digest(data)
+        if entry is not None and entry[2] == digest:
+            entry[:2] = [stat.st_mtime_ns, stat.st_size]
+            return self._read_result(path, digest=digest, has_findings=entry[3])
+
+        self.index[key] = [
+            stat.st_mtime_ns,
+            stat.st_size,
+            digest,
+            None,
+            self._dependencies(key, data),
+        ]
+        return MISS
+
+    def set(self, path: Path, unstable: Optional[UnstableModule]):
+        """
+        Store the findings of the module at `path`. `get` must have been called
+        first, for the module stat and digest.
+        """
+        entry = self.index.get(self._key(path))
+        if entry is None:
+            return
+        if unstable is not None and unstable.error is not None:
+            # Timeouts and crashes may not happen again: never cached
+            return
+
+        entry[3] = unstable is not None
+        if unstable is None:
+            return
+
+        result_path = self._result_path(digest=entry[2])
+        result_path.parent.mkdir(parents=True, exist_ok=True)
+        with result_path.open("w", encoding="utf-8") as f:
+            json.dump(unstable.to_dict(), f)
+        self._written = True
+
+    def _evict(self):
+        results: List[Tuple[float, int, Path]] = []
+        for digest_dir in self.results_dir.iterdir():
+            for entry in os.scandir(digest_dir):
+                stat = entry.stat()
+                results.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+
+        total_size = sum(size for _, size, _ in results)
+        for _, size, result_path in sorted(results):
+            if total_size <= self.max_size:
+                break
+            result_path.unlink()
+            total_size -= size
+
+    def save(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        gitignore = self.cache_dir.joinpath(".gitignore")
+        if not gitignore.exists():
+            gitignore.write_text("*\n")
+
+        # Entries never completed by `set` are dropped
+        index = {
+            key: entry for key, entry in self.index.items() if entry[3] is not None
+        }
+        tmp_index_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_index_path.open("w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_index_path, self.index_path)
+
+        if self._written:
+            self._evict()
+            self._written = False
+
+
+def get_cached_module_checker_generator(
+    paths: Iterable[Path],
+    cache: ResultCache,
+    jobs: Optional[int] = None,
+    engine: str = ENGINE_IMPORT,
+    imap: Callable[..., Iterator[Optional[UnstableModule]]] = imap_unstable_modules,
+) -> Iterator[UnstableModule]:
+    """
+    Same as `get_parallel_module_checker_generator`, only checking the modules that
+    are not found in `cache`. Results are yielded in the order of `paths`, which
+    are looked up by batches of `CHECK_BATCH_SIZE`. The batch context of `cache`
+    is shared by all the checks, which find the first occurrences of unstable
+    variables only if `cache` stores them.
+
+    The missed modules are all checked by a single call to `imap`, which looks up
+    the next batches of `paths` when it runs out of modules to check: its worker
+    processes are started once for the run.
+    :param imap: function checking the missed modules, with the signature of
+    `imap_unstable_modules`
+    """
+    paths = iter(paths)
+    # Paths looked up and not yielded yet, with their cached findings or `MISS`
+    entries: Deque[Tuple[Path, object]] = deque()
+    # Missed paths not sent to `imap` yet
+    misses: Deque[Path] = deque()
+    misses_count = 0
+
+    def lookup() -> bool:
+        """
+        Look up the next batch of `paths`, False once they were all looked up
+        """
+        nonlocal misses_count
+        batch = list(islice(paths, CHECK_BATCH_SIZE))
+        for path in batch:
+            cached = cache.get(path)
+            entries.append((path, cached))
+            if cached is MISS:
+                misses.append(path)
+                misses_count += 1
+        return bool(batch)
+
+    def gen_misses() -> Iterator[Path]:
+        while misses or lookup():
+            while misses:
+                yield misses.popleft()
+
+    checked = imap(
+        gen_misses(),
+        jobs=jobs,
+        engine=engine,
+        context=cache.context,
+        previews=cache.previews,
+    )
+    try:
+        while entries or lookup():
+            path, cached = entries.popleft()
+            if cached is MISS:
+                # Results of `imap` come in the order of the misses
+                cached = next(checked)
+                cache.set(path, cached)
+
+            if cached:
+                yield cached
+    finally:
+        checked.close()
+        cache.save()
+        _logger.debug(f"{misses_count} cache misses")
@@ -0,0 +1,328 @@
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from pycaro.api.pycaro_types import UnstableModule, UnstableModuleObject, UnstableVar
+
+if TYPE_CHECKING:
+    import pyarrow
+
+_MAGIC = b"PYCAROT1"
+# rows, errors, strings, size of the strings blob
+_HEADER = struct.Struct("<4Q")
+# Columns of the findings, one value per unstable variable
+_COLUMNS = [
+    "module_path",
+    "module_object",
+    "var_name",
+    "first_oc_line_no",
+    "line_preview",
+]
+# Columns of the modules that could not be checked: the number of findings
+# rows before them, their path and the error
+_ERROR_COLUMNS = ["error_row", "error_module_path", "error"]
+_STRING_COLUMNS = {
+    "module_path",
+    "module_object",
+    "var_name",
+    "line_preview",
+    "error_module_path",
+    "error",
+}
+
+Column = Union[array, memoryview]
+
+
+def _padding(size: int) -> int:
+    return -size % 8
+
+
+class FindingsTable:
+    """
+    Findings of a run, one row per unstable variable, stored by columns.
+
+    Strings (module paths, module object and variable names, line previews and
+    errors) are interned once in a string table, and rows only hold their index:
+    a finding takes 20 bytes. Rows are appended while the findings are streamed,
+    and the table can be written to a compact binary file, memory-mapped back by
+    `read` without copying nor decoding the columns. Tables read from a file are
+    read-only.
+
+    With `pyarrow` installed, tables can be exported to Arrow IPC or Parquet, with
+    string columns as dictionary arrays.
+    """
+
+    def __init__(self):
+        self.readonly = False
+        self.columns: Dict[str, Column] = {
+            name: array("I") for name in _COLUMNS + _ERROR_COLUMNS
+        }
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        # Strings of a table read from a file: offsets in the UTF-8 blob
+        self._string_offsets: Optional[memoryview] = None
+        self._blob: Optional[memoryview] = None
+        self._view: Optional[memoryview] = None
+        self._buffer: Optional[mmap.mmap] = None
+
+    def __len__(self) -> int:
+        return len(self.columns["module_path"])
+
+    @property
+    def errors(self) -> int:
+        return len(self.columns["error_row"])
+
+    def intern(self, string: str) -> int:
+        """
+        Index of `string` in the string table, added if new
+        """
+        string_id = self._string_ids.get(string)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(string)
+            self._string_ids[string] = string_id
+        return string_id
+
+    def string(self, string_id: int) -> str:
+        if self._blob is None:
+            return self._strings[string_id]
+        start, end = self._string_offsets[string_id : string_id + 2]
+        return str(self._blob[start:end], "utf-8")
+
+    def append(self, unstable: UnstableModule):
+        """
+        Add the findings of a module. Its unstable module objects are consumed if
+        they are a generator.
+        """
+        if self.readonly:
+            raise ValueError("Tables read from a file are read-only")
+
+        columns = self.columns
+        module_id = self.intern(unstable.module_path)
+        if unstable.error is not None:
+            columns["error_row"].append(len(self))
+            columns["error_module_path"].append(module_id)
+            columns["error"].append(self.intern(unstable.error))
+
+        for unstable_module_object in unstable.unstable_module_objects:
+            module_object_id = self.intern(unstable_module_object.module_object)
+            for unstable_var in unstable_module_object.unstable_vars:
+                columns["module_path"].append(module_id)
+                columns["module_object"].append(module_object_id)
+                columns["var_name"].append(self.intern(unstable_var.var_name))
+                columns["first_oc_line_no"].append(unstable_var.first_oc_line_no)
+                columns["line_preview"].append(self.intern(unstable_var.line_preview))
+
+    def track(self, entries: Iterable[UnstableModule]) -> Iterator[UnstableModule]:
+        """
+        Yield `entries`, appending them as they go. Findings of the entries must
+        have been evaluated (lists, not generators).
+        """
+        for unstable in entries:
+            self.append(unstable)
+            yield unstable
+
+    def rows(self) -> Iterator[Tuple[str, str, str, int, str]]:
+        """
+        (module path, module object, variable, line number, line preview) of each
+        finding
+        """
+        string = self.string
+        for module_id, module_object_id, var_id, line_no, preview_id in zip(
+            *(self.columns[name] for name in _COLUMNS)
+        ):
+            yield (
+                string(module_id),
+                string(module_object_id),
+                string(var_id),
+                line_no,
+                string(preview_id),
+            )
+
+    def to_unstable_modules(self) -> Iterator[UnstableModule]:
+        """
+        Findings of the table, as they were appended
+        """
+        columns = self.columns
+        errors = iter(
+            zip(
+                columns["error_row"],
+                columns["error_module_path"],
+                columns["error"],
+            )
+        )
+        error = next(errors, None)
+        n_rows = len(self)
+        row = 0
+        while row < n_rows or error is not None:
+            if error is not None and error[0] == row:
+                _, module_id, error_id = error
+                yield UnstableModule(
+                    module_path=self.string(module_id),
+                    unstable_module_objects=[],
+                    error=self.string(error_id),
+                )
+                error = next(errors, None)
+                continue
+
+            # Rows of a module stop at the next module that could not be checked
+            end = error[0] if error is not None else n_rows
+            module_id = columns["module_path"][row]
+            unstable_module_objects = []
+            while row < end and columns["module_path"][row] == module_id:
+                module_object_id = columns["module_object"][row]
+                unstable_vars = []
+                while (
+                    row < end
+                    and columns["module_path"][row] == module_id
+                    and columns["module_object"][row] == module_object_id
+                ):
+                    unstable_vars.append(
+                        UnstableVar(
+                            var_name=self.string(columns["var_name"][row]),
+                            first_oc_line_no=columns["first_oc_line_no"][row],
+                            line_preview=self.string(columns["line_preview"][row]),
+                        )
+                    )
+                    row += 1
+                unstable_module_objects.append(
+                    UnstableModuleObject(
+                        module_object=self.string(module_object_id),
+                        unstable_vars=unstable_vars,
+                    )
+                )
+            yield UnstableModule(
+                module_path=self.string(module_id),
+                unstable_module_objects=unstable_module_objects,
+            )
+
+    def _string_list(self) -> List[str]:
+        if self._blob is None:
+            return self._strings
+        return [self.string(i) for i in range(len(self._string_offsets) - 1)]
+
+    def write(self, path: Path):
+        """
+        Write the table to `path`, in the binary format read by `read`
+        """
+        strings = [string.encode("utf-8") for string in self._string_list()]
+        offsets = array("Q", [0])
+        for string in strings:
+            offsets.append(offsets[-1] + len(string))
+
+        sections = [offsets] + [
+            self.columns[name] for name in _COLUMNS + _ERROR_COLUMNS
+        ]
+        with open(path.as_posix(), "wb") as f:
+            f.write(_MAGIC)
+            f.write(_HEADER.pack(len(self), self.errors, len(strings), offsets[-1]))
+            for section in sections:
+                if sys.byteorder == "big":
+                    section = array(memoryview(section).format, section)
+                    section.byteswap()
+                data = memoryview(section).cast("B")
+                f.write(data)
+                f.write(b"\0" * _padding(data.nbytes))
+            f.write(b"".join(strings))
+
+    @classmethod
+    def read(cls, path: Path) -> "FindingsTable":
+        """
+        Table written by `write`, memory-mapped: columns are views of the file
+        """
+        with open(path.as_posix(), "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(buffer)
+        if bytes(view[: len(_MAGIC)]) != _MAGIC:
+            view.release()
+            buffer.close()
+            raise ValueError(f"{path} is not a pycaro findings table")
+
+        rows, errors, n_strings, blob_size = _HEADER.unpack_from(view, len(_MAGIC))
+        offset = len(_MAGIC) + _HEADER.size
+
+        def section(format: str, length: int) -> Column:
+            nonlocal offset
+            size = length * array(format).itemsize
+            data = view[offset : offset + size]
+            offset += size + _padding(size)
+            if sys.byteorder == "big":
+                swapped = array(format, bytes(data))
+                swapped.byteswap()
+                return swapped
+            return data.cast(format)
+
+        table = cls()
+        table.readonly = True
+        table._buffer = buffer
+        table._view = view
+        table._string_offsets = section("Q", n_strings + 1)
+        for name in _COLUMNS:
+            table.columns[name] = section("I", rows)
+        for name in _ERROR_COLUMNS:
+            table.columns[name] = section("I", errors)
+        table._blob = view[offset : offset + blob_size]
+        return table
+
+    def to_arrow(self) -> "pyarrow.Table":
+        """
+        Findings as an Arrow table, string columns being dictionary arrays over
+        the string table. Modules that could not be checked are not included.
+        :raise ImportError: if pyarrow is not installed
+        """
+        import pyarrow
+
+        dictionary = pyarrow.array(self._string_list(), type=pyarrow.string())
+        arrays = []
+        for name in _COLUMNS:
+            # Dictionary indices are signed for Arrow and its readers: string
+            # indices always fit in an int32
+            values = pyarrow.Array.from_buffers(
+                pyarrow.int32() if name in _STRING_COLUMNS else pyarrow.uint32(),
+                len(self),
+                [None, pyarrow.py_buffer(self.columns[name])],
+            )
+            if name in _STRING_COLUMNS:
+                values = pyarrow.DictionaryArray.from_arrays(values, dictionary)
+            arrays.append(values)
+        return pyarrow.Table.from_arrays(arrays, names=_COLUMNS)
+
+    def write_arrow(self, path: Path):
+        """
+        Write the findings to `path` in the Arrow IPC file format (Feather v2)
+        """
+        import pyarrow.feather
+
+        pyarrow.feather.write_feather(self.to_arrow(), path.as_posix())
+
+    def write_parquet(self, path: Path):
+        import pyarrow.parquet
+
+        pyarrow.parquet.write_table(self.to_arrow(), path.as_posix())
+
+    def close(self):
+        """
+        Unmap the file of a table read from a file
+        """
+        if self._buffer is None:
+            return
+        for name, column in self.columns.items():
+            if isinstance(column, memoryview):
+                column.release()
+        self._string_offsets.release()
+        self._blob.release()
+        self._view.release()
+        self._buffer.close()
+        self._buffer = None
@@ -8,3 +8,85 @@ BUILTIN_OBJECTS = [
     "__spec__",
     "__builtins__",
 ]
+
+# Engines used by `ModuleChecker` to get a module namespace
+ENGINE_IMPORT = "import"
+ENGINE_STATIC = "static"
+
+ENGINES = [
+    ENGINE_IMPORT,
+    ENGINE_STATIC,
+]
+
+# Orders of the results of `ModuleCollectionCheck`: the order of the given paths,
+# or sorted by path
+ORDER_PATHS = "paths"
+ORDER_SORTED = "sorted"
+
+ORDERS = [
+    ORDER_PATHS,
+    ORDER_SORTED,
+]
+
+# Result cache
+CACHE_DIR_NAME = ".pycaro_cache"
+# Default file of `pycaro baseline create`
+BASELINE_FILE_NAME = ".pycaro_baseline"
+CACHE_MAX_SIZE = 64 * 1024 * 1024
+
+# File discovery
+PYTHON_FILE_SUFFIXES = (".py", ".pyi")
+
+# Archives whose modules are checked in place, without extracting them
+ARCHIVE_SUFFIXES = (".whl", ".zip", ".pyz", ".tar.gz", ".tgz")
+# Between the archive and the path of a module in it: `archive.whl!pkg/module.py`
+ARCHIVE_MEMBER_SEPARATOR = "!"
+
+
+def is_archive(path: str) -> bool:
+    return path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+# Directories never explored by the file discovery
+EXCLUDED_DIRS = {
+    ".eggs",
+    ".git",
+    ".hg",
+    ".mypy_cache",
+    ".nox",
+    ".pycaro_cache",
+    ".pytest_cache",
+    ".tox",
+    ".venv",
+    "__pycache__",
+    "build",
+    "dist",
+    "node_modules",
+    "venv",
+}
+
+# Output formats
+FORMAT_TEXT = "text"
+FORMAT_JSONL = "jsonl"
+FORMAT_SARIF = "sarif"
+
+FORMATS = [
+    FORMAT_TEXT,
+    FORMAT_JSONL,
+    FORMAT_SARIF,
+]
+
+# Default wall-clock limit, in seconds, of a module check in a sandboxed worker
+SANDBOX_TIMEOUT = 30.0
+
+# Number of paths handed to the worker processes at once
+CHECK_BATCH_SIZE = 256
+
+# Default number of module sources read ahead by the asyncio API
+ASYNC_CONCURRENCY = 16
+
+# Size, in bytes, from which module sources are memory-mapped instead of read
+SOURCE_MMAP_THRESHOLD = 1024 * 1024
+
+# Fixed cost of checking a file, in bytes of source, when balancing shards by size
+SHARD_FILE_WEIGHT = 4096
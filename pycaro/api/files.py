@@ -1,9 +1,34 @@
+import os
 from functools import lru_cache
 from pathlib import Path
-from typing import Sequence, Iterable, Optional, Iterator, List
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Dict,
+    Sequence,
+    Iterable,
+    Optional,
+    Iterator,
+    List,
+    Set,
+    Tuple,
+)
 
-from pathspec import PathSpec
-from pathspec.patterns.gitwildmatch import GitWildMatchPatternError
+from pycaro.api.constants import EXCLUDED_DIRS, PYTHON_FILE_SUFFIXES
+from pycaro.api.profiling import stage
+
+if TYPE_CHECKING:
+    from pathspec import PathSpec
+
+
+class _EmptyPathSpec:
+    """
+    `PathSpec` of an empty or missing .gitignore file, which does not need
+    `pathspec` to be imported
+    """
+
+    def match_file(self, file: str) -> bool:
+        return False
 
 
 @lru_cache()
@@ -47,13 +72,19 @@ def find_project_root(sources: Sequence[str]) -> Path:
 
 
 @lru_cache()
-def get_gitignore(root: Path) -> PathSpec:
+def get_gitignore(root: Path) -> "PathSpec":
     """Return a PathSpec matching gitignore content if present."""
     gitignore = root.joinpath(".gitignore")
     lines: List[str] = []
     if gitignore.is_file():
         with gitignore.open(encoding="utf-8") as gf:
             lines = gf.readlines()
+    if not lines:
+        return _EmptyPathSpec()
+
+    from pathspec import PathSpec
+    from pathspec.patterns.gitwildmatch import GitWildMatchPatternError
+
     try:
         return PathSpec.from_lines("gitwildmatch", lines)
     except GitWildMatchPatternError as e:
@@ -86,54 +117,267 @@ def get_path_from_root(
         raise
 
 
+class BatchContext:
+    """
+    Project level state shared by the checks of a batch of files: the project root,
+    its .gitignore, and the directories already resolved. Paths of the files are
+    normalized with a single `lstat` each, instead of resolving every component of
+    every path.
+
+    Relative paths are relative to the project root, as for `get_absolute_path`.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = root or find_project_root(())
+        self._root = str(self.root)
+        self._root_prefix = os.path.join(self._root, "")
+        # directory -> directory with symbolic links resolved
+        self._directories: Dict[str, str] = {}
+
+    def __getstate__(self) -> dict:
+        # Sent to worker processes: not worth sending the resolved directories
+        return {"root": self.root}
+
+    def __setstate__(self, state: dict):
+        self.__init__(root=state["root"])
+
+    @property
+    def gitignore(self) -> "PathSpec":
+        return get_gitignore(root=self.root)
+
+    def absolute_path(self, path: Path) -> Path:
+        return get_absolute_path(path=path, root=self.root)
+
+    def _resolve(self, path: str) -> str:
+        directory, name = os.path.split(os.path.join(self._root, path))
+        if name in ("", ".", ".."):
+            return os.path.realpath(os.path.join(directory, name))
+
+        resolved_directory = self._directories.get(directory)
+        if resolved_directory is None:
+            resolved_directory = os.path.realpath(directory)
+            self._directories[directory] = resolved_directory
+
+        resolved = os.path.join(resolved_directory, name)
+        if os.path.islink(resolved):
+            resolved = os.path.realpath(resolved)
+        return resolved
+
+    def path_from_root(self, path: Path) -> Optional[str]:
+        """
+        Same as `get_path_from_root` for the root of the batch
+        """
+        resolved = self._resolve(os.fspath(path))
+        if resolved == self._root:
+            return "."
+        if resolved.startswith(self._root_prefix):
+            return Path(resolved[len(self._root_prefix) :]).as_posix()
+
+        if os.path.islink(self.absolute_path(path)):
+            return None
+        raise ValueError(f"{path} is not in the project root {self.root}")
+
+
+def _is_ignored(
+    relative_path: str,
+    gitignores: List[Tuple[str, "PathSpec"]],
+) -> bool:
+    """
+    Whether a path relative to the root is matched by one of the `gitignores`, each
+    one being matched relatively to the directory of its .gitignore file.
+    """
+    for directory, gitignore in gitignores:
+        if not directory:
+            if gitignore.match_file(relative_path):
+                return True
+        elif relative_path.startswith(directory + "/") and gitignore.match_file(
+            relative_path[len(directory) + 1 :]
+        ):
+            return True
+    return False
+
+
+def _in_excluded_dir(relative_path: str) -> bool:
+    """
+    Whether a path relative to the root is under one of the `EXCLUDED_DIRS`
+    """
+    return any(part in EXCLUDED_DIRS for part in relative_path.split("/")[:-1])
+
+
+def _gen_directory_files(
+    directory: str,
+    relative_directory: str,
+    root: Path,
+    gitignores: Optional[List[Tuple[str, "PathSpec"]]],
+) -> Iterator[Path]:
+    """
+    Python files under `directory`, whose path from root is `relative_directory`
+    """
+    try:
+        with os.scandir(directory) as scanned:
+            entries = sorted(scanned, key=lambda entry: entry.name)
+    except OSError:
+        return
+
+    if gitignores is not None and any(
+        entry.name == ".gitignore" and entry.is_file() for entry in entries
+    ):
+        gitignores = gitignores + [(relative_directory, get_gitignore(Path(directory)))]
+
+    for entry in entries:
+        relative_path = (
+            f"{relative_directory}/{entry.name}" if relative_directory else entry.name
+        )
+
+        if entry.is_symlink():
+            # Symbolic links are only followed to files inside of the root
+            if (
+                not entry.is_file()
+                or get_path_from_root(Path(entry.path), root) is None
+            ):
+                continue
+
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name in EXCLUDED_DIRS:
+                continue
+            if gitignores is not None and _is_ignored(relative_path + "/", gitignores):
+                continue
+            yield from _gen_directory_files(
+                entry.path,
+                relative_path,
+                root,
+                gitignores,
+            )
+
+        elif entry.name.endswith(PYTHON_FILE_SUFFIXES) and entry.is_file():
+            if gitignores is not None and _is_ignored(relative_path, gitignores):
+                continue
+            yield Path(entry.path)
+
+
 def gen_python_files(
     paths: Iterable[Path],
     root: Path,
-    gitignore: Optional[PathSpec],
+    gitignore: Optional["PathSpec"],
+    context: Optional[BatchContext] = None,
 ) -> Iterator[Path]:
-    """Generate all files under `path` whose paths are not excluded by the
-    `exclude_regex`, `extend_exclude`, or `force_exclude` regexes,
-    but are included by the `include` regex.
+    """Generate all files in `paths`, and all python files under the directories
+    of `paths`, whose paths are not matched by a .gitignore file.
 
-    Symbolic links pointing outside of the `root` directory are ignored.
+    Directories from `EXCLUDED_DIRS` are never explored, and files under them are
+    ignored even when they are in `paths`. Symbolic links pointing outside of the
+    `root` directory are ignored, and symbolic links to directories are not
+    followed.
 
+    If `gitignore` is None, .gitignore files are not used. With a `context`, the
+    paths are normalized with it.
     """
+    gitignores = [("", gitignore)] if gitignore is not None else None
+
     for child in paths:
-        normalized_path = get_path_from_root(
-            child,
-            root,
+        normalized_path = (
+            context.path_from_root(child)
+            if context is not None
+            else get_path_from_root(
+                child,
+                root,
+            )
         )
 
         if normalized_path is None:
             continue
 
-        # First ignore files matching .gitignore, if passed
-        if gitignore is not None and gitignore.match_file(normalized_path):
-            continue
-
-        normalized_path = "/" + normalized_path
         if child.is_dir():
-            normalized_path += "/"
+            if gitignores is not None and _is_ignored(
+                normalized_path + "/", gitignores
+            ):
+                continue
 
-        if child.is_dir():
-            # If gitignore is None, gitignore usage is disabled, while a Falsey
-            # gitignore is when the directory doesn't have a .gitignore file.
-            yield from gen_python_files(
-                child.iterdir(),
+            # .gitignore files of the parents of `child` are not used, except for
+            # the root one
+            relative_directory = "" if normalized_path == "." else normalized_path
+            yield from _gen_directory_files(
+                child.as_posix(),
+                relative_directory,
                 root,
-                gitignore + get_gitignore(child) if gitignore is not None else None,
+                gitignores,
             )
 
         elif child.is_file():
+            if _in_excluded_dir(normalized_path):
+                continue
+            if gitignores is not None and _is_ignored(normalized_path, gitignores):
+                continue
             yield child
 
 
+def select_changed_files(
+    paths: Iterable[str],
+    changed: Set[Path],
+) -> Iterator[Path]:
+    """
+    Python files of `changed` (absolute paths) that are, or are under, one of
+    `paths`. Files under the current directory are yielded relative to it.
+    """
+    cwd = Path.cwd().resolve()
+    sources = [Path(cwd, src).resolve() for src in paths]
+
+    for changed_path in sorted(changed):
+        if not changed_path.name.endswith(PYTHON_FILE_SUFFIXES):
+            continue
+        if not any(
+            changed_path == src or src in changed_path.parents for src in sources
+        ):
+            continue
+
+        yield (
+            Path(os.path.relpath(changed_path, cwd))
+            if cwd in changed_path.parents
+            else changed_path
+        )
+
+
+def read_file_list(stream: IO[bytes]) -> Iterator[Path]:
+    """
+    Paths listed in `stream`, separated by NUL characters if there is any (as
+    written by `find -print0` or `git ls-files -z`), by new lines otherwise
+    """
+    data = stream.read()
+    if b"\0" in data:
+        entries = data.split(b"\0")
+    else:
+        entries = [line.rstrip(b"\r") for line in data.split(b"\n")]
+
+    for entry in entries:
+        if entry:
+            yield Path(os.fsdecode(entry))
+
+
 def get_files(
     paths: Iterable[str],
+    changed: Optional[Set[Path]] = None,
+    context: Optional[BatchContext] = None,
 ):
-    root = find_project_root(())
-    yield from gen_python_files(
+    """
+    Files to check under `paths`.
+    :param paths: files and directories to scan
+    :param changed: when set, only the files of this set of absolute paths are
+    yielded, see `pycaro.api.git.get_changed_files`
+    :param context: context of the batch, shared with the checks of the files
+    """
+    context = context or BatchContext()
+    if changed is not None:
+        paths = select_changed_files(paths=paths, changed=changed)
+
+    files = gen_python_files(
         paths=(Path(src) for src in paths),
-        root=root,
-        gitignore=get_gitignore(root=root),
+        root=context.root,
+        gitignore=context.gitignore,
+        context=context,
     )
+    while True:
+        with stage("discovery"):
+            path = next(files, None)
+        if path is None:
+            return
+        yield path
@@ -0,0 +1,94 @@
+from dataclasses import asdict, dataclass
+from typing import Iterable, Iterator, Optional
+
+from pycaro.api.pycaro_types import UnstableModule, UnstableModuleObject
+
+
+@dataclass
+class FindingCounts:
+    """
+    Totals of the findings of a run
+    """
+
+    # Modules with findings or errors
+    modules: int = 0
+    module_objects: int = 0
+    unstable_vars: int = 0
+    # Modules that could not be checked
+    errors: int = 0
+
+    def add(self, unstable: UnstableModule):
+        self.modules += 1
+        if unstable.error is not None:
+            self.errors += 1
+        for unstable_module_object in unstable.unstable_module_objects:
+            self.module_objects += 1
+            self.unstable_vars += len(unstable_module_object.unstable_vars)
+
+    def track(self, entries: Iterable[UnstableModule]) -> Iterator[UnstableModule]:
+        """
+        Yield `entries`, counting them as they go. Findings of the entries must
+        have been evaluated (lists, not generators).
+        """
+        for unstable in entries:
+            self.add(unstable)
+            yield unstable
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _close(entries: Iterable[UnstableModule]):
+    # Stops the workers of the generators of `entries` right away
+    close = getattr(entries, "close", None)
+    if close is not None:
+        close()
+
+
+def limit_findings(
+    entries: Iterable[UnstableModule],
+    max_findings: Optional[int] = None,
+    max_modules: Optional[int] = None,
+) -> Iterator[UnstableModule]:
+    """
+    Yield `entries` until `max_findings` unstable variables or `max_modules`
+    modules were yielded, the findings of the last module being truncated to
+    `max_findings`. `entries` are closed once the limit is reached, so that no
+    other module is checked.
+    :param entries: modules with findings, see `get_module_checker_generator`
+    :param max_findings: maximum number of unstable variables, no limit if None
+    :param max_modules: maximum number of modules, no limit if None
+    """
+    findings = 0
+    modules = 0
+    try:
+        for unstable in entries:
+            if max_findings is not None:
+                unstable_module_objects = []
+                for unstable_module_object in unstable.unstable_module_objects:
+                    if findings >= max_findings:
+                        break
+                    unstable_vars = unstable_module_object.unstable_vars[
+                        : max_findings - findings
+                    ]
+                    findings += len(unstable_vars)
+                    unstable_module_objects.append(
+                        UnstableModuleObject(
+                            module_object=unstable_module_object.module_object,
+                            unstable_vars=unstable_vars,
+                        )
+                    )
+                unstable = UnstableModule(
+                    module_path=unstable.module_path,
+                    unstable_module_objects=unstable_module_objects,
+                    error=unstable.error,
+                )
+
+            yield unstable
+            modules += 1
+            if (max_modules is not None and modules >= max_modules) or (
+                max_findings is not None and findings >= max_findings
+            ):
+                return
+    finally:
+        _close(entries)
@@ -0,0 +1,63 @@
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Set
+
+
+class GitError(Exception):
+    """ """
+
+
+def _git(*args: str, cwd: Optional[Path] = None) -> str:
+    """
+    Run a git command against the local repository and return its output. Never
+    touches the network.
+    """
+    try:
+        completed = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+    except FileNotFoundError as e:
+        raise GitError("git is not installed") from e
+    except subprocess.CalledProcessError as e:
+        raise GitError(e.stderr.decode(errors="replace").strip()) from e
+
+    return completed.stdout.decode()
+
+
+def _git_paths(*args: str, cwd: Optional[Path] = None) -> List[str]:
+    """
+    Paths output by a git command run with `-z`
+    """
+    return [path for path in _git(*args, "-z", cwd=cwd).split("\0") if path]
+
+
+def get_changed_files(
+    diff_from: Optional[str] = None,
+    staged: bool = False,
+    cwd: Optional[Path] = None,
+) -> Set[Path]:
+    """
+    Absolute paths of the files changed in the local git repository, deleted files
+    excluded:
+    - with `diff_from`, the files changed in `diff_from..HEAD`
+    - with `staged`, the files in the index
+    - otherwise, the files of the working tree that differ from HEAD, and the
+    untracked files not ignored by git
+    """
+    toplevel = Path(_git("rev-parse", "--show-toplevel", cwd=cwd).strip()).resolve()
+
+    diff = ["diff", "--name-only", "--no-renames", "--diff-filter=d"]
+    if diff_from is not None:
+        changed = _git_paths(*diff, f"{diff_from}..HEAD", cwd=toplevel)
+    elif staged:
+        changed = _git_paths(*diff, "--cached", cwd=toplevel)
+    else:
+        changed = _git_paths(*diff, "HEAD", cwd=toplevel) + _git_paths(
+            "ls-files", "--others", "--exclude-standard", cwd=toplevel
+        )
+
+    return {toplevel.joinpath(path) for path in changed}
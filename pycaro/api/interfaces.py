@@ -1,8 +1,6 @@
 from abc import ABCMeta, abstractmethod
 from dataclasses import dataclass
-from typing import List, Iterator, Iterable
-
-from termcolor import colored
+from typing import List, Iterator, Iterable, Optional
 
 from pycaro.api.pycaro_types import UnstableModuleObject
 
@@ -24,6 +22,7 @@ class SummarySingleMethod(metaclass=ABCMeta):
 class SummarySingleModule:
     module_path: str
     methods_summaries: List[SummarySingleMethod]
+    error: Optional[str] = None
 
     @abstractmethod
     def module_render(self, *args, **kwargs) -> str:
@@ -47,11 +46,20 @@ class TermColorStyleApplicator(StyleApplicator):
     attributes: List[str] = None
 
     def apply(self, text: str):
+        # Only loaded when the output is colored
+        from termcolor import colored
+
         return colored(
             text=text, color=self.color, on_color=self.highlight, attrs=self.attributes
         )
 
 
+@dataclass
+class PlainStyleApplicator(StyleApplicator):
+    def apply(self, text: str):
+        return text
+
+
 @dataclass
 class SummaryStyleApplicator:
     module_style_applicator: StyleApplicator
@@ -59,14 +67,18 @@ class SummaryStyleApplicator:
     var_style_applicator: StyleApplicator
 
     def render(self, entries: Iterable[SummarySingleModule], *args, **kwargs) -> Iterator[str]:
+        """
+        Render modules, then their methods and variables. Renders returning None
+        are skipped.
+        """
         for entry in entries:
-            yield self.module_style_applicator.apply(
-                text=entry.module_render(*args, **kwargs),
-            )
+            module_text = entry.module_render(*args, **kwargs)
+            if module_text is not None:
+                yield self.module_style_applicator.apply(text=module_text)
             for method_summary in entry.methods_summaries:
-                yield self.method_style_applicator.apply(
-                    text=method_summary.method_render(*args, **kwargs)
-                )
+                method_text = method_summary.method_render(*args, **kwargs)
+                if method_text is not None:
+                    yield self.method_style_applicator.apply(text=method_text)
                 yield from (
                     self.var_style_applicator.apply(text=rendered_var)
                     for rendered_var in method_summary.vars_render(*args, **kwargs)
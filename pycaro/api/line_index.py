@@ -0,0 +1,147 @@
+import io
+import itertools
+import re
+import tokenize
+from typing import Dict, Iterator, Optional, Set, Tuple, Union
+
+from pycaro.api.source import SourceFile
+
+# Replacement fields of an f-string, `{{` and `}}` being escaped braces
+_FSTRING_FIELD_PATTERN = re.compile(r"(?<!\{)\{([^{}]+)\}")
+_NAME_PATTERN = re.compile(r"[^\W\d]\w*")
+_STRING_PREFIX_PATTERN = re.compile(r"^[a-zA-Z]*")
+
+
+def gen_function_tokens(
+    source_file: SourceFile, first_line: int
+) -> Iterator[tokenize.TokenInfo]:
+    """
+    Tokens of the function defined from line `first_line` (its `def` or its first
+    decorator) up to the end of its body, for functions whose last line is unknown.
+    Tokens of the decorators are left out. The source is read line by line, and
+    not past the function.
+    """
+    line_nos = itertools.count(first_line)
+
+    def readline() -> str:
+        line_no = next(line_nos)
+        return source_file.segment(line_no, line_no)
+
+    depth = 0
+    # Indentation depth of the `def` statement, once reached
+    def_depth: Optional[int] = None
+    header_ended = False
+    for token in tokenize.generate_tokens(readline):
+        if token.type == tokenize.INDENT:
+            depth += 1
+            header_ended = False
+        elif token.type == tokenize.DEDENT:
+            depth -= 1
+            if def_depth is not None and depth == def_depth:
+                return
+        elif def_depth is None:
+            if token.type != tokenize.NAME or token.string != "def":
+                # Decorators
+                continue
+            def_depth = depth
+        elif header_ended and token.type not in (tokenize.NL, tokenize.COMMENT):
+            # Statement following a function defined on a single line
+            return
+        yield token
+        if token.type == tokenize.NEWLINE and depth == def_depth:
+            header_ended = True
+
+
+class FirstUsageIndex:
+    """
+    First occurrence of each name in each module level function, built from a
+    single tokenization pass over the source of the function, the first time one of
+    its names is looked up. Functions never looked up are never read. Functions
+    without a last line are read up to the end of their body.
+
+    Only name tokens are indexed, so occurrences in comments and string literals
+    are ignored (f-string replacement fields excepted). Occurrences as an attribute
+    (`obj.name`) are only used when the name is never used on its own.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, SourceFile],
+        function_ranges: Dict[str, Tuple[int, Optional[int]]],
+    ):
+        self.source_file = (
+            SourceFile.from_text(source) if isinstance(source, str) else source
+        )
+        self.function_ranges = function_ranges
+
+        # (function, name) -> line number
+        self.names: Dict[Tuple[str, str], int] = {}
+        self.attributes: Dict[Tuple[str, str], int] = {}
+        self._indexed: Set[str] = set()
+
+    def _add(
+        self,
+        index: Dict[Tuple[str, str], int],
+        function: str,
+        name: str,
+        line_no: int,
+    ):
+        index.setdefault((function, name), line_no)
+
+    def _index_fstring(self, function: str, token: tokenize.TokenInfo, line_no: int):
+        for field in _FSTRING_FIELD_PATTERN.finditer(token.string):
+            for name in _NAME_PATTERN.finditer(field.group(1)):
+                offset = token.string.count("\n", 0, field.start(1) + name.start())
+                self._add(self.names, function, name.group(), line_no + offset)
+
+    def _index(self, function: str):
+        self._indexed.add(function)
+        first_line, last_line = self.function_ranges[function]
+        if last_line is None:
+            tokens = gen_function_tokens(self.source_file, first_line)
+        else:
+            segment = self.source_file.segment(first_line, last_line)
+            tokens = tokenize.generate_tokens(io.StringIO(segment).readline)
+        # Line numbers of the tokens start at 1 in the segment
+        line_offset = first_line - 1
+
+        previous: Optional[tokenize.TokenInfo] = None
+        try:
+            for token in tokens:
+                if token.type == tokenize.NAME:
+                    is_attribute = (
+                        previous is not None
+                        and previous.type == tokenize.OP
+                        and previous.string == "."
+                    )
+                    self._add(
+                        self.attributes if is_attribute else self.names,
+                        function,
+                        token.string,
+                        token.start[0] + line_offset,
+                    )
+                elif token.type == tokenize.STRING and "f" in (
+                    _STRING_PREFIX_PATTERN.match(token.string).group().lower()
+                ):
+                    # Before python 3.12, f-strings are a single token
+                    self._index_fstring(function, token, token.start[0] + line_offset)
+
+                if token.type not in (tokenize.NL, tokenize.COMMENT):
+                    previous = token
+        except (tokenize.TokenError, IndentationError):
+            # A range ending within a statement: keep the names found before
+            pass
+
+    def get(self, function: str, name: str) -> Optional[Tuple[int, str]]:
+        """
+        Line number and line of the first occurrence of `name` in `function`
+        """
+        if function not in self._indexed and function in self.function_ranges:
+            self._index(function)
+
+        line_no = self.names.get((function, name)) or self.attributes.get(
+            (function, name)
+        )
+        if line_no is None:
+            return None
+        return line_no, self.source_file.line(line_no)
@@ -0,0 +1,211 @@
+import gc
+import linecache
+import os
+from itertools import chain, islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pycaro.api.baseline import Baseline, get_baseline
+from pycaro.api.constants import CHECK_BATCH_SIZE, ENGINE_IMPORT, ENGINE_STATIC
+from pycaro.api.files import BatchContext
+from pycaro.api.logger import get_logger
+from pycaro.api.pycaro_types import UnstableModule
+from pycaro.api.symbols import get_symbol_index
+from pycaro.api.validate import ModuleCollectionCheck
+
+_logger = get_logger()
+
+# Run of the modules checked by a worker process, set once when it starts
+_worker_run: Optional[ModuleCollectionCheck] = None
+
+
+def default_jobs() -> int:
+    return os.cpu_count() or 1
+
+
+def current_rss() -> Optional[int]:
+    """
+    Resident set size of the current process in bytes, None where it is unknown
+    (only read from /proc)
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _init_worker(
+    context: BatchContext,
+    engine: str,
+    previews: bool = True,
+    baseline: Optional[Baseline] = None,
+):
+    global _worker_run
+    _worker_run = ModuleCollectionCheck(
+        [], engine=engine, context=context, previews=previews, baseline=baseline
+    )
+
+
+def _check_in_worker(
+    path: Path,
+) -> Tuple[Optional[UnstableModule], Optional[int], Dict[str, dict]]:
+    """
+    Check a module in a worker process. The memory used by the worker and the
+    modules it added to its symbol index are sent back along with the result.
+    """
+    unstable = _worker_run.check(path)
+    symbol_updates = (
+        get_symbol_index().pop_updates() if _worker_run.engine == ENGINE_STATIC else {}
+    )
+    return unstable, current_rss(), symbol_updates
+
+
+def _batches(paths: Iterable[Path], size: int) -> Iterator[List[Path]]:
+    paths = iter(paths)
+    while True:
+        batch = list(islice(paths, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _imap_in_process(
+    paths: Iterable[Path],
+    engine: str,
+    max_memory: Optional[int],
+    context: BatchContext,
+    previews: bool,
+) -> Iterator[Optional[UnstableModule]]:
+    warned = False
+    # Memory bound: the modules imported by each check are not kept
+    run = ModuleCollectionCheck(
+        [],
+        engine=engine,
+        context=context,
+        previews=previews,
+        release_modules=max_memory is not None,
+    )
+    for path in paths:
+        yield run.check(path)
+
+        if max_memory is None or (current_rss() or 0) <= max_memory:
+            continue
+        # Nothing to recycle: drop what can be dropped
+        linecache.clearcache()
+        gc.collect()
+        if not warned and (current_rss() or 0) > max_memory:
+            _logger.warning(
+                f"Memory used over {max_memory} bytes, even after releasing caches"
+            )
+            warned = True
+
+
+def imap_unstable_modules(
+    paths: Iterable[Path],
+    jobs: Optional[int] = None,
+    engine: str = ENGINE_IMPORT,
+    max_memory: Optional[int] = None,
+    context: Optional[BatchContext] = None,
+    previews: bool = True,
+) -> Iterator[Optional[UnstableModule]]:
+    """
+    Check `paths` with a pool of `jobs` worker processes, and yield the result of
+    each of them in the order of `paths`: None for stable modules.
+
+    With the `import` engine, a worker process is used for a single module only, so
+    that import side effects of a module cannot leak into the check of another.
+
+    `paths` are consumed by batches of `CHECK_BATCH_SIZE`, so that neither pending
+    paths nor results pile up in memory when the consumer is slower than the
+    workers.
+
+    The baseline of the current process is sent to the workers: spawned workers
+    do not inherit it.
+    :param paths: paths to scan
+    :param jobs: number of worker processes, defaults to the number of CPUs
+    :param engine: engine used to get each module namespace, see `ENGINES`
+    :param max_memory: resident memory, in bytes, above which worker processes are
+    replaced after their current batch. Without worker processes, the modules
+    imported by each check are then released after it.
+    :param context: context shared by the checks of all `paths`, created once for
+    them by default. It is sent once to each worker process, which checks its
+    modules as a single `ModuleCollectionCheck` run.
+    :param previews: find the first occurrence of each unstable variable
+    :return:
+    """
+    jobs = jobs or default_jobs()
+    baseline = get_baseline()
+    context = context or BatchContext()
+    paths = iter(paths)
+
+    # Not worth starting a pool for a single module
+    head = list(islice(paths, 2))
+    if jobs == 1 or len(head) < 2:
+        yield from _imap_in_process(
+            chain(head, paths), engine, max_memory, context, previews
+        )
+        return
+
+    import multiprocessing
+
+    isolated = engine == ENGINE_IMPORT
+    pool = None
+    try:
+        for batch in _batches(chain(head, paths), CHECK_BATCH_SIZE):
+            if pool is None:
+                pool = multiprocessing.Pool(
+                    processes=jobs,
+                    maxtasksperchild=1 if isolated else None,
+                    initializer=_init_worker,
+                    initargs=(context, engine, previews, baseline),
+                )
+
+            peak_rss = 0
+            for unstable, rss, symbol_updates in pool.imap(
+                _check_in_worker,
+                batch,
+                chunksize=1 if isolated else 16,
+            ):
+                peak_rss = max(peak_rss, rss or 0)
+                if symbol_updates:
+                    get_symbol_index().update(symbol_updates)
+                yield unstable
+
+            if max_memory is not None and peak_rss > max_memory:
+                _logger.debug(f"Worker memory at {peak_rss} bytes, recycling workers")
+                pool.close()
+                pool.join()
+                pool = None
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
+def get_parallel_module_checker_generator(
+    paths: Iterable[Path],
+    jobs: Optional[int] = None,
+    engine: str = ENGINE_IMPORT,
+    max_memory: Optional[int] = None,
+    context: Optional[BatchContext] = None,
+    previews: bool = True,
+) -> Iterator[UnstableModule]:
+    """
+    Same as `get_module_checker_generator`, with the modules checked by a pool of
+    `jobs` worker processes. Results are yielded in the order of `paths`.
+    See `imap_unstable_modules`.
+    """
+    yield from (
+        unstable
+        for unstable in imap_unstable_modules(
+            paths,
+            jobs=jobs,
+            engine=engine,
+            max_memory=max_memory,
+            context=context,
+            previews=previews,
+        )
+        if unstable
+    )
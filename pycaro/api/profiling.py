@@ -0,0 +1,103 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+# Called with the stage name, the path of the file it applies to (if any), and
+# the time spent in seconds
+StageHook = Callable[[str, Optional[str], float], None]
+
+_hooks: List[StageHook] = []
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _TimedStage:
+    __slots__ = ("name", "path", "start")
+
+    def __init__(self, name: str, path: Optional[str]):
+        self.name = name
+        self.path = path
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        for hook in _hooks:
+            hook(self.name, self.path, elapsed)
+        return False
+
+
+def stage(name: str, path: Optional[str] = None):
+    """
+    Context manager timing a stage of the pipeline for the registered hooks. When no
+    hook is registered, nothing is timed.
+    """
+    if not _hooks:
+        return _NULL_STAGE
+    return _TimedStage(name, path)
+
+
+def add_hook(hook: StageHook):
+    _hooks.append(hook)
+
+
+def remove_hook(hook: StageHook):
+    _hooks.remove(hook)
+
+
+@contextmanager
+def stage_hook(hook: StageHook):
+    """
+    Register `hook` for the duration of the context
+    """
+    add_hook(hook)
+    try:
+        yield hook
+    finally:
+        remove_hook(hook)
+
+
+class Profiler:
+    """
+    Hook aggregating the stage timings, in total and per file
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = defaultdict(float)
+        self.files: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+
+    def __call__(self, name: str, path: Optional[str], elapsed: float):
+        self.stages[name] += elapsed
+        if path is not None:
+            self.files[path][name] += elapsed
+
+    def slowest(self, count: int = 10) -> List[dict]:
+        return [
+            {"path": path, "seconds": sum(stages.values())}
+            for path, stages in sorted(
+                self.files.items(),
+                key=lambda item: sum(item[1].values()),
+                reverse=True,
+            )[:count]
+        ]
+
+    def report(self, count: int = 10) -> dict:
+        return {
+            "stages": dict(self.stages),
+            "slowest": self.slowest(count),
+            "files": {path: dict(stages) for path, stages in self.files.items()},
+        }
@@ -1,30 +1,46 @@
 from dataclasses import dataclass
-from typing import List, Iterator
+from typing import List, Iterator, Optional, Tuple
 
+from pycaro.api.constants import PYTHON_FILE_SUFFIXES
 
-@dataclass(frozen=True)
-class FuncCoVarsAttr:
-    co_var_name: str
-    is_attribute: bool
+
+class _SlotsRecord:
+    """
+    Pickling support of frozen dataclasses declaring `__slots__`, which the
+    default slots state restores with the (forbidden) `setattr`
+    """
+
+    __slots__: Tuple[str, ...] = ()
+
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: tuple):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
 
 
 @dataclass(frozen=True)
-class UnstableVar:
+class UnstableVar(_SlotsRecord):
     """
     For a variable considered unstable, get the first occurrence of it the analyzed method, and the matching line
     """
 
+    __slots__ = ("var_name", "first_oc_line_no", "line_preview")
+
     var_name: str
     first_oc_line_no: int
     line_preview: str
 
 
 @dataclass(frozen=True)
-class UnstableModuleObject:
+class UnstableModuleObject(_SlotsRecord):
     """
     For a given method name, associate all Variable objects considered unstable
     """
 
+    __slots__ = ("module_object", "unstable_vars")
+
     module_object: str
     unstable_vars: List[UnstableVar]
 
@@ -32,16 +48,62 @@ class UnstableModuleObject:
 @dataclass
 class UnstableModule:
     """
-    For a given module path, associate all methods considered unstable
+    For a given module path, associate all methods considered unstable.
+
+    `error` is set instead when the module could not be checked at all.
     """
 
     module_path: str
     unstable_module_objects: Iterator[UnstableModuleObject]
+    error: Optional[str] = None
 
     def __post_init__(self):
-        # TODO: remove check
+        # TODO: remove check. Errors may be about archives, which are kept as is
         self.module_path = (
             self.module_path
-            if self.module_path.endswith(".py")
+            if self.module_path.endswith(PYTHON_FILE_SUFFIXES) or self.error is not None
             else self.module_path + ".py"
         )
+
+    def to_dict(self) -> dict:
+        """
+        JSON serializable version of the module findings. Consumes
+        `unstable_module_objects` if it is a generator.
+        """
+        data = {
+            "module_path": self.module_path,
+            "unstable_module_objects": [
+                {
+                    "module_object": unstable_module_object.module_object,
+                    "unstable_vars": [
+                        {
+                            "var_name": unstable_var.var_name,
+                            "first_oc_line_no": unstable_var.first_oc_line_no,
+                            "line_preview": unstable_var.line_preview,
+                        }
+                        for unstable_var in unstable_module_object.unstable_vars
+                    ],
+                }
+                for unstable_module_object in self.unstable_module_objects
+            ],
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "UnstableModule":
+        return cls(
+            module_path=data["module_path"],
+            unstable_module_objects=[
+                UnstableModuleObject(
+                    module_object=unstable_module_object["module_object"],
+                    unstable_vars=[
+                        UnstableVar(**unstable_var)
+                        for unstable_var in unstable_module_object["unstable_vars"]
+                    ],
+                )
+                for unstable_module_object in data["unstable_module_objects"]
+            ],
+            error=data.get("error"),
+        )
@@ -0,0 +1,246 @@
+import multiprocessing
+import sys
+import time
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pycaro.api.baseline import Baseline, get_baseline
+from pycaro.api.constants import ENGINE_IMPORT, SANDBOX_TIMEOUT
+from pycaro.api.files import BatchContext
+from pycaro.api.logger import get_logger
+from pycaro.api.parallel import default_jobs
+from pycaro.api.pycaro_types import UnstableModule
+
+_logger = get_logger()
+
+# Always loaded by the fork server, so that workers do not import them again
+SANDBOX_PRELOAD = ["pycaro.api.validate"]
+
+
+def _sandboxed_check(
+    connection: Connection,
+    path: Path,
+    engine: str,
+    memory_limit: Optional[int],
+    context: Optional[BatchContext],
+    previews: bool = True,
+    baseline: Optional[Baseline] = None,
+):
+    """
+    Worker process entry point: check a single module and send the result back
+    """
+    if memory_limit is not None:
+        import resource
+
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    from pycaro.api.validate import get_unstable_module
+
+    # Modules are imported by their name from the project root, which the fork
+    # server, started once, may not have in its `sys.path`
+    root = str(context.root) if context is not None else None
+    if root is not None and root not in sys.path:
+        sys.path.insert(0, root)
+
+    try:
+        connection.send(
+            (
+                get_unstable_module(
+                    path,
+                    engine=engine,
+                    context=context,
+                    previews=previews,
+                    baseline=baseline,
+                ),
+                None,
+            )
+        )
+    except BaseException as e:
+        connection.send((None, f"{type(e).__name__}: {e}"))
+    finally:
+        connection.close()
+
+
+class _SandboxedCheck:
+    def __init__(
+        self,
+        mp_context: multiprocessing.context.BaseContext,
+        index: int,
+        path: Path,
+        engine: str,
+        memory_limit: Optional[int],
+        timeout: float,
+        context: Optional[BatchContext] = None,
+        previews: bool = True,
+        baseline: Optional[Baseline] = None,
+    ):
+        self.index = index
+        self.path = path
+        self.connection, child_connection = mp_context.Pipe(duplex=False)
+        self.process = mp_context.Process(
+            target=_sandboxed_check,
+            args=(
+                child_connection,
+                path,
+                engine,
+                memory_limit,
+                context,
+                previews,
+                baseline,
+            ),
+            daemon=True,
+        )
+        self.process.start()
+        child_connection.close()
+        self.deadline = time.monotonic() + timeout
+        self.timeout = timeout
+
+    def _error(self, error: str) -> UnstableModule:
+        return UnstableModule(
+            module_path=self.path.as_posix(),
+            unstable_module_objects=[],
+            error=error,
+        )
+
+    def receive(self) -> Optional[UnstableModule]:
+        """
+        Result of the check, once the worker sent it or exited
+        """
+        try:
+            unstable, error = self.connection.recv()
+        except EOFError:
+            self.process.join()
+            return self._error(f"worker crashed with exit code {self.process.exitcode}")
+        finally:
+            self.connection.close()
+
+        self.process.join()
+        if error is not None:
+            return self._error(error)
+        return unstable
+
+    def kill(self) -> UnstableModule:
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+        return self._error(f"timed out after {self.timeout:g}s")
+
+
+def imap_sandboxed_unstable_modules(
+    paths: Iterable[Path],
+    jobs: Optional[int] = None,
+    engine: str = ENGINE_IMPORT,
+    timeout: float = SANDBOX_TIMEOUT,
+    memory_limit: Optional[int] = None,
+    preload: Iterable[str] = (),
+    context: Optional[BatchContext] = None,
+    previews: bool = True,
+) -> Iterator[Optional[UnstableModule]]:
+    """
+    Check each module of `paths` in its own process, forked from a fork server that
+    preloaded `preload` modules (heavy dependencies shared by the checked modules).
+
+    A module whose check takes longer than `timeout` seconds is killed. Timeouts and
+    crashes, including going over `memory_limit` bytes of address space, are
+    yielded as `UnstableModule` with an `error`. Results are yielded in the order
+    of `paths`, None for stable modules.
+
+    Only the project root of the batch `context` is sent to the workers, along with
+    the baseline of the current process: workers do not inherit it.
+    """
+    jobs = jobs or default_jobs()
+    baseline = get_baseline()
+    context = context or BatchContext()
+    mp_context = multiprocessing.get_context("forkserver")
+    mp_context.set_forkserver_preload(SANDBOX_PRELOAD + list(preload))
+
+    running: Dict[Connection, _SandboxedCheck] = {}
+    results: Dict[int, Optional[UnstableModule]] = {}
+    paths = iter(paths)
+    submitted = 0
+    yielded = 0
+
+    def submit() -> bool:
+        nonlocal submitted
+        path = next(paths, None)
+        if path is None:
+            return False
+        check = _SandboxedCheck(
+            mp_context,
+            index=submitted,
+            path=path,
+            engine=engine,
+            memory_limit=memory_limit,
+            timeout=timeout,
+            context=context,
+            previews=previews,
+            baseline=baseline,
+        )
+        running[check.connection] = check
+        submitted += 1
+        return True
+
+    try:
+        while len(running) < jobs and submit():
+            pass
+
+        while running:
+            next_deadline = min(check.deadline for check in running.values())
+            ready = wait(
+                list(running.keys()),
+                timeout=max(0.0, next_deadline - time.monotonic()),
+            )
+
+            finished: List[Tuple[_SandboxedCheck, Optional[UnstableModule]]] = [
+                (running[connection], running[connection].receive())
+                for connection in ready
+            ]
+            now = time.monotonic()
+            finished += [
+                (check, check.kill())
+                for connection, check in list(running.items())
+                if connection not in ready and check.deadline <= now
+            ]
+
+            for check, unstable in finished:
+                del running[check.connection]
+                results[check.index] = unstable
+                submit()
+
+            while yielded in results:
+                yield results.pop(yielded)
+                yielded += 1
+    finally:
+        for check in running.values():
+            check.kill()
+
+
+def get_sandboxed_module_checker_generator(
+    paths: Iterable[Path],
+    jobs: Optional[int] = None,
+    engine: str = ENGINE_IMPORT,
+    timeout: float = SANDBOX_TIMEOUT,
+    memory_limit: Optional[int] = None,
+    preload: Iterable[str] = (),
+    context: Optional[BatchContext] = None,
+    previews: bool = True,
+) -> Iterator[UnstableModule]:
+    """
+    Same as `get_parallel_module_checker_generator`, with each module checked in a
+    sandboxed process. See `imap_sandboxed_unstable_modules`.
+    """
+    yield from (
+        unstable
+        for unstable in imap_sandboxed_unstable_modules(
+            paths,
+            jobs=jobs,
+            engine=engine,
+            timeout=timeout,
+            memory_limit=memory_limit,
+            preload=preload,
+            context=context,
+            previews=previews,
+        )
+        if unstable
+    )
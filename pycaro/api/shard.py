@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Optional
+
+from pycaro.api.constants import SHARD_FILE_WEIGHT
+from pycaro.api.files import BatchContext
+from pycaro.api.pycaro_types import UnstableModule
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    Part `index` (from 1) of the `count` parts of the files of a run
+    """
+
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, value: str) -> "Shard":
+        """
+        Shard from its `index/count` notation, as in `2/8`
+        """
+        index, sep, count = value.partition("/")
+        try:
+            shard = cls(index=int(index), count=int(count))
+        except ValueError:
+            shard = None
+        if not sep or shard is None or not 1 <= shard.index <= shard.count:
+            raise ValueError(
+                f"Invalid shard `{value}`, expected `i/N` with 1 <= i <= N"
+            )
+        return shard
+
+
+def _path_key(path: Path, context: BatchContext) -> str:
+    # Paths from the project root: the same on every machine
+    try:
+        normalized_path = context.path_from_root(path)
+    except (OSError, ValueError):
+        normalized_path = None
+    return normalized_path or path.as_posix()
+
+
+def _path_hash(key: str) -> int:
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "big")
+
+
+def _sized_shard_keys(
+    paths: List[Path],
+    shard: Shard,
+    context: BatchContext,
+) -> Iterator[str]:
+    """
+    Keys of the files of `shard`, with the files assigned to the least loaded
+    shard, largest files first
+    """
+    sized = []
+    for path in paths:
+        key = _path_key(path, context)
+        try:
+            size = os.stat(context.absolute_path(path)).st_size
+        except OSError:
+            size = 0
+        sized.append((size + SHARD_FILE_WEIGHT, _path_hash(key), key))
+
+    loads = [0] * shard.count
+    for weight, _, key in sorted(sized, key=lambda entry: (-entry[0], entry[1:])):
+        target = min(range(shard.count), key=lambda i: (loads[i], i))
+        loads[target] += weight
+        if target == shard.index - 1:
+            yield key
+
+
+def select_shard(
+    paths: Iterable[Path],
+    shard: Shard,
+    context: Optional[BatchContext] = None,
+    weighted: bool = False,
+) -> Iterator[Path]:
+    """
+    Files of `paths` that belong to `shard`, in the order of `paths`. Each file is
+    in exactly one of the shards, whatever the machine checking it.
+
+    Files are assigned by a stable hash of their path from the project root. When
+    `weighted`, they are assigned so that the shards have about the same total
+    size instead, which needs the size of all the files first.
+    :param paths: files to check, see `get_files`
+    :param shard: the shard to select
+    :param context: context of the batch of `paths`
+    :param weighted: balance the shards by file size rather than file count
+    """
+    context = context or BatchContext()
+    if not weighted:
+        for path in paths:
+            if _path_hash(_path_key(path, context)) % shard.count == shard.index - 1:
+                yield path
+        return
+
+    paths = list(paths)
+    keys = set(_sized_shard_keys(paths, shard, context))
+    yield from (path for path in paths if _path_key(path, context) in keys)
+
+
+def merge_results(results: Iterable[IO[str]]) -> List[UnstableModule]:
+    """
+    Findings of the JSON Lines reports `results` (see `--format jsonl`), merged
+    into a single report. Modules are sorted by path, in the order files are
+    discovered in, and reported once.
+    :raise ValueError: on a line that is not a module of a JSON Lines report
+    """
+    merged: Dict[str, UnstableModule] = {}
+    for result in results:
+        for line_no, line in enumerate(result, start=1):
+            if not line.strip():
+                continue
+            try:
+                unstable = UnstableModule.from_dict(json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                name = getattr(result, "name", "<results>")
+                raise ValueError(f"{name}:{line_no}: not a pycaro JSON line ({e})")
+            merged.setdefault(unstable.module_path, unstable)
+
+    return [
+        merged[module_path]
+        for module_path in sorted(
+            merged, key=lambda module_path: Path(module_path).parts
+        )
+    ]
@@ -0,0 +1,85 @@
+import io
+import mmap
+import os
+import tokenize
+from array import array
+from pathlib import Path
+from typing import Union
+
+from pycaro.api.constants import SOURCE_MMAP_THRESHOLD
+
+
+class SourceFile:
+    """
+    Bytes of a module source, with the offsets of its lines.
+
+    Files over `SOURCE_MMAP_THRESHOLD` bytes are memory-mapped instead of read,
+    so that only the pages of the lines actually used are loaded. Line offsets are
+    found on demand, up to the last line used, and kept in a compact array. Lines
+    are decoded one at a time, with the encoding of the source (PEP 263).
+    """
+
+    def __init__(self, data: Union[bytes, mmap.mmap], encoding: str = ""):
+        self._data = data
+        self._view = memoryview(data)
+        # Offset of the start of each line, the first `len(_offsets)` lines
+        self._offsets = array("Q", [0])
+        self._complete = False
+        self.encoding = (
+            encoding
+            or tokenize.detect_encoding(
+                io.BytesIO(self._view[: self._offset(3)]).readline
+            )[0]
+        )
+
+    @classmethod
+    def open(cls, path: Path) -> "SourceFile":
+        with open(path.as_posix(), "rb") as f:
+            if os.fstat(f.fileno()).st_size < SOURCE_MMAP_THRESHOLD:
+                return cls(f.read())
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def from_text(cls, source: str) -> "SourceFile":
+        return cls(source.encode("utf-8"), encoding="utf-8")
+
+    def close(self):
+        """
+        Unmap the file. The source cannot be read anymore.
+        """
+        self._view.release()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def _offset(self, line_no: int) -> int:
+        """
+        Offset of the start of line `line_no` (from 1), the size of the source past
+        its last line
+        """
+        offsets = self._offsets
+        while len(offsets) < line_no and not self._complete:
+            end = self._data.find(b"\n", offsets[-1])
+            if end == -1:
+                self._complete = True
+            else:
+                offsets.append(end + 1)
+        if line_no <= len(offsets):
+            return offsets[line_no - 1]
+        return len(self._data)
+
+    def segment(self, first_line: int, last_line: int) -> str:
+        """
+        Lines `first_line` to `last_line` included, with their line endings
+        """
+        start = self._offset(first_line)
+        end = self._offset(last_line + 1)
+        return str(self._view[start:end], self.encoding)
+
+    def line(self, line_no: int) -> str:
+        """
+        Line `line_no` (from 1), without its line ending
+        """
+        return self.segment(line_no, line_no).rstrip("\r\n")
+
+    def text(self) -> str:
+        return str(self._view, self.encoding)
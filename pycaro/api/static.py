@@ -0,0 +1,259 @@
+import ast
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import CodeType
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from pycaro.api.source import SourceFile
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+
+def _is_main_guard(test: ast.expr) -> bool:
+    """
+    Whether the test of an `if` statement is `__name__ == "__main__"` (in any order)
+    """
+    if not isinstance(test, ast.Compare) or len(test.ops) != 1:
+        return False
+    if not isinstance(test.ops[0], ast.Eq):
+        return False
+
+    operands = [test.left, test.comparators[0]]
+    has_name = any(
+        isinstance(operand, ast.Name) and operand.id == "__name__"
+        for operand in operands
+    )
+    has_main = any(
+        isinstance(operand, ast.Constant) and operand.value == "__main__"
+        for operand in operands
+    )
+    return has_name and has_main
+
+
+def _literal_names(node: ast.expr) -> Optional[List[str]]:
+    """
+    Strings of a list or tuple literal, None if `node` is anything else
+    """
+    if not isinstance(node, (ast.List, ast.Tuple)):
+        return None
+    names = []
+    for element in node.elts:
+        if not isinstance(element, ast.Constant) or not isinstance(element.value, str):
+            return None
+        names.append(element.value)
+    return names
+
+
+def _is_dunder_all(node: ast.expr) -> bool:
+    return isinstance(node, ast.Name) and node.id == "__all__"
+
+
+class _ModuleBindingsCollector(ast.NodeVisitor):
+    """
+    Collect the names bound in a module namespace once the module is imported.
+
+    Function, lambda, class and comprehension bodies have their own scope and are
+    not explored. The body of `if __name__ == "__main__":` does not run at import
+    time, so it is skipped as well.
+
+    `__all__` is collected when it is built from list or tuple literals only (with
+    `=`, `+=`, `.append` or `.extend`), otherwise `dynamic_all` is set.
+    """
+
+    def __init__(self):
+        self.names: Set[str] = set()
+        self.functions: Dict[str, FunctionNode] = {}
+        self.star_imports: List[str] = []
+        self.dunder_all: Optional[List[str]] = None
+        self.dynamic_all = False
+
+    def _extend_all(self, names: Optional[List[str]], replace: bool = False):
+        if names is None:
+            self.dynamic_all = True
+        elif replace or self.dunder_all is None:
+            self.dunder_all = list(names)
+        else:
+            self.dunder_all.extend(names)
+
+    def visit_Assign(self, node: ast.Assign):
+        if any(_is_dunder_all(target) for target in node.targets):
+            self._extend_all(_literal_names(node.value), replace=True)
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node: ast.AugAssign):
+        if _is_dunder_all(node.target):
+            self._extend_all(
+                _literal_names(node.value) if isinstance(node.op, ast.Add) else None
+            )
+        self.generic_visit(node)
+
+    def visit_Expr(self, node: ast.Expr):
+        call = node.value
+        if (
+            isinstance(call, ast.Call)
+            and isinstance(call.func, ast.Attribute)
+            and _is_dunder_all(call.func.value)
+        ):
+            if call.func.attr == "extend" and len(call.args) == 1:
+                self._extend_all(_literal_names(call.args[0]))
+            elif call.func.attr == "append" and len(call.args) == 1:
+                self._extend_all(_literal_names(ast.List(elts=call.args)))
+            else:
+                self.dynamic_all = True
+        self.generic_visit(node)
+
+    def _visit_function(self, node: FunctionNode):
+        self.names.add(node.name)
+        self.functions[node.name] = node
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.names.add(node.name)
+        self.functions.pop(node.name, None)
+
+    def visit_Lambda(self, node: ast.Lambda):
+        pass
+
+    def _visit_comprehension(self, node: ast.AST):
+        pass
+
+    visit_ListComp = _visit_comprehension
+    visit_SetComp = _visit_comprehension
+    visit_DictComp = _visit_comprehension
+    visit_GeneratorExp = _visit_comprehension
+
+    def _bind(self, name: str):
+        self.names.add(name)
+        # A function rebound to something else is not a function anymore
+        self.functions.pop(name, None)
+
+    def visit_Name(self, node: ast.Name):
+        if isinstance(node.ctx, ast.Store):
+            self._bind(node.id)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        # A bare annotation does not bind anything
+        if node.value is not None:
+            self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            self._bind(alias.asname or alias.name.split(".")[0])
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        for alias in node.names:
+            if alias.name == "*":
+                self.star_imports.append("." * node.level + (node.module or ""))
+                continue
+            self._bind(alias.asname or alias.name)
+
+    def visit_If(self, node: ast.If):
+        if _is_main_guard(node.test):
+            for statement in node.orelse:
+                self.visit(statement)
+            return
+        self.generic_visit(node)
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler):
+        # The `as` name is deleted at the end of the handler
+        for statement in node.body:
+            self.visit(statement)
+
+    def visit_MatchAs(self, node: ast.AST):
+        if node.name is not None:
+            self._bind(node.name)
+        self.generic_visit(node)
+
+    def visit_MatchStar(self, node: ast.AST):
+        if node.name is not None:
+            self._bind(node.name)
+
+    def visit_MatchMapping(self, node: ast.AST):
+        if node.rest is not None:
+            self._bind(node.rest)
+        self.generic_visit(node)
+
+
+@dataclass
+class StaticModule:
+    """
+    Namespace of a module rebuilt from its source, without executing it
+    """
+
+    path: Path
+    source: str
+    # Lines of `source`, encoded from it if not given
+    source_file: Optional[SourceFile] = field(default=None, repr=False, compare=False)
+    names: Set[str] = field(init=False)
+    functions: Dict[str, FunctionNode] = field(init=False)
+    star_imports: List[str] = field(init=False)
+    # Literal value of `__all__`, unknown if `dynamic_all`
+    dunder_all: Optional[List[str]] = field(init=False)
+    dynamic_all: bool = field(init=False)
+
+    def __post_init__(self):
+        self._tree: Optional[ast.Module] = ast.parse(
+            self.source, filename=self.path.as_posix()
+        )
+        self._code: Optional[CodeType] = None
+
+        collector = _ModuleBindingsCollector()
+        for statement in self._tree.body:
+            collector.visit(statement)
+
+        self.names = collector.names
+        self.functions = collector.functions
+        self.star_imports = collector.star_imports
+        self.dunder_all = collector.dunder_all
+        self.dynamic_all = collector.dynamic_all
+        if self.source_file is None:
+            self.source_file = SourceFile.from_text(self.source)
+
+    @property
+    def code(self) -> CodeType:
+        """
+        Module code object, only compiled when function code objects are needed
+        """
+        if self._code is None:
+            self._code = compile(self._tree, self.path.as_posix(), "exec")
+            self._tree = None
+        return self._code
+
+    @property
+    def function_ranges(self) -> Dict[str, Tuple[int, Optional[int]]]:
+        """
+        First and last lines of each module level function, decorators excluded.
+        Before python 3.8, nodes have no end line: the last line is None, and the
+        first line is the one of the first decorator.
+        """
+        return {
+            name: (node.lineno, getattr(node, "end_lineno", None))
+            for name, node in self.functions.items()
+        }
+
+    @classmethod
+    def from_path(cls, path: Path) -> "StaticModule":
+        source_file = SourceFile.open(path)
+        return cls(path=path, source=source_file.text(), source_file=source_file)
+
+    def _function_first_line(self, name: str) -> int:
+        node = self.functions[name]
+        return min([node.lineno] + [d.lineno for d in node.decorator_list])
+
+    def get_function_code(self, name: str) -> CodeType:
+        """
+        Get the code object the compiler built for the module level function `name`
+        """
+        node = self.functions[name]
+        first_line = self._function_first_line(name)
+        for const in self.code.co_consts:
+            if (
+                isinstance(const, CodeType)
+                and const.co_name == name
+                and first_line <= const.co_firstlineno <= node.lineno
+            ):
+                return const
+
+        raise LookupError(f"No code object found for `{name}` in {self.path}")
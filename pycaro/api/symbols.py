@@ -0,0 +1,269 @@
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from importlib.machinery import PathFinder
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from pycaro.api.files import find_project_root
+from pycaro.api.logger import get_logger
+from pycaro.api.static import StaticModule
+
+_logger = get_logger()
+
+
+def _public_names(static_module: StaticModule) -> Optional[List[str]]:
+    """
+    Names bound by `from module import *`, without the ones the star imports of
+    the module add when it has no `__all__`. None if they cannot be known
+    statically.
+    """
+    if static_module.dynamic_all:
+        return None
+    if static_module.dunder_all is not None:
+        return sorted(set(static_module.dunder_all))
+    return sorted(name for name in static_module.names if not name.startswith("_"))
+
+
+def exports_entry(
+    module: str, static_module: StaticModule, is_package: bool
+) -> Dict[str, Any]:
+    """
+    What the index keeps of `module` to resolve its exports
+    :param is_package: whether `module` is a package, which its relative star
+    imports are resolved from
+    """
+    package = module if is_package else module.rpartition(".")[0]
+    return {
+        "names": _public_names(static_module),
+        "all": static_module.dunder_all is not None,
+        "star_imports": [
+            resolve_star_import(star_import, package)
+            for star_import in static_module.star_imports
+        ],
+    }
+
+
+class SymbolIndex:
+    """
+    Names exported by modules, that is the names bound by `from module import *`,
+    resolved from their source without importing anything.
+
+    Modules are looked up in the project root first, then in `sys.path`. `__all__`
+    is used when it is a literal, and star imports of exporting modules are
+    followed. Exports are unknown (None) for modules without python source, like
+    extension modules, and for modules with a dynamic `__all__`.
+
+    An index is meant to be shared by all the checks of a run, so that each module
+    is resolved once. It can be persisted to the cache directory, in which case
+    modules unchanged since the previous run are not parsed again.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        path: Optional[Path] = None,
+    ):
+        self.root = root or find_project_root(())
+        self.path = path
+        self.search_paths = [str(self.root)] + [
+            search_path for search_path in sys.path if search_path
+        ]
+
+        # module -> {"path", "mtime_ns", "size", "names", "all", "star_imports"}
+        self.entries: Dict[str, dict] = {}
+        # Entries added since the last `pop_updates`
+        self._updates: Dict[str, dict] = {}
+        self._locations: Dict[str, Optional[List[str]]] = {}
+        self._origins: Dict[str, Optional[str]] = {}
+        self._exports: Dict[str, Optional[FrozenSet[str]]] = {}
+
+    @classmethod
+    def load(cls, cache_dir: Path, root: Optional[Path] = None) -> "SymbolIndex":
+        """
+        Index persisted in `cache_dir` by a previous run, or an empty one
+        """
+        # Not at the top: `pycaro` imports this module before defining its version
+        from pycaro import __version__
+
+        config_key = ":".join([__version__, "{}.{}".format(*sys.version_info[:2])])
+        config_digest = hashlib.sha256(config_key.encode()).hexdigest()[:16]
+        index = cls(root=root, path=cache_dir.joinpath(f"symbols-{config_digest}.json"))
+        try:
+            with index.path.open(encoding="utf-8") as f:
+                index.entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+        return index
+
+    def save(self):
+        """
+        Persist the index, if it was loaded with `load` and modules were added
+        """
+        if self.path is None or not self._updates:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+        self._updates = {}
+
+    def pop_updates(self) -> Dict[str, dict]:
+        """
+        Entries resolved since the last call, to be merged in the index of another
+        process with `update`
+        """
+        updates, self._updates = self._updates, {}
+        return updates
+
+    def update(self, entries: Dict[str, dict]):
+        for module, entry in entries.items():
+            self.entries[module] = entry
+            self._updates[module] = entry
+            self._exports.pop(module, None)
+
+    def _find(self, module: str) -> Optional[str]:
+        """
+        Source file of `module`, found without importing it nor its parents
+        """
+        if module in self._origins:
+            return self._origins[module]
+
+        parent, _, _ = module.rpartition(".")
+        search_paths = self.search_paths
+        if parent:
+            self._find(parent)
+            search_paths = self._locations.get(parent)
+
+        spec = PathFinder.find_spec(module, search_paths) if search_paths else None
+        origin = None
+        if spec is not None:
+            self._locations[module] = (
+                list(spec.submodule_search_locations)
+                if spec.submodule_search_locations is not None
+                else None
+            )
+            if spec.origin and spec.origin.endswith(".py"):
+                origin = spec.origin
+
+        self._origins[module] = origin
+        return origin
+
+    def _entry(self, module: str) -> Optional[dict]:
+        """
+        Entry of `module`, parsed again if its source changed since it was indexed
+        """
+        origin = self._find(module)
+        if origin is None:
+            return None
+
+        try:
+            stat = os.stat(origin)
+        except OSError:
+            return None
+
+        entry = self.entries.get(module)
+        if (
+            entry is not None
+            and entry["path"] == origin
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["size"] == stat.st_size
+        ):
+            return entry
+
+        try:
+            static_module = StaticModule.from_path(Path(origin))
+        except (OSError, SyntaxError, UnicodeDecodeError, ValueError) as e:
+            _logger.debug(f"Could not index `{module}`: {e}")
+            return None
+
+        entry = {
+            "path": origin,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            **exports_entry(
+                module,
+                static_module,
+                is_package=os.path.basename(origin) == "__init__.py",
+            ),
+        }
+        self.entries[module] = entry
+        self._updates[module] = entry
+        return entry
+
+    def exports(self, module: str) -> Optional[FrozenSet[str]]:
+        """
+        Names bound by `from module import *`, None if they cannot be known
+        statically
+        """
+        if module in self._exports:
+            return self._exports[module]
+
+        # Cyclic star imports: nothing more than what is already known
+        self._exports[module] = frozenset()
+
+        exports: Optional[FrozenSet[str]] = None
+        entry = self._entry(module)
+        if entry is not None and entry["names"] is not None:
+            names = set(entry["names"])
+            # With `__all__`, exactly its names are exported
+            if entry["star_imports"] and not entry["all"]:
+                star_names = self.star_imported_names(entry["star_imports"])
+                names = None if star_names is None else names | star_names
+            exports = None if names is None else frozenset(names)
+
+        self._exports[module] = exports
+        return exports
+
+    def star_imported_names(
+        self,
+        modules: Iterable[Optional[str]],
+    ) -> Optional[Set[str]]:
+        """
+        Names bound by star imports of `modules` (resolved, absolute names), None if
+        one of them cannot be known statically
+        """
+        names: Set[str] = set()
+        for module in modules:
+            exports = self.exports(module) if module is not None else None
+            if exports is None:
+                return None
+            names.update(exports)
+        return names
+
+
+def resolve_star_import(star_import: str, package: str) -> Optional[str]:
+    """
+    Absolute name of the module of a star import found in `package`, None if a
+    relative import goes beyond the top level package
+    """
+    try:
+        return importlib.util.resolve_name(star_import, package)
+    except (ImportError, ValueError):
+        return None
+
+
+_symbol_index: Optional[SymbolIndex] = None
+
+
+def get_symbol_index() -> SymbolIndex:
+    """
+    Symbol index shared by the checks of the current process
+    """
+    global _symbol_index
+    if _symbol_index is None:
+        _symbol_index = SymbolIndex()
+    return _symbol_index
+
+
+def set_symbol_index(index: Optional[SymbolIndex]):
+    """
+    Share `index` with the next checks of the current process. Worker processes
+    forked afterwards start from it as well.
+    """
+    global _symbol_index
+    _symbol_index = index
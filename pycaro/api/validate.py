@@ -1,32 +1,78 @@
+import builtins
 import importlib
-import re
-from functools import lru_cache
-from inspect import getsource
+import linecache
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from functools import partial
 from pathlib import Path
-from typing import Iterator, Optional, List
+from types import CodeType, ModuleType
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    Optional,
+    List,
+    Set,
+    Tuple,
+)
 
-from pycaro.api.constants import BUILTIN_OBJECTS
-from pycaro.api.files import find_project_root, get_path_from_root, get_absolute_path
+from pycaro.api.baseline import Baseline, get_baseline
+from pycaro.api.bytecode import classify_names
+from pycaro.api.constants import (
+    BUILTIN_OBJECTS,
+    ENGINE_IMPORT,
+    ENGINE_STATIC,
+    ENGINES,
+    ORDER_PATHS,
+    ORDER_SORTED,
+    ORDERS,
+)
+from pycaro.api.files import (
+    BatchContext,
+    find_project_root,
+    get_path_from_root,
+    get_absolute_path,
+)
+from pycaro.api.line_index import FirstUsageIndex
 from pycaro.api.logger import get_logger
+from pycaro.api.profiling import stage
 from pycaro.api.pycaro_types import (
     UnstableVar,
     UnstableModuleObject,
     UnstableModule,
-    FuncCoVarsAttr,
+)
+from pycaro.api.source import SourceFile
+from pycaro.api.static import StaticModule
+from pycaro.api.symbols import (
+    SymbolIndex,
+    get_symbol_index,
+    resolve_star_import,
 )
 
 _logger = get_logger()
 
+# Shared by all static checks, as no module code can change builtins there
+_BUILTIN_NAMES = frozenset(vars(builtins))
+_BUILTIN_OBJECTS = frozenset(BUILTIN_OBJECTS)
 
-def _are_co_var_attributes(
-    func,
-) -> Iterator[FuncCoVarsAttr]:
-    co_var_names = func.__code__.co_varnames
-    source = getsource(func)
-    for co_var_name in co_var_names:
-        yield FuncCoVarsAttr(
-            co_var_name=co_var_name, is_attribute=f".{co_var_name}" in source
-        )
+
+def _release_modules(names: Iterable[str], root: Path):
+    """
+    Remove from `sys.modules` the modules of `names` loaded from files under `root`,
+    as well as their cached source lines. Modules of pycaro itself are kept.
+    """
+    root_prefix = os.path.join(str(root), "")
+    for name in names:
+        if name == "pycaro" or name.startswith("pycaro."):
+            continue
+        module_file = getattr(sys.modules.get(name), "__file__", None)
+        if module_file and os.path.abspath(module_file).startswith(root_prefix):
+            del sys.modules[name]
+            linecache.cache.pop(module_file, None)
 
 
 class VarNotFoundInMethodException(Exception):
@@ -35,66 +81,205 @@ class VarNotFoundInMethodException(Exception):
     def __init__(self, method_name: str, var_name: str, *args):
         self.method_name = method_name
         self.var_name = var_name
-        super(
+        super().__init__(
             f"Could not find the var `{self.var_name}` in `{self.method_name}`", *args
         )
 
 
 class ModuleChecker:
+    """
+    Check the module objects of a single file.
+
+    With the `import` engine, the module is imported to get its namespace. With the
+    `static` engine, the namespace is rebuilt from the source and the compiled code
+    objects, and no module code is ever run. Star imports are then resolved with
+    `symbols`, the symbol index of the current process by default.
+
+    With a batch `context`, its project root is used, and the path of the file is
+    normalized with it. The `source` of the file can be given when it was already
+    read, so that it is not read again.
+
+    Without `previews`, unstable variables are reported without their first
+    occurrence (line 0, empty preview), and the source is never tokenized: enough
+    to count the findings.
+
+    Findings known by `baseline`, the baseline of the current process by default,
+    are dropped before their first occurrence is looked up.
+
+    Checkers created by a `collection` share the state of its run.
+
+    With the `import` engine, an already imported `module` of the file can be given:
+    its namespace is checked as is, without importing anything.
+    """
+
     def __init__(
         self,
         file_path: Path,
+        engine: str = ENGINE_IMPORT,
+        symbols: Optional[SymbolIndex] = None,
+        context: Optional[BatchContext] = None,
+        source: Optional[str] = None,
+        previews: bool = True,
+        baseline: Optional[Baseline] = None,
+        collection: Optional["ModuleCollectionCheck"] = None,
+        module: Optional[ModuleType] = None,
     ):
-        self.file_path = file_path
-        self.root = find_project_root(())
-
-        self.absolute_path = get_absolute_path(
-            path=self.file_path,
-            root=self.root,
-        )
-        self.file_path_normalized = get_path_from_root(
-            path=self.absolute_path,
-            root=self.root,
-        )
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine `{engine}`, expected one of {ENGINES}")
 
-        self.importable_module_path = self.file_path_normalized.replace(
-            ".py", ""
-        ).replace("/", ".")
+        self.file_path = file_path
+        self.module = module
+        self.engine = engine
+        self.symbols = symbols
+        self.source = source
+        self.previews = previews
+        self.baseline = baseline if baseline is not None else get_baseline()
+        self.collection = collection
+        self._init_paths(context)
         _logger.debug(self.importable_module_path)
 
-        self.visited = importlib.import_module(
-            self.importable_module_path,
-        )
+        self._first_usage_index: Optional[FirstUsageIndex] = None
+        # module object -> var name -> bound
+        self._checks: Dict[str, Dict[str, bool]] = {}
+        self._is_stable: Optional[bool] = None
+        self._as_unstable_module: Optional[UnstableModule] = None
+        self._as_unstable_module_done = False
+        # Modules added to `sys.modules` by the import of the checked module
+        self.loaded_modules: List[str] = []
+
+        if self.engine == ENGINE_STATIC:
+            self._init_static()
+        else:
+            self._init_import()
+
+    def _init_paths(self, context: Optional[BatchContext]):
+        """
+        Set the project root, the absolute and normalized paths of the file, and
+        the name the module is imported with
+        """
+        if context is not None:
+            self.root = context.root
+            self.absolute_path = context.absolute_path(self.file_path)
+            self.file_path_normalized = context.path_from_root(self.absolute_path)
+        else:
+            self.root = find_project_root(())
+            self.absolute_path = get_absolute_path(
+                path=self.file_path,
+                root=self.root,
+            )
+            self.file_path_normalized = get_path_from_root(
+                path=self.absolute_path,
+                root=self.root,
+            )
 
-        visited_all_objects = vars(self.visited)
-        self.valid_names = list(visited_all_objects.keys()) + list(
-            visited_all_objects["__builtins__"].keys()
-        )
+        self.importable_module_path = os.path.splitext(self.file_path_normalized)[
+            0
+        ].replace("/", ".")
+
+    def _init_import(self):
+        if self.module is not None:
+            self.visited = self.module
+        else:
+            loaded_before = set(sys.modules)
+            with stage("import", self.file_path.as_posix()):
+                self.visited = importlib.import_module(
+                    self.importable_module_path,
+                )
+            self.loaded_modules = [
+                name for name in sys.modules if name not in loaded_before
+            ]
+        self.static_module = None
 
+        visited_all_objects = vars(self.visited)
+        if self.collection is not None:
+            self.builtin_names = self.collection.builtin_names(
+                visited_all_objects["__builtins__"]
+            )
+        else:
+            self.builtin_names = frozenset(visited_all_objects["__builtins__"])
+        self.valid_names = self.builtin_names.union(visited_all_objects.keys())
+        self.unresolved_star_imports = False
+
+        # Functions defined in another module, re-exported by this one, are
+        # checked with their own module
+        module_file = visited_all_objects.get("__file__")
         self.module_imported_objects = {
             obj_name
-            for obj_name in visited_all_objects.keys()
-            if not hasattr(visited_all_objects[obj_name], "__code__")
+            for obj_name, obj in visited_all_objects.items()
+            if not hasattr(obj, "__code__") or obj.__code__.co_filename != module_file
         }
 
         self.module_objects = {
             obj_name
-            for obj_name in set(visited_all_objects.keys())
-            .difference(set(BUILTIN_OBJECTS))
-            .difference(self.module_imported_objects)
+            for obj_name in visited_all_objects.keys()
+            if obj_name not in _BUILTIN_OBJECTS
+            and obj_name not in self.module_imported_objects
         }
 
+    def _init_static(self):
+        self.visited = None
+        with stage("parse", self.file_path.as_posix()):
+            self.static_module = self._static_module()
+
+        module_names = self.static_module.names.union(_BUILTIN_OBJECTS)
+
+        self.unresolved_star_imports = False
+        if self.static_module.star_imports:
+            star_imported_names = self._star_imported_names()
+            if star_imported_names is None:
+                # Names pulled by a star import are unknown without running the
+                # module: be conservative and consider any name as bound.
+                self.unresolved_star_imports = True
+                _logger.debug(
+                    f"{self.file_path_normalized}: star import(s) from "
+                    f"{self.static_module.star_imports} not resolved, all names "
+                    f"considered valid"
+                )
+            else:
+                module_names |= star_imported_names
+
+        self.builtin_names = _BUILTIN_NAMES
+        self.valid_names = module_names.union(self.builtin_names)
+
+        self.module_objects = set(self.static_module.functions.keys())
+        self.module_imported_objects = module_names.difference(self.module_objects)
+
+    def _static_module(self) -> StaticModule:
+        if self.source is not None:
+            return StaticModule(path=self.absolute_path, source=self.source)
+        return StaticModule.from_path(self.absolute_path)
+
+    def _star_imported_names(self) -> Optional[Set[str]]:
+        symbols = self.symbols or get_symbol_index()
+        package = self.importable_module_path.rpartition(".")[0]
+        return symbols.star_imported_names(
+            resolve_star_import(star_import, package)
+            for star_import in self.static_module.star_imports
+        )
+
+    def is_valid_name(self, var_name: str) -> bool:
+        if self.unresolved_star_imports:
+            return True
+        return var_name in self.valid_names
+
+    def get_module_object_code(self, module_object: str) -> CodeType:
+        if self.static_module is not None:
+            return self.static_module.get_function_code(module_object)
+        return vars(self.visited)[module_object].__code__
+
     @property
-    @lru_cache(None)
     def is_stable(self) -> bool:
         """
-        Considered stable
+        Considered stable: no module object uses an unbound name, known findings of
+        the baseline aside. Stops at the first unstable module object.
         :return:
         """
-        return (
-            len(self.module_objects) == 0
-            or len(list(map(self.get_method_var_names, self.module_objects))) == 0
-        )
+        if self._is_stable is None:
+            self._is_stable = not any(
+                self.get_unstable_var_names(module_object)
+                for module_object in sorted(self.module_objects)
+            )
+        return self._is_stable
 
     def get_method_var_names(self, module_object: str) -> List[str]:
         """
@@ -103,67 +288,112 @@ class ModuleChecker:
         :return:
         """
 
-        obj = vars(self.visited)[module_object]
+        code = self.get_module_object_code(module_object)
 
-        # locals
-        used_var = vars(self.visited)[module_object].__code__.co_names
+        with stage("var_names", self.file_path.as_posix()):
+            # Names read from the module namespace, in the method or in the code
+            # objects nested in it
+            used_var = classify_names(code).global_names
 
-        # Remove builtins
-        local_vars = set(used_var).difference(vars(self.visited)["__builtins__"].keys())
+            # Remove builtins
+            local_vars = used_var.difference(self.builtin_names)
 
-        # Remove imported
-        local_vars = local_vars.difference(self.module_imported_objects)
-
-        local_vars = local_vars.difference(
-            {
-                func_co_var_attr.co_var_name
-                for func_co_var_attr in _are_co_var_attributes(obj)
-                if func_co_var_attr.is_attribute
-            }
-        )
+            # Remove imported
+            local_vars = local_vars.difference(self.module_imported_objects)
 
         return list(local_vars)
 
+    @property
+    def first_usage_index(self) -> FirstUsageIndex:
+        """
+        Index of the first occurrence of names in the module functions, built once
+        """
+        if self._first_usage_index is None:
+            with stage("first_usage", self.file_path.as_posix()):
+                if self.static_module is not None:
+                    self._first_usage_index = FirstUsageIndex(
+                        source=self.static_module.source_file,
+                        function_ranges=self.static_module.function_ranges,
+                    )
+                else:
+                    self._first_usage_index = FirstUsageIndex(
+                        source=self._source_file(),
+                        function_ranges=self._function_first_lines(),
+                    )
+        return self._first_usage_index
+
+    def _source_file(self) -> SourceFile:
+        if self.source is not None:
+            return SourceFile.from_text(self.source)
+        return SourceFile.open(self.absolute_path)
+
+    def _function_first_lines(self) -> Dict[str, Tuple[int, Optional[int]]]:
+        """
+        First lines of the functions of the imported module, from their code
+        objects: the source is not parsed
+        """
+        namespace = vars(self.visited)
+        return {
+            module_object: (namespace[module_object].__code__.co_firstlineno, None)
+            for module_object in self.module_objects
+        }
+
     def get_var_name_first_usage(
         self, module_object: str, var_name: str
     ) -> UnstableVar:
-        # Patterns definition
-        def_pattern = re.compile(rf"^\s*def\s{re.escape(module_object)}\(.*$")
-        var_pattern = re.compile(rf"^.*[^\w]{re.escape(var_name)}[^\w|$]")
-
-        with open(self.absolute_path.as_posix(), "r") as f:
-            lines = f.readlines()
-
-            # Find the definition starting line
-            for i, line in enumerate(lines):
-                if def_pattern.match(line):
-                    break
-
-            # Once the definition starting line is found, find the
-            # var name first occurrence and return
-            for j, method_line in enumerate(lines[i:]):
-                if var_pattern.match(method_line):
-                    return UnstableVar(
-                        var_name=var_name,
-                        first_oc_line_no=i + 1 + j,
-                        line_preview=method_line.rstrip("\n"),
-                    )
+        first_usage = self.first_usage_index.get(
+            function=module_object,
+            name=var_name,
+        )
+        if first_usage is None:
+            # We should not end up here. Right now this helps find uncharted patterns
+            raise VarNotFoundInMethodException(
+                method_name=module_object,
+                var_name=var_name,
+            )
 
-        # We should not end up here. Right now this helps find uncharted patterns
-        raise VarNotFoundInMethodException(
-            method_name=module_object,
+        line_no, line = first_usage
+        return UnstableVar(
             var_name=var_name,
+            first_oc_line_no=line_no,
+            line_preview=line,
         )
 
     def check(self, module_object: str):
         """
-        Returns an index of all var names with their stability evaluation.
+        Returns an index of all var names with their stability evaluation, computed
+        once per module object.
         :param module_object: The name of the method on which we check variables
         """
-        return {
-            var_name: var_name in self.valid_names
-            for var_name in self.get_method_var_names(module_object=module_object)
-        }
+        checked = self._checks.get(module_object)
+        if checked is None:
+            checked = {
+                var_name: self.is_valid_name(var_name)
+                for var_name in self.get_method_var_names(module_object=module_object)
+            }
+            self._checks[module_object] = checked
+        return checked
+
+    def get_unstable_var_names(self, module_object: str) -> List[str]:
+        """
+        Names used by `module_object` but not bound, without the findings known by
+        the baseline
+        :param module_object: The name of the method on which we check variables
+        """
+        unstable_var_names = [
+            var_name
+            for var_name, stable in self.check(module_object).items()
+            if not stable
+        ]
+        if self.baseline is not None and unstable_var_names:
+            unstable_var_names = [
+                var_name
+                for var_name in unstable_var_names
+                if not self.baseline.is_known(
+                    self.file_path_normalized, module_object, var_name
+                )
+            ]
+        return unstable_var_names
 
     def check_all(self):
         return [
@@ -174,28 +404,46 @@ class ModuleChecker:
     @property
     def unstable_module_objects(self) -> Iterator[UnstableModuleObject]:
         """
-        Generator property of all unstable module objects in the given module
+        Generator property of all unstable module objects in the given module,
+        sorted by name so that the output does not depend on hash seeds
         """
-        for module_object in self.module_objects:
+        for module_object in sorted(self.module_objects):
 
             # Check all vars of the given method {method_name}
-            vars_checked = self.check(
-                module_object=module_object,
-            )
-            if all(vars_checked.values()):
+            unstable_var_names = self.get_unstable_var_names(module_object)
+            if not unstable_var_names:
                 # No need to go any further if all vars
-                # are bounded for {method_name}
+                # are bounded (or known) for {method_name}
                 continue
 
-            # Build the list of unstable variables
-            unstable_vars = [
-                self.get_var_name_first_usage(
+            if not self.previews:
+                yield UnstableModuleObject(
                     module_object=module_object,
-                    var_name=var_name,
+                    unstable_vars=[
+                        UnstableVar(
+                            var_name=var_name,
+                            first_oc_line_no=0,
+                            line_preview="",
+                        )
+                        for var_name in sorted(unstable_var_names)
+                    ],
                 )
-                for var_name, stable in vars_checked.items()
-                if not stable
-            ]
+                continue
+
+            # Build the list of unstable variables, in order of appearance
+            unstable_vars = sorted(
+                (
+                    self.get_var_name_first_usage(
+                        module_object=module_object,
+                        var_name=var_name,
+                    )
+                    for var_name in unstable_var_names
+                ),
+                key=lambda unstable_var: (
+                    unstable_var.first_oc_line_no,
+                    unstable_var.var_name,
+                ),
+            )
 
             yield UnstableModuleObject(
                 module_object=module_object,
@@ -203,38 +451,244 @@ class ModuleChecker:
             )
 
     @property
-    @lru_cache(None)
     def as_unstable_module(self) -> Optional[UnstableModule]:
-        if self.is_stable or next(self.unstable_module_objects) is None:
-            return None
-        return UnstableModule(
-            module_path=self.file_path.as_posix(),
-            unstable_module_objects=self.unstable_module_objects,
-        )
+        """
+        Findings of the module, fully evaluated so that they do not keep a
+        reference to the checker. None if the module is stable.
+        """
+        if not self._as_unstable_module_done:
+            unstable_module_objects = (
+                [] if self.is_stable else list(self.unstable_module_objects)
+            )
+            if unstable_module_objects:
+                self._as_unstable_module = UnstableModule(
+                    module_path=self.file_path.as_posix(),
+                    unstable_module_objects=unstable_module_objects,
+                )
+            self._as_unstable_module_done = True
+        return self._as_unstable_module
+
+    def release(self, release_modules: bool = False):
+        """
+        Drop the state of the checked module. The findings, once evaluated, are
+        kept.
+        :param release_modules: also remove the modules its import loaded from
+        `sys.modules`. Modules shared with other checks are then imported again,
+        side effects included, by the next check using them.
+        """
+        if release_modules:
+            _release_modules(self.loaded_modules, self.root)
+        self.loaded_modules = []
+        self.visited = None
+        self.module = None
+        if self._first_usage_index is not None:
+            self._first_usage_index.source_file.close()
+        if self.static_module is not None:
+            self.static_module.source_file.close()
+        self.static_module = None
+        self._first_usage_index = None
+        self._checks = {}
+
+
+@dataclass
+class RunStats:
+    """
+    Statistics of the checks of a run
+    """
+
+    # Modules checked, stable or not
+    modules: int = 0
+    unstable_modules: int = 0
+    # Module objects checked, stable or not
+    module_objects: int = 0
+    unstable_vars: int = 0
+    # Time spent checking, in seconds
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
 
 
 class ModuleCollectionCheck:
-    def __init__(self, paths: List[Path]):
+    """
+    Check of a collection of modules, the engine of a run.
+
+    State that does not change during the run is set up once and shared by the
+    checkers of all the modules: the batch `context` (project root and resolved
+    directories), the symbol index, the baseline and the builtin names.
+
+    Iterating over the check yields the findings of the unstable modules, in the
+    order of `paths` or sorted by path (see `ORDERS`). Sorting reads all the
+    paths first. `stats` are updated as the modules are checked.
+
+    With `release_modules`, the modules each import loaded are removed from
+    `sys.modules` after its check, to keep the memory of long runs flat.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        engine: str = ENGINE_IMPORT,
+        context: Optional[BatchContext] = None,
+        previews: bool = True,
+        baseline: Optional[Baseline] = None,
+        symbols: Optional[SymbolIndex] = None,
+        order: str = ORDER_PATHS,
+        release_modules: bool = False,
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine `{engine}`, expected one of {ENGINES}")
+        if order not in ORDERS:
+            raise ValueError(f"Unknown order `{order}`, expected one of {ORDERS}")
+
         self.paths = paths
+        self.engine = engine
+        self.context = context or BatchContext()
+        self.previews = previews
+        self.baseline = baseline if baseline is not None else get_baseline()
+        if symbols is None and engine == ENGINE_STATIC:
+            symbols = get_symbol_index()
+        self.symbols = symbols
+        self.order = order
+        self.release_modules = release_modules
+        self.stats = RunStats()
+
+        # Builtins of the imported modules: their namespace, its size when its
+        # names were read, and the names
+        self._builtins: Optional[Tuple[dict, int, FrozenSet[str]]] = None
+        self._results: Optional[Iterator[UnstableModule]] = None
+
+    def builtin_names(self, namespace: dict) -> FrozenSet[str]:
+        """
+        Names of the builtins `namespace` of an imported module, read again only
+        when names were added to or removed from it
+        """
+        if (
+            self._builtins is None
+            or self._builtins[0] is not namespace
+            or self._builtins[1] != len(namespace)
+        ):
+            self._builtins = (namespace, len(namespace), frozenset(namespace))
+        return self._builtins[2]
+
+    def check(
+        self, path: Path, source: Optional[str] = None
+    ) -> Optional[UnstableModule]:
+        """
+        Findings of a single module of the run, fully evaluated. None if the
+        module is stable.
+        :param path: path of the module to check
+        :param source: source of the module, if already read
+        """
+        return self.run_checker(
+            partial(
+                ModuleChecker,
+                path,
+                engine=self.engine,
+                symbols=self.symbols,
+                context=self.context,
+                source=source,
+                previews=self.previews,
+                baseline=self.baseline,
+                collection=self,
+            )
+        )
+
+    def run_checker(
+        self, create_checker: Callable[[], ModuleChecker]
+    ) -> Optional[UnstableModule]:
+        """
+        Findings of the checker built by `create_checker`, counted in the run
+        """
+        start = time.perf_counter()
+        checker = create_checker()
+        try:
+            unstable = checker.as_unstable_module
+            self.stats.module_objects += len(checker.module_objects)
+        finally:
+            checker.release(release_modules=self.release_modules)
+            self.stats.modules += 1
+            self.stats.seconds += time.perf_counter() - start
+
+        if unstable is not None:
+            self.stats.unstable_modules += 1
+            self.stats.unstable_vars += sum(
+                len(unstable_module_object.unstable_vars)
+                for unstable_module_object in unstable.unstable_module_objects
+            )
+        return unstable
+
+    def _ordered_paths(self) -> Iterable[Path]:
+        if self.order == ORDER_SORTED:
+            return sorted(self.paths, key=lambda path: path.parts)
+        return self.paths
+
+    def _gen_results(self) -> Iterator[UnstableModule]:
+        for path in self._ordered_paths():
+            unstable = self.check(path)
+            if unstable:
+                yield unstable
 
-    def __iter__(self):
-        pass
+    def __iter__(self) -> "ModuleCollectionCheck":
+        return self
 
-    def __next__(self):
-        pass
+    def __next__(self) -> UnstableModule:
+        if self._results is None:
+            self._results = self._gen_results()
+        return next(self._results)
 
 
 def get_module_checker_generator(
     paths: List[Path],
+    engine: str = ENGINE_IMPORT,
+    context: Optional[BatchContext] = None,
+    previews: bool = True,
 ) -> Optional[Iterator[ModuleChecker]]:
     """
     Generate a list of unstable module object after having checked that the module contains unstable methods
     :param paths: paths to scan
+    :param engine: engine used to get each module namespace, see `ENGINES`
+    :param context: context shared by the checks of all `paths`, created once for
+    them by default
+    :param previews: find the first occurrence of each unstable variable
     :return:
     """
-    for path in paths:
-        checker = ModuleChecker(path)
-
-        unstable = checker.as_unstable_module
-        if unstable:
-            yield unstable
+    yield from ModuleCollectionCheck(
+        paths, engine=engine, context=context, previews=previews
+    )
+
+
+def get_unstable_module(
+    path: Path,
+    engine: str = ENGINE_IMPORT,
+    context: Optional[BatchContext] = None,
+    source: Optional[str] = None,
+    previews: bool = True,
+    baseline: Optional[Baseline] = None,
+    release_modules: bool = False,
+) -> Optional[UnstableModule]:
+    """
+    Check a single module and return its findings fully evaluated, so that they
+    can be pickled and sent across processes.
+    :param path: path of the module to check
+    :param engine: engine used to get the module namespace, see `ENGINES`
+    :param context: context of the batch the module is part of, if any
+    :param source: source of the module, if already read
+    :param previews: find the first occurrence of each unstable variable
+    :param baseline: known findings, the baseline of the process by default
+    :param release_modules: remove the modules the import loaded from
+    `sys.modules` afterwards
+    :return: None if the module is stable
+    """
+    checker = ModuleChecker(
+        path,
+        engine=engine,
+        context=context,
+        source=source,
+        previews=previews,
+        baseline=baseline,
+    )
+    try:
+        return checker.as_unstable_module
+    finally:
+        checker.release(release_modules=release_modules)
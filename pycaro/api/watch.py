@@ -0,0 +1,132 @@
+import os
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pycaro.api.constants import ENGINE_IMPORT
+from pycaro.api.files import get_files
+from pycaro.api.logger import get_logger
+from pycaro.api.pycaro_types import UnstableModule
+from pycaro.api.validate import get_unstable_module
+
+_logger = get_logger()
+
+# (mtime, size) of a file: a file is re-checked whenever it changes
+StatSignature = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class WatchChange:
+    """
+    Findings of a module, reported because they differ from the previous check
+    """
+
+    path: Path
+    unstable: Optional[UnstableModule]
+    deleted: bool = False
+    error: Optional[str] = None
+
+
+def _forget_modules(paths: Iterable[Path]):
+    """
+    Remove the modules loaded from `paths` from `sys.modules`, so that the `import`
+    engine imports them again
+    """
+    absolute_paths = {os.path.abspath(path) for path in paths}
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, "__file__", None)
+        if module_file and os.path.abspath(module_file) in absolute_paths:
+            del sys.modules[name]
+
+
+class ModuleWatcher:
+    """
+    Keep the findings of all modules under `src` in memory, and re-check only the
+    modules that were modified, added or deleted since the last poll.
+
+    Changes are detected by polling the stat signature of the discovered files.
+    """
+
+    def __init__(
+        self,
+        src: Iterable[str],
+        engine: str = ENGINE_IMPORT,
+    ):
+        self.src = list(src)
+        self.engine = engine
+        self.signatures: Dict[Path, StatSignature] = {}
+        self.results: Dict[Path, Optional[UnstableModule]] = {}
+        self.errors: Dict[Path, str] = {}
+
+    def _scan(self) -> Dict[Path, StatSignature]:
+        signatures = {}
+        for path in get_files(self.src):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signatures[path] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def _check(self, path: Path) -> Optional[WatchChange]:
+        try:
+            unstable = get_unstable_module(path, engine=self.engine)
+        except Exception as e:
+            # Files are often broken while being edited
+            error = f"{type(e).__name__}: {e}"
+            if self.errors.get(path) == error:
+                return None
+            self.errors[path] = error
+            return WatchChange(path=path, unstable=None, error=error)
+
+        had_error = self.errors.pop(path, None) is not None
+        if self.results.get(path) == unstable and not had_error:
+            return None
+
+        self.results[path] = unstable
+        return WatchChange(path=path, unstable=unstable)
+
+    def poll(self) -> List[WatchChange]:
+        """
+        Re-check the modules changed since the last poll (all of them on first
+        poll), and return the findings that changed
+        """
+        signatures = self._scan()
+        modified = [
+            path
+            for path, signature in signatures.items()
+            if self.signatures.get(path) != signature
+        ]
+        deleted = [path for path in self.signatures if path not in signatures]
+        self.signatures = signatures
+
+        changes = []
+        for path in deleted:
+            self.errors.pop(path, None)
+            if self.results.pop(path, None) is not None:
+                changes.append(WatchChange(path=path, unstable=None, deleted=True))
+
+        if self.engine == ENGINE_IMPORT:
+            _forget_modules(modified)
+
+        for path in modified:
+            change = self._check(path)
+            if change is not None:
+                changes.append(change)
+
+        if modified or deleted:
+            _logger.debug(f"{len(modified)} modified, {len(deleted)} deleted")
+        return changes
+
+    def watch(self, interval: float = 0.5) -> Iterator[List[WatchChange]]:
+        """
+        Poll every `interval` seconds, and yield the changes of each poll that has
+        some
+        """
+        while True:
+            changes = self.poll()
+            if changes:
+                yield changes
+            time.sleep(interval)
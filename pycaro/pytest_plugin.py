@@ -0,0 +1,160 @@
+"""
+pytest plugin checking the modules of the project at the end of the test session,
+with `pytest --pycaro`.
+
+Modules the tests already imported are checked from their namespace in
+`sys.modules`: only the files of --pycaro-src nothing loaded are imported. Without
+--pycaro-src, only the modules of the rootdir the session loaded are checked.
+"""
+
+import os
+import sys
+from functools import partial
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional
+
+from pycaro.api.constants import ENGINE_IMPORT
+
+# Files never imported by the checks: running them has effects outside of the
+# session (`setup()`), or they are only meant to be loaded by pytest itself
+_NEVER_IMPORTED = frozenset(["setup.py", "conftest.py"])
+
+# Loaded by every pytest session once installed: the checks are only imported
+# when --pycaro is used
+if TYPE_CHECKING:
+    import pytest
+
+    from pycaro.api.pycaro_types import UnstableModule
+    from pycaro.api.validate import ModuleCollectionCheck
+
+
+def pytest_addoption(parser: "pytest.Parser"):
+    group = parser.getgroup("pycaro", "unbound names detection")
+    group.addoption(
+        "--pycaro",
+        action="store_true",
+        default=False,
+        help=(
+            "Check the modules of --pycaro-src for unbound names at the end of the "
+            "session, reusing the modules imported by the tests."
+        ),
+    )
+    group.addoption(
+        "--pycaro-src",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help=(
+            "File or directory checked by --pycaro. Defaults to the modules of the "
+            "rootdir loaded by the session."
+        ),
+    )
+
+
+def pytest_configure(config: "pytest.Config"):
+    if config.getoption("pycaro"):
+        config.pluginmanager.register(PycaroPlugin(config), "pycaro-checks")
+
+
+def _loaded_modules() -> Dict[str, ModuleType]:
+    """
+    Python modules of `sys.modules`, by the real path of their file
+    """
+    modules = {}
+    for module in list(sys.modules.values()):
+        module_file = getattr(module, "__file__", None)
+        if isinstance(module_file, str) and module_file.endswith(".py"):
+            modules.setdefault(os.path.realpath(module_file), module)
+    return modules
+
+
+def check_loaded_modules(
+    paths: Iterable[Path],
+    run: "ModuleCollectionCheck",
+) -> Iterator["UnstableModule"]:
+    """
+    Findings of the modules of `paths`, with the import engine. Modules already in
+    `sys.modules` are checked as they are, the others are imported, once, except
+    for `_NEVER_IMPORTED` files which are skipped. Modules that cannot be
+    imported or checked are reported with an `error`.
+    :param paths: files of the modules, see `get_files`
+    :param run: run the modules are checked in, for its shared state and stats
+    """
+    from pycaro.api.pycaro_types import UnstableModule
+    from pycaro.api.validate import ModuleChecker
+
+    loaded = _loaded_modules()
+    for path in paths:
+        module = loaded.get(os.path.realpath(run.context.absolute_path(path)))
+        if module is None and path.name in _NEVER_IMPORTED:
+            continue
+        create_checker = partial(
+            ModuleChecker,
+            path,
+            engine=ENGINE_IMPORT,
+            context=run.context,
+            previews=run.previews,
+            baseline=run.baseline,
+            collection=run,
+            module=module,
+        )
+        try:
+            unstable = run.run_checker(create_checker)
+        except (Exception, SystemExit) as e:
+            # Reported instead of aborting the session
+            unstable = UnstableModule(
+                module_path=path.as_posix(),
+                unstable_module_objects=[],
+                error=f"{type(e).__name__}: {e}",
+            )
+        if unstable:
+            yield unstable
+
+
+class PycaroPlugin:
+    """
+    Checks run at the end of the session. Findings make the session fail, and are
+    listed in the terminal summary.
+    """
+
+    def __init__(self, config: "pytest.Config"):
+        self.config = config
+        self.src: List[str] = config.getoption("pycaro_src")
+        self.run: Optional["ModuleCollectionCheck"] = None
+        self.results: List["UnstableModule"] = []
+
+    def pytest_sessionfinish(self, session: "pytest.Session"):
+        from pycaro.api.files import BatchContext, get_files
+        from pycaro.api.validate import ModuleCollectionCheck
+
+        context = BatchContext()
+        if self.src:
+            paths = get_files(self.src, context=context)
+        else:
+            paths = get_files(
+                [os.path.relpath(str(self.config.rootdir))],
+                changed={Path(path) for path in _loaded_modules()},
+                context=context,
+            )
+        self.run = ModuleCollectionCheck([], engine=ENGINE_IMPORT, context=context)
+        self.results = list(check_loaded_modules(paths, self.run))
+        if self.results and session.exitstatus == 0:
+            session.exitstatus = 1
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.run is None:
+            return
+        from pycaro.render import get_summary
+
+        terminalreporter.write_sep("=", "pycaro")
+        summary = get_summary(colored=terminalreporter.hasmarkup)
+        for chunk in summary.render(entries=self.results):
+            for line in chunk.splitlines():
+                terminalreporter.write_line(line)
+
+        stats = self.run.stats
+        terminalreporter.write_line(
+            f"{stats.unstable_vars} unstable var(s) in {len(self.results)} of "
+            f"{stats.modules} module(s) checked in {stats.seconds:.2f}s"
+        )
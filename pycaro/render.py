@@ -1,14 +1,24 @@
+import json
+import sys
 from dataclasses import dataclass
-from typing import Iterable, List, Iterator
+from typing import IO, Iterable, List, Iterator, Optional, Tuple, Type
 
+from pycaro import __version__
+from pycaro.api.constants import FORMAT_JSONL, FORMAT_SARIF, FORMAT_TEXT
+from pycaro.api.findings import FindingCounts
 from pycaro.api.interfaces import (
+    PlainStyleApplicator,
     SummarySingleMethod,
     SummarySingleModule,
     SummaryStyleApplicator,
     TermColorStyleApplicator,
 )
+from pycaro.api.profiling import stage
 from pycaro.api.pycaro_types import UnstableModule
 
+# Size of the chunks written by `write_lines`
+WRITE_BUFFER_SIZE = 64 * 1024
+
 
 class SimpleSummarySingleMethod(SummarySingleMethod):
     def method_render(self, *args, **kwargs) -> str:
@@ -27,46 +37,298 @@ class SimpleSummarySingleMethod(SummarySingleMethod):
 @dataclass
 class SimpleSummarySingleModule(SummarySingleModule):
     def module_render(self, *args, **kwargs) -> str:
+        if self.error is not None:
+            return f"* could not check {self.module_path}: {self.error}"
         return f"* unstable var(s) found in {self.module_path}:"
 
 
+class SilentSummarySingleMethod(SummarySingleMethod):
+    """
+    Method summary for formats rendering a whole module at once
+    """
+
+    def method_render(self, *args, **kwargs) -> Optional[str]:
+        return None
+
+    def vars_render(self, *args, **kwargs) -> List[str]:
+        return []
+
+
+@dataclass
+class JsonLinesSummarySingleModule(SummarySingleModule):
+    def module_render(self, *args, **kwargs) -> str:
+        return json.dumps(
+            UnstableModule(
+                module_path=self.module_path,
+                unstable_module_objects=[
+                    method_summary.unstable_module_object
+                    for method_summary in self.methods_summaries
+                ],
+                error=self.error,
+            ).to_dict()
+        )
+
+
+@dataclass
+class SarifSummarySingleModule(SummarySingleModule):
+    def module_render(self, *args, **kwargs) -> str:
+        """
+        SARIF results of the module, one per line
+        """
+        if self.error is not None:
+            return json.dumps(
+                {
+                    "ruleId": SarifSummary.error_rule_id,
+                    "level": "error",
+                    "message": {"text": f"Could not check module: {self.error}"},
+                    "locations": [
+                        {
+                            "physicalLocation": {
+                                "artifactLocation": {"uri": self.module_path},
+                            }
+                        }
+                    ],
+                }
+            )
+
+        return ",\n".join(
+            json.dumps(
+                {
+                    "ruleId": SarifSummary.rule_id,
+                    "level": "warning",
+                    "message": {
+                        "text": (
+                            f"Variable `{unstable_var.var_name}` may be unbound in "
+                            f"`{method_summary.unstable_module_object.module_object}`"
+                        )
+                    },
+                    "locations": [
+                        {
+                            "physicalLocation": {
+                                "artifactLocation": {"uri": self.module_path},
+                                "region": {
+                                    "startLine": unstable_var.first_oc_line_no,
+                                    "snippet": {"text": unstable_var.line_preview},
+                                },
+                            }
+                        }
+                    ],
+                }
+            )
+            for method_summary in self.methods_summaries
+            for unstable_var in method_summary.unstable_module_object.unstable_vars
+        )
+
+
 stdout_summary_style_applicator = SummaryStyleApplicator(
     module_style_applicator=TermColorStyleApplicator(color="red"),
     method_style_applicator=TermColorStyleApplicator(color="cyan"),
     var_style_applicator=TermColorStyleApplicator(),
 )
 
+plain_summary_style_applicator = SummaryStyleApplicator(
+    module_style_applicator=PlainStyleApplicator(),
+    method_style_applicator=PlainStyleApplicator(),
+    var_style_applicator=PlainStyleApplicator(),
+)
 
-class StdoutSummary:
-    """
-    Renderer using style applicators based on `termcolor`.
 
-    Default for CLI.
+class Summary:
     """
+    Renderer of unstable modules, one module at a time so that findings are
+    streamed as they are produced
+    """
+
+    module_summary_class: Type[SummarySingleModule] = SimpleSummarySingleModule
+    method_summary_class: Type[SummarySingleMethod] = SimpleSummarySingleMethod
+
     def __init__(
         self,
+        style_applicator: SummaryStyleApplicator = plain_summary_style_applicator,
     ):
-        self.style_applicator = stdout_summary_style_applicator
+        self.style_applicator = style_applicator
 
-    @staticmethod
     def generate_module_summaries(
+        self,
         entries: Iterable[UnstableModule],
     ) -> Iterator[SummarySingleModule]:
         for entry in entries:
-            yield SimpleSummarySingleModule(
+            yield self.module_summary_class(
                 module_path=entry.module_path,
                 methods_summaries=[
-                    SimpleSummarySingleMethod(
+                    self.method_summary_class(
                         unstable_module_object=unstable_module_object
                     )
                     for unstable_module_object in entry.unstable_module_objects
                 ],
+                error=entry.error,
             )
 
     def render(self, entries: Iterable[UnstableModule] = None):
         if not entries:
             return
 
-        yield from self.style_applicator.render(
-            entries=self.generate_module_summaries(entries=entries)
+        for module_summary in self.generate_module_summaries(entries=entries):
+            with stage("render", module_summary.module_path):
+                lines = list(self.style_applicator.render(entries=[module_summary]))
+            yield from lines
+
+
+class StdoutSummary(Summary):
+    """
+    Renderer using style applicators based on `termcolor`, when `colored`.
+
+    Default for CLI.
+    """
+
+    def __init__(
+        self,
+        colored: bool = True,
+    ):
+        super().__init__(
+            style_applicator=(
+                stdout_summary_style_applicator
+                if colored
+                else plain_summary_style_applicator
+            )
+        )
+
+
+class JsonLinesSummary(Summary):
+    """
+    Renderer of one JSON document per unstable module
+    """
+
+    module_summary_class = JsonLinesSummarySingleModule
+    method_summary_class = SilentSummarySingleMethod
+
+
+class SarifSummary(Summary):
+    """
+    Renderer of a SARIF 2.1.0 log, with one result per unstable variable
+    """
+
+    module_summary_class = SarifSummarySingleModule
+    method_summary_class = SilentSummarySingleMethod
+
+    rule_id = "unbound-variable"
+    error_rule_id = "check-error"
+
+    def _log_parts(self) -> Tuple[str, str]:
+        """
+        The SARIF log split around its results, so that they can be streamed
+        """
+        log = {
+            "version": "2.1.0",
+            "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+            "runs": [
+                {
+                    "tool": {
+                        "driver": {
+                            "name": "pycaro",
+                            "version": __version__,
+                            "informationUri": "https://github.com/anteverse/pycaro",
+                            "rules": [
+                                {
+                                    "id": self.rule_id,
+                                    "shortDescription": {
+                                        "text": "Variable used in a function but "
+                                        "not bound in its module"
+                                    },
+                                },
+                                {
+                                    "id": self.error_rule_id,
+                                    "shortDescription": {
+                                        "text": "Module that could not be checked"
+                                    },
+                                },
+                            ],
+                        }
+                    },
+                    # Must stay last
+                    "results": [],
+                }
+            ],
+        }
+        header, footer = json.dumps(log).rsplit("[]", 1)
+        return header + "[", "]" + footer
+
+    def render(self, entries: Iterable[UnstableModule] = None):
+        header, footer = self._log_parts()
+        yield header
+        first = True
+        for chunk in super().render(entries=entries):
+            if not chunk:
+                continue
+            yield chunk if first else "," + chunk
+            first = False
+        yield footer
+
+
+class CountSummary(Summary):
+    """
+    Renderer of the totals of the findings only, as text or as a JSON document
+    """
+
+    def __init__(self, as_json: bool = False):
+        super().__init__()
+        self.as_json = as_json
+
+    def render(self, entries: Iterable[UnstableModule] = None):
+        counts = FindingCounts()
+        for entry in entries or ():
+            counts.add(entry)
+
+        if self.as_json:
+            yield json.dumps(counts.to_dict())
+            return
+
+        line = (
+            f"{counts.unstable_vars} unstable var(s) in {counts.module_objects} "
+            f"method(s) of {counts.modules - counts.errors} module(s)"
         )
+        if counts.errors:
+            line += f", {counts.errors} module(s) not checked"
+        yield line
+
+
+def get_summary(
+    output_format: str = FORMAT_TEXT,
+    colored: bool = True,
+    count: bool = False,
+) -> Summary:
+    if count:
+        if output_format == FORMAT_SARIF:
+            raise ValueError("Totals cannot be rendered as SARIF")
+        return CountSummary(as_json=output_format == FORMAT_JSONL)
+    if output_format == FORMAT_JSONL:
+        return JsonLinesSummary()
+    if output_format == FORMAT_SARIF:
+        return SarifSummary()
+    return StdoutSummary(colored=colored)
+
+
+def write_lines(
+    lines: Iterable[str],
+    file: Optional[IO[str]] = None,
+    buffer_size: int = WRITE_BUFFER_SIZE,
+):
+    """
+    Write `lines` to `file` (stdout by default) in chunks of about `buffer_size`
+    characters, instead of one write per line
+    """
+    file = file if file is not None else sys.stdout
+    buffer: List[str] = []
+    buffered = 0
+    for line in lines:
+        buffer.append(line)
+        buffer.append("\n")
+        buffered += len(line) + 1
+        if buffered >= buffer_size:
+            file.write("".join(buffer))
+            buffer.clear()
+            buffered = 0
+
+    if buffer:
+        file.write("".join(buffer))
+    file.flush()
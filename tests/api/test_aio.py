@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from pycaro.api import aio
+from pycaro.api.aio import check_paths_async
+from pycaro.api.constants import ENGINE_IMPORT, ENGINE_STATIC
+from pycaro.api.files import BatchContext
+from pycaro.api.validate import get_module_checker_generator, get_unstable_module
+
+PATHS = [
+    Path("tests/use_cases/assets/case_function.py"),
+    Path("tests/use_cases/assets/case_simple_one_liner.py"),
+    Path("tests/use_cases/assets/case_simple_var_in_main.py"),
+]
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def _collect(paths, **kwargs):
+    return [
+        (unstable.module_path, unstable.unstable_module_objects)
+        async for unstable in check_paths_async(paths, **kwargs)
+    ]
+
+
+def test_check_paths_async_same_as_sequential():
+    sequential = [
+        (unstable.module_path, list(unstable.unstable_module_objects))
+        for unstable in get_module_checker_generator(PATHS, engine=ENGINE_STATIC)
+    ]
+
+    res = _run(_collect(PATHS, concurrency=2))
+
+    assert res == sequential
+
+
+def test_check_paths_async_import_engine():
+    with pytest.raises(ValueError):
+        _run(_collect(PATHS, engine=ENGINE_IMPORT))
+
+
+def test_check_paths_async_discovery_off_loop():
+    threads = set()
+
+    def gen_paths():
+        for path in PATHS:
+            threads.add(threading.current_thread())
+            yield path
+
+    res = _run(_collect(gen_paths(), concurrency=2))
+
+    assert len(res) == len(PATHS)
+    assert threading.main_thread() not in threads
+
+
+def test_check_paths_async_bounded_reads(monkeypatch):
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+    read_source = aio._read_source
+
+    def slow_read_source(path):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return read_source(path)
+
+    monkeypatch.setattr(aio, "_read_source", slow_read_source)
+
+    res = _run(_collect(PATHS * 4, concurrency=3, engine=ENGINE_STATIC))
+
+    assert len(res) == len(PATHS) * 4
+    assert 1 < peak <= 3
+
+
+def test_check_paths_async_cancel(monkeypatch):
+    reads = []
+    read_source = aio._read_source
+
+    def slow_read_source(path):
+        reads.append(path)
+        time.sleep(0.05)
+        return read_source(path)
+
+    monkeypatch.setattr(aio, "_read_source", slow_read_source)
+
+    async def consume_first():
+        results = check_paths_async(PATHS * 20, concurrency=2, engine=ENGINE_STATIC)
+        first = await results.__anext__()
+        await results.aclose()
+        return first
+
+    first = _run(consume_first())
+    time.sleep(0.2)
+
+    assert first.module_path == PATHS[0].as_posix()
+    # Reads not started yet were cancelled
+    assert len(reads) < 6
+
+
+def test_get_unstable_module_with_source():
+    module = Path("tests/use_cases/assets/case_simple_var_in_main.py")
+
+    unstable = get_unstable_module(
+        module, engine=ENGINE_STATIC, source="def do_something():\n    pass\n"
+    )
+
+    assert unstable is None
+
+
+def test_check_paths_async_source_encoding(tmp_path):
+    module = tmp_path.joinpath("module.py")
+    module.write_bytes(
+        "# -*- coding: latin-1 -*-\n\n\ndef main():\n    return 'é', var\n".encode(
+            "latin-1"
+        )
+    )
+
+    res = _run(
+        _collect(
+            [module],
+            engine=ENGINE_STATIC,
+            context=BatchContext(root=tmp_path.resolve()),
+        )
+    )
+
+    assert [
+        [(v.var_name, v.line_preview) for v in o.unstable_vars]
+        for _, unstable_module_objects in res
+        for o in unstable_module_objects
+    ] == [[("var", "    return 'é', var")]]
@@ -0,0 +1,143 @@
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from pycaro.api.archives import (
+    TARGET_DISTRIBUTION,
+    check_target,
+    gen_archive_sources,
+    get_archive_module_checker_generator,
+    get_import_paths,
+)
+from pycaro.api.constants import ENGINE_STATIC, is_archive
+from pycaro.api.validate import ModuleCollectionCheck, get_unstable_module
+
+ASSET = Path("tests/use_cases/assets/case_function.py")
+
+
+@pytest.fixture
+def archives(tmp_path):
+    source = ASSET.read_bytes()
+    wheel = tmp_path.joinpath("pkg-1.0-py3-none-any.whl")
+    with zipfile.ZipFile(wheel, "w") as archive:
+        archive.writestr("pkg/__init__.py", "")
+        archive.writestr("pkg/module.py", source)
+        archive.writestr("pkg/__pycache__/module.py", source)
+        archive.writestr("pkg-1.0.dist-info/METADATA", "Name: pkg\n")
+
+    sdist = tmp_path.joinpath("pkg-1.0.tar.gz")
+    with tarfile.open(sdist, "w:gz") as archive:
+        module = tmp_path.joinpath("module.py")
+        module.write_bytes(source)
+        archive.add(module, "pkg-1.0/pkg/module.py")
+    return wheel, sdist
+
+
+def test_is_archive():
+    assert is_archive("dist/pkg-1.0-py3-none-any.whl")
+    assert is_archive("pkg-1.0.TAR.GZ")
+    assert is_archive("app.pyz")
+    assert not is_archive("pkg/module.py")
+
+
+def test_gen_archive_sources(archives):
+    wheel, sdist = archives
+
+    assert [member for member, _ in gen_archive_sources(wheel)] == [
+        "pkg/__init__.py",
+        "pkg/module.py",
+    ]
+    assert list(gen_archive_sources(sdist)) == [
+        ("pkg-1.0/pkg/module.py", ASSET.read_bytes())
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_archive_findings(archives, jobs):
+    wheel, sdist = archives
+    expected = get_unstable_module(ASSET, engine=ENGINE_STATIC)
+
+    res = list(get_archive_module_checker_generator(archives, jobs=jobs))
+
+    assert [unstable.module_path for unstable in res] == [
+        f"{wheel.as_posix()}!pkg/module.py",
+        f"{sdist.as_posix()}!pkg-1.0/pkg/module.py",
+    ]
+    for unstable in res:
+        assert unstable.error is None
+        assert unstable.unstable_module_objects == expected.unstable_module_objects
+
+
+def test_archive_errors(tmp_path):
+    broken = tmp_path.joinpath("broken.whl")
+    broken.write_bytes(b"not a zip")
+    invalid = tmp_path.joinpath("invalid.zip")
+    with zipfile.ZipFile(invalid, "w") as archive:
+        archive.writestr("invalid.py", "def main(:\n")
+
+    res = list(get_archive_module_checker_generator([broken, invalid]))
+
+    assert [unstable.module_path for unstable in res] == [
+        broken.as_posix(),
+        f"{invalid.as_posix()}!invalid.py",
+    ]
+    assert res[0].error.startswith("BadZipFile")
+    assert res[1].error.startswith("SyntaxError")
+
+
+def test_distribution_findings():
+    run = ModuleCollectionCheck([], engine=ENGINE_STATIC)
+
+    res = check_target((TARGET_DISTRIBUTION, "pytest"), run)
+
+    assert run.stats.modules > 0
+    assert all(unstable.module_path.startswith("pytest-") for unstable in res)
+
+    (missing,) = check_target((TARGET_DISTRIBUTION, "pycaro-missing"), run)
+    assert missing.module_path == "pycaro-missing"
+    assert missing.error.startswith("PackageNotFoundError")
+
+
+def test_get_import_paths():
+    assert get_import_paths(["pkg-1.0/setup.py", "pkg-1.0/pkg/module.py"]) == [
+        "setup.py",
+        "pkg/module.py",
+    ]
+    assert get_import_paths(["pkg/__init__.py", "pkg/module.py"]) == [
+        "pkg/__init__.py",
+        "pkg/module.py",
+    ]
+    assert get_import_paths(["pkg-1.0/module.py", "other.py"]) == [
+        "pkg-1.0/module.py",
+        "other.py",
+    ]
+
+
+def test_archive_star_imports(tmp_path):
+    sdist = tmp_path.joinpath("pkg-1.0.tar.gz")
+    members = {
+        "pkg-1.0/pkg/__init__.py": "",
+        "pkg-1.0/pkg/base.py": "__all__ = ['helper']\n",
+        "pkg-1.0/pkg/module.py": (
+            "from .base import *\n\n\ndef f():\n    return helper, missing\n"
+        ),
+        # Never resolved from the modules installed in the current environment
+        "pkg-1.0/pkg/installed.py": (
+            "from pytest import *\n\n\ndef f():\n    return unbound_name\n"
+        ),
+    }
+    with tarfile.open(sdist, "w:gz") as archive:
+        for member, source in members.items():
+            module = tmp_path.joinpath("module.py")
+            module.write_text(source)
+            archive.add(module, member)
+
+    res = list(get_archive_module_checker_generator([sdist]))
+
+    assert [unstable.module_path for unstable in res] == [
+        f"{sdist.as_posix()}!pkg-1.0/pkg/module.py"
+    ]
+    (unstable_module_object,) = res[0].unstable_module_objects
+    assert [v.var_name for v in unstable_module_object.unstable_vars] == ["missing"]
@@ -0,0 +1,117 @@
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from pycaro.api.baseline import Baseline, fingerprint, get_baseline, set_baseline
+from pycaro.api.cache import ResultCache
+from pycaro.api.constants import ENGINE_STATIC
+from pycaro.api.files import BatchContext
+from pycaro.api.parallel import get_parallel_module_checker_generator
+from pycaro.api.validate import ModuleChecker, get_unstable_module
+
+ASSET = Path("tests/use_cases/assets/case_function.py")
+
+
+@pytest.fixture
+def process_baseline():
+    yield
+    set_baseline(None)
+
+
+def test_fingerprint():
+    assert fingerprint("a.py", "func", "var") == fingerprint("a.py", "func", "var")
+    assert fingerprint("a.py", "func", "var") != fingerprint("a.py", "func", "va")
+    assert fingerprint("a.py", "f", "unc") != fingerprint("a.py", "fu", "nc")
+    assert 0 <= fingerprint("a.py", "func", "var") < 2**64
+
+
+def test_baseline_roundtrip(tmp_path):
+    baseline = Baseline([fingerprint("a.py", "func", "var"), 3, 2**64 - 1])
+    path = tmp_path.joinpath("baseline")
+    baseline.save(path)
+
+    loaded = Baseline.load(path)
+    assert loaded.fingerprints == baseline.fingerprints
+    assert loaded.digest == baseline.digest
+    assert loaded.is_known("a.py", "func", "var")
+    assert not loaded.is_known("a.py", "func", "other")
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_baseline_invalid_file(tmp_path):
+    path = tmp_path.joinpath("baseline")
+    path.write_text("def main():\n    pass\n")
+
+    with pytest.raises(ValueError):
+        Baseline.load(path)
+
+
+def test_checker_drops_known_findings():
+    unstable = get_unstable_module(ASSET, engine=ENGINE_STATIC)
+    baseline = Baseline.from_findings([unstable])
+    assert len(baseline) == sum(
+        len(o.unstable_vars) for o in unstable.unstable_module_objects
+    )
+
+    checker = ModuleChecker(ASSET, engine=ENGINE_STATIC, baseline=baseline)
+    assert checker.is_stable
+    assert list(checker.unstable_module_objects) == []
+    # Known findings are dropped before their first occurrence is looked up
+    assert checker._first_usage_index is None
+
+    # Only new findings are reported
+    first = unstable.unstable_module_objects[0]
+    known = first.unstable_vars[0]
+    baseline = Baseline(
+        [fingerprint(checker.file_path_normalized, first.module_object, known.var_name)]
+    )
+    res = get_unstable_module(ASSET, engine=ENGINE_STATIC, baseline=baseline)
+    assert [
+        (o.module_object, [v.var_name for v in o.unstable_vars])
+        for o in res.unstable_module_objects
+    ] == [
+        (o.module_object, [v.var_name for v in o.unstable_vars if v != known])
+        for o in unstable.unstable_module_objects
+        if o.unstable_vars != [known]
+    ]
+
+
+def test_process_baseline(process_baseline):
+    unstable = get_unstable_module(ASSET, engine=ENGINE_STATIC)
+    set_baseline(Baseline.from_findings([unstable], context=BatchContext()))
+
+    assert get_baseline() is not None
+    assert get_unstable_module(ASSET, engine=ENGINE_STATIC) is None
+
+
+def test_cache_key_depends_on_baseline(tmp_path, process_baseline):
+    cache_dir = tmp_path.joinpath("cache")
+    key = ResultCache(cache_dir=cache_dir, engine=ENGINE_STATIC).config_key
+
+    set_baseline(Baseline([1]))
+    with_baseline = ResultCache(cache_dir=cache_dir, engine=ENGINE_STATIC).config_key
+    set_baseline(Baseline([2]))
+    other_baseline = ResultCache(cache_dir=cache_dir, engine=ENGINE_STATIC).config_key
+
+    assert len({key, with_baseline, other_baseline}) == 3
+
+
+def test_process_baseline_spawned_workers(process_baseline, monkeypatch):
+    paths = [ASSET, Path("tests/use_cases/assets/case_simple_one_liner.py")]
+    context = BatchContext()
+    findings = list(
+        get_parallel_module_checker_generator(paths, jobs=1, engine=ENGINE_STATIC)
+    )
+    assert len(findings) == len(paths)
+    set_baseline(Baseline.from_findings(findings, context=context))
+
+    # Workers that do not inherit the baseline of the process
+    monkeypatch.setattr(
+        multiprocessing, "Pool", multiprocessing.get_context("spawn").Pool
+    )
+    res = get_parallel_module_checker_generator(
+        paths, jobs=2, engine=ENGINE_STATIC, context=context
+    )
+
+    assert list(res) == []
@@ -0,0 +1,101 @@
+import dis
+from pathlib import Path
+from types import CodeType
+
+from pycaro.api.bytecode import classify_names
+
+
+def _code(source: str, name: str = "func"):
+    namespace = {}
+    exec(compile(source, "module.py", "exec"), namespace)
+    return namespace[name].__code__
+
+
+def test_attributes_are_not_globals():
+    names = classify_names(_code("""
+def func(obj):
+    obj.value = 1
+    return obj.method(value)
+"""))
+
+    assert names.global_names == {"value"}
+    assert names.attribute_names == {"value", "method"}
+
+
+def test_locals_and_imports_are_not_globals():
+    names = classify_names(_code("""
+def func(arg):
+    import os.path
+    from json import dumps
+    local = arg
+    return os.path.join(dumps(local), unbound)
+"""))
+
+    assert names.global_names == {"unbound"}
+    assert {"os.path", "dumps", "join"} <= names.attribute_names
+
+
+def test_nested_code_objects():
+    names = classify_names(_code("""
+def func(items):
+    enclosing = 1
+
+    def closure():
+        return enclosing + in_closure
+
+    class Klass:
+        attribute = 1
+        other = attribute + in_class_body
+
+        def method(self):
+            return in_method
+
+    return (
+        [item + in_comprehension for item in items],
+        lambda: in_lambda,
+        closure,
+        Klass,
+    )
+"""))
+
+    # `__name__` is read by class bodies, to set `__module__`
+    assert names.global_names == {
+        "__name__",
+        "in_closure",
+        "in_class_body",
+        "in_method",
+        "in_comprehension",
+        "in_lambda",
+    }
+
+
+def _classify_with_dis(code, global_names, attribute_names):
+    loaded, bound = set(), set()
+    for instruction in dis.get_instructions(code):
+        if instruction.opname in ("LOAD_GLOBAL", "LOAD_NAME"):
+            loaded.add(instruction.argval)
+        elif instruction.opname in ("STORE_NAME", "DELETE_NAME"):
+            bound.add(instruction.argval)
+        elif "ATTR" in instruction.opname or instruction.opname in (
+            "LOAD_METHOD",
+            "IMPORT_NAME",
+            "IMPORT_FROM",
+        ):
+            attribute_names.add(instruction.argval)
+    global_names.update(loaded - bound)
+
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _classify_with_dis(const, global_names, attribute_names)
+
+
+def test_same_as_dis():
+    for path in sorted(Path("pycaro").rglob("*.py")):
+        code = compile(path.read_text(), str(path), "exec")
+        global_names, attribute_names = set(), set()
+        _classify_with_dis(code, global_names, attribute_names)
+
+        names = classify_names(code)
+
+        assert names.global_names == global_names, path
+        assert names.attribute_names == attribute_names, path
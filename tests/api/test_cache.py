@@ -0,0 +1,141 @@
+from pathlib import Path
+
+import pytest
+
+from pycaro.api import cache as cache_module
+from pycaro.api import symbols
+from pycaro.api.cache import MISS, ResultCache, get_cached_module_checker_generator
+from pycaro.api.constants import ENGINE_STATIC
+from pycaro.api.files import BatchContext
+from pycaro.api.parallel import imap_unstable_modules
+from pycaro.api.symbols import SymbolIndex
+
+ASSET = Path("tests/use_cases/assets/case_simple_var_in_main.py")
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path.joinpath("cache")
+
+
+def test_cache_roundtrip(cache_dir):
+    cache = ResultCache(cache_dir=cache_dir, engine=ENGINE_STATIC)
+    assert cache.get(ASSET) is MISS
+
+    first = list(
+        get_cached_module_checker_generator([ASSET], cache=cache, engine=ENGINE_STATIC)
+    )
+    assert len(first) == 1
+    assert cache_dir.joinpath(".gitignore").is_file()
+
+    cache = ResultCache(cache_dir=cache_dir, engine=ENGINE_STATIC)
+    cached = cache.get(ASSET)
+    assert cached is not MISS
+    assert cached.module_path == first[0].module_path
+    assert list(cached.unstable_module_objects) == list(
+        first[0].unstable_module_objects
+    )
+
+    # Another configuration does not share the results
+    assert ResultCache(cache_dir=cache_dir).get(ASSET) is MISS
+
+
+def test_cache_modified_file(cache_dir, tmp_path):
+    module = tmp_path.joinpath("module.py")
+    module.write_text("def f():\n    return 1\n")
+
+    cache = ResultCache(
+        cache_dir=cache_dir,
+        engine=ENGINE_STATIC,
+        context=BatchContext(root=tmp_path.resolve()),
+    )
+    assert cache.get(module) is MISS
+    cache.set(module, None)
+    assert cache.get(module) is None
+
+    module.write_text("def f():\n    return 2\n")
+    assert cache.get(module) is MISS
+
+
+def test_cache_eviction(cache_dir):
+    cache = ResultCache(cache_dir=cache_dir, engine=ENGINE_STATIC, max_size=0)
+
+    list(
+        get_cached_module_checker_generator([ASSET], cache=cache, engine=ENGINE_STATIC)
+    )
+
+    assert list(cache.results_dir.rglob("*.json")) == []
+    assert ResultCache(cache_dir=cache_dir, engine=ENGINE_STATIC).get(ASSET) is MISS
+
+
+def test_cache_star_imported_exports(cache_dir, tmp_path, monkeypatch):
+    tmp_path.joinpath("exporter.py").write_text("__all__ = ['a']\n")
+    module = tmp_path.joinpath("module.py")
+    module.write_text("from exporter import *\n\n\ndef f():\n    return a, b\n")
+    context = BatchContext(root=tmp_path.resolve())
+
+    def check():
+        # Exports are resolved once per run
+        monkeypatch.setattr(symbols, "_symbol_index", SymbolIndex(root=tmp_path))
+        cache = ResultCache(cache_dir=cache_dir, engine=ENGINE_STATIC, context=context)
+        cached = cache.get(module)
+        res = list(
+            get_cached_module_checker_generator(
+                [module], cache=cache, jobs=1, engine=ENGINE_STATIC
+            )
+        )
+        return cached, res
+
+    assert check()[0] is MISS
+    cached, res = check()
+    assert cached is not MISS
+    assert len(res) == 1
+
+    # `b` is now bound by the star import: checked again
+    tmp_path.joinpath("exporter.py").write_text("__all__ = ['a', 'b']\n")
+    cached, res = check()
+    assert cached is MISS
+    assert res == []
+
+
+def test_cache_single_imap(cache_dir, monkeypatch):
+    monkeypatch.setattr(cache_module, "CHECK_BATCH_SIZE", 2)
+    paths = [
+        ASSET,
+        Path("tests/use_cases/assets/case_function.py"),
+        Path("tests/use_cases/assets/case_simple_one_liner.py"),
+        Path("tests/use_cases/assets/__init__.py"),
+    ]
+    calls = []
+
+    def imap(misses, **kwargs):
+        calls.append(kwargs)
+        yield from imap_unstable_modules(misses, **kwargs)
+
+    # Cached: the first path only
+    cache = ResultCache(cache_dir=cache_dir, engine=ENGINE_STATIC)
+    list(
+        get_cached_module_checker_generator(
+            paths[:1], cache=cache, jobs=1, engine=ENGINE_STATIC
+        )
+    )
+
+    cache = ResultCache(cache_dir=cache_dir, engine=ENGINE_STATIC)
+    res = get_cached_module_checker_generator(
+        paths, cache=cache, jobs=1, engine=ENGINE_STATIC, imap=imap
+    )
+
+    assert [unstable.module_path for unstable in res] == [
+        path.as_posix() for path in paths[:3]
+    ]
+    assert len(calls) == 1
+
+
+def test_cache_deleted_file(cache_dir, tmp_path):
+    cache = ResultCache(
+        cache_dir=cache_dir,
+        engine=ENGINE_STATIC,
+        context=BatchContext(root=tmp_path.resolve()),
+    )
+
+    assert cache.get(tmp_path.joinpath("deleted.py")) is MISS
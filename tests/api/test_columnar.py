@@ -0,0 +1,121 @@
+import pytest
+
+from pycaro.api.columnar import FindingsTable
+from pycaro.api.pycaro_types import UnstableModule, UnstableModuleObject, UnstableVar
+
+ENTRIES = [
+    UnstableModule(
+        module_path="pkg/a.py",
+        unstable_module_objects=[
+            UnstableModuleObject(
+                module_object="func",
+                unstable_vars=[
+                    UnstableVar(
+                        var_name="var", first_oc_line_no=2, line_preview="  var"
+                    ),
+                    UnstableVar(var_name="é", first_oc_line_no=3, line_preview="  é"),
+                ],
+            ),
+            UnstableModuleObject(
+                module_object="other",
+                unstable_vars=[
+                    UnstableVar(
+                        var_name="var", first_oc_line_no=7, line_preview="  var"
+                    ),
+                ],
+            ),
+        ],
+    ),
+    UnstableModule(
+        module_path="pkg/b.py",
+        unstable_module_objects=[],
+        error="timed out after 1s",
+    ),
+    UnstableModule(
+        module_path="pkg/c.py",
+        unstable_module_objects=[
+            UnstableModuleObject(
+                module_object="func",
+                unstable_vars=[
+                    UnstableVar(var_name="var", first_oc_line_no=1, line_preview="var"),
+                ],
+            ),
+        ],
+    ),
+]
+
+
+@pytest.fixture
+def table():
+    table = FindingsTable()
+    assert list(table.track(ENTRIES)) == ENTRIES
+    return table
+
+
+def test_findings_table(table):
+    assert len(table) == 4
+    assert table.errors == 1
+    # Strings are interned
+    assert len(table._strings) == 10
+    assert list(table.rows())[1] == ("pkg/a.py", "func", "é", 3, "  é")
+    assert list(table.to_unstable_modules()) == ENTRIES
+
+
+def test_findings_table_read(table, tmp_path):
+    path = tmp_path.joinpath("findings.pct")
+    table.write(path)
+
+    res = FindingsTable.read(path)
+
+    assert isinstance(res.columns["first_oc_line_no"], memoryview)
+    assert list(res.columns["first_oc_line_no"]) == [2, 3, 7, 1]
+    assert list(res.to_unstable_modules()) == ENTRIES
+    with pytest.raises(ValueError):
+        res.append(ENTRIES[0])
+
+    # Tables read from a file can be written again
+    res.write(tmp_path.joinpath("copy.pct"))
+    res.close()
+    assert list(FindingsTable.read(tmp_path.joinpath("copy.pct")).rows()) == list(
+        table.rows()
+    )
+
+
+def test_findings_table_read_invalid(tmp_path):
+    path = tmp_path.joinpath("findings.pct")
+    path.write_bytes(b"not a table")
+
+    with pytest.raises(ValueError):
+        FindingsTable.read(path)
+
+
+def test_findings_table_empty(tmp_path):
+    path = tmp_path.joinpath("findings.pct")
+    FindingsTable().write(path)
+
+    assert list(FindingsTable.read(path).to_unstable_modules()) == []
+
+
+def test_findings_table_to_arrow(table):
+    pyarrow = pytest.importorskip("pyarrow")
+
+    res = table.to_arrow()
+
+    assert isinstance(res, pyarrow.Table)
+    assert res.column("var_name").to_pylist() == ["var", "é", "var", "var"]
+    assert res.schema.field("var_name").type.index_type == pyarrow.int32()
+
+
+@pytest.mark.parametrize("file_format", ["arrow", "parquet"])
+def test_findings_table_arrow_roundtrip(table, tmp_path, file_format):
+    pytest.importorskip("pyarrow")
+    if file_format == "arrow":
+        reader = pytest.importorskip("pyarrow.feather")
+        table.write_arrow(tmp_path.joinpath("findings.arrow"))
+        res = reader.read_table(tmp_path.joinpath("findings.arrow").as_posix())
+    else:
+        reader = pytest.importorskip("pyarrow.parquet")
+        table.write_parquet(tmp_path.joinpath("findings.parquet"))
+        res = reader.read_table(tmp_path.joinpath("findings.parquet").as_posix())
+
+    assert [tuple(row.values()) for row in res.to_pylist()] == list(table.rows())
@@ -1,6 +1,19 @@
+import io
+import os
+import pickle
 from pathlib import Path
 
-from pycaro.api.files import gen_python_files
+import pytest
+
+from pycaro.api.files import (
+    BatchContext,
+    gen_python_files,
+    get_files,
+    get_gitignore,
+    get_path_from_root,
+    read_file_list,
+    select_changed_files,
+)
 
 
 def test_gen_python_files():
@@ -11,3 +24,158 @@ def test_gen_python_files():
     ))
 
     assert res == []
+
+
+def test_select_changed_files():
+    cwd = Path.cwd().resolve()
+    changed = {
+        cwd / "tests/use_cases/assets/case_function.py",
+        cwd / "tests/use_cases/assets/notes.txt",
+        cwd / "pycaro/__init__.py",
+        Path("/elsewhere/module.py"),
+    }
+
+    res = list(select_changed_files(paths=["tests"], changed=changed))
+
+    assert res == [Path("tests/use_cases/assets/case_function.py")]
+
+
+def test_gen_python_files_tree(tmp_path):
+    root = tmp_path.resolve()
+    for path in [
+        "module.py",
+        "stub.pyi",
+        "notes.txt",
+        "ignored.py",
+        ".venv/lib/module.py",
+        "node_modules/module.py",
+        "pkg/__init__.py",
+        "pkg/build/module.py",
+        "pkg/sub/module.py",
+        "pkg/sub/generated.py",
+        "pkg/other/generated.py",
+    ]:
+        root.joinpath(path).parent.mkdir(parents=True, exist_ok=True)
+        root.joinpath(path).touch()
+    root.joinpath(".gitignore").write_text("ignored.py\n")
+    root.joinpath("pkg/sub/.gitignore").write_text("/generated.py\n")
+
+    res = list(
+        gen_python_files(
+            paths=[root],
+            root=root,
+            gitignore=get_gitignore(root),
+        )
+    )
+
+    assert [path.relative_to(root).as_posix() for path in res] == [
+        "module.py",
+        "pkg/__init__.py",
+        "pkg/other/generated.py",
+        "pkg/sub/module.py",
+        "stub.pyi",
+    ]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"a.py\0dir/b c.py\0\0",
+        b"a.py\ndir/b c.py\n\n",
+        b"a.py\r\ndir/b c.py",
+    ],
+)
+def test_read_file_list(data):
+    res = list(read_file_list(io.BytesIO(data)))
+
+    assert res == [Path("a.py"), Path("dir/b c.py")]
+
+
+def test_batch_context_path_from_root(tmp_path):
+    root = tmp_path.joinpath("root").resolve()
+    root.joinpath("pkg/sub").mkdir(parents=True)
+    root.joinpath("pkg/sub/module.py").touch()
+    root.joinpath("linked_pkg").symlink_to(root.joinpath("pkg"))
+    root.joinpath("linked_module.py").symlink_to(root.joinpath("pkg/sub/module.py"))
+    tmp_path.joinpath("outside.py").touch()
+    root.joinpath("linked_outside.py").symlink_to(tmp_path.joinpath("outside.py"))
+
+    context = BatchContext(root=root)
+    for path in [
+        Path("pkg/sub/module.py"),
+        root.joinpath("pkg/sub/module.py"),
+        Path("linked_pkg/sub/module.py"),
+        Path("linked_module.py"),
+        Path("pkg/sub/../sub/module.py"),
+        Path("pkg/sub"),
+        Path("pkg/.."),
+        Path("linked_outside.py"),
+    ]:
+        assert context.path_from_root(path) == get_path_from_root(
+            root.joinpath(path), root
+        )
+
+    with pytest.raises(ValueError):
+        context.path_from_root(tmp_path.joinpath("outside.py"))
+
+
+def test_batch_context_pickle(tmp_path):
+    context = BatchContext(root=tmp_path)
+    context.path_from_root(Path("module.py"))
+
+    res = pickle.loads(pickle.dumps(context))
+
+    assert res.root == tmp_path
+    assert res._directories == {}
+
+
+def test_get_files_with_context(tmp_path):
+    root = tmp_path.resolve()
+    root.joinpath("pkg").mkdir()
+    root.joinpath("pkg/module.py").touch()
+    root.joinpath("pkg/ignored.py").touch()
+    root.joinpath(".gitignore").write_text("ignored.py\n")
+
+    res = list(
+        get_files(
+            [
+                os.fspath(root.joinpath("pkg/module.py")),
+                os.fspath(root.joinpath("pkg/ignored.py")),
+                os.fspath(root.joinpath("pkg/deleted.py")),
+            ],
+            context=BatchContext(root=root),
+        )
+    )
+
+    assert res == [root.joinpath("pkg/module.py")]
+
+
+def test_get_files_excluded_dirs(tmp_path):
+    root = tmp_path.resolve()
+    for path in ["pkg/module.py", "build/gen.py", "pkg/.venv/lib.py"]:
+        root.joinpath(path).parent.mkdir(parents=True, exist_ok=True)
+        root.joinpath(path).touch()
+    context = BatchContext(root=root)
+
+    # Explicit files, and changed files, are left out like in a full run
+    explicit = list(
+        get_files(
+            [
+                os.fspath(root.joinpath(path))
+                for path in ["pkg/module.py", "build/gen.py"]
+            ],
+            context=context,
+        )
+    )
+    changed = list(
+        get_files(
+            [os.fspath(root)],
+            changed={root.joinpath("build/gen.py"), root.joinpath("pkg/.venv/lib.py")},
+            context=context,
+        )
+    )
+    full = list(get_files([os.fspath(root)], context=context))
+
+    assert explicit == [root.joinpath("pkg/module.py")]
+    assert changed == []
+    assert full == [root.joinpath("pkg/module.py")]
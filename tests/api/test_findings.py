@@ -0,0 +1,82 @@
+from pathlib import Path
+
+from pycaro.api.constants import ENGINE_STATIC
+from pycaro.api.findings import FindingCounts, limit_findings
+from pycaro.api.pycaro_types import UnstableModule, UnstableModuleObject, UnstableVar
+from pycaro.api.validate import ModuleChecker, get_unstable_module
+
+
+def _unstable_module(module_path, *var_counts):
+    return UnstableModule(
+        module_path=module_path,
+        unstable_module_objects=[
+            UnstableModuleObject(
+                module_object=f"func{i}",
+                unstable_vars=[
+                    UnstableVar(var_name=f"var{j}", first_oc_line_no=j, line_preview="")
+                    for j in range(var_count)
+                ],
+            )
+            for i, var_count in enumerate(var_counts)
+        ],
+    )
+
+
+def test_limit_findings_truncates():
+    entries = [
+        _unstable_module("a.py", 2, 1),
+        _unstable_module("b.py", 3),
+        _unstable_module("c.py", 1),
+    ]
+
+    res = list(limit_findings(iter(entries), max_findings=5))
+
+    counts = FindingCounts()
+    for unstable in res:
+        counts.add(unstable)
+    assert [unstable.module_path for unstable in res] == ["a.py", "b.py"]
+    assert counts.unstable_vars == 5
+    assert [len(o.unstable_vars) for o in res[1].unstable_module_objects] == [2]
+
+
+def test_limit_findings_closes_entries():
+    checked = []
+
+    def entries():
+        for module_path in ["a.py", "b.py", "c.py"]:
+            checked.append(module_path)
+            yield _unstable_module(module_path, 1)
+
+    generator = entries()
+    res = list(limit_findings(generator, max_modules=1))
+
+    assert [unstable.module_path for unstable in res] == ["a.py"]
+    assert checked == ["a.py"]
+    assert generator.gi_frame is None
+
+
+def test_checker_without_previews():
+    path = Path("tests/use_cases/assets/case_function.py")
+
+    checker = ModuleChecker(path, engine=ENGINE_STATIC, previews=False)
+    unstable = get_unstable_module(path, engine=ENGINE_STATIC)
+
+    assert [
+        (o.module_object, [v.var_name for v in o.unstable_vars])
+        for o in checker.as_unstable_module.unstable_module_objects
+    ] == [
+        (o.module_object, sorted(v.var_name for v in o.unstable_vars))
+        for o in unstable.unstable_module_objects
+    ]
+    assert checker._first_usage_index is None
+
+
+def test_checker_is_stable_checks_once():
+    checker = ModuleChecker(
+        Path("tests/use_cases/assets/case_function.py"), engine=ENGINE_STATIC
+    )
+
+    assert not checker.is_stable
+    checks = dict(checker._checks)
+    list(checker.unstable_module_objects)
+    assert all(checker._checks[name] is checks[name] for name in checks)
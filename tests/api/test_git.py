@@ -0,0 +1,58 @@
+import subprocess
+
+import pytest
+
+from pycaro.api.git import GitError, get_changed_files
+
+
+def git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@test", *args],
+        cwd=repo,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, "init", "-q")
+    tmp_path.joinpath(".gitignore").write_text("ignored.py\n")
+    tmp_path.joinpath("committed.py").write_text("a = 1\n")
+    tmp_path.joinpath("deleted.py").write_text("a = 1\n")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "first")
+
+    tmp_path.joinpath("second.py").write_text("a = 1\n")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "second")
+
+    tmp_path.joinpath("committed.py").write_text("a = 2\n")
+    tmp_path.joinpath("staged.py").write_text("a = 1\n")
+    git(tmp_path, "add", "staged.py")
+    tmp_path.joinpath("untracked.py").write_text("a = 1\n")
+    tmp_path.joinpath("ignored.py").write_text("a = 1\n")
+    git(tmp_path, "rm", "-q", "deleted.py")
+
+    return tmp_path.resolve()
+
+
+def test_get_changed_files_working_tree(repo):
+    assert get_changed_files(cwd=repo) == {
+        repo / "committed.py",
+        repo / "staged.py",
+        repo / "untracked.py",
+    }
+
+
+def test_get_changed_files_staged(repo):
+    assert get_changed_files(staged=True, cwd=repo) == {repo / "staged.py"}
+
+
+def test_get_changed_files_diff_from(repo):
+    assert get_changed_files(diff_from="HEAD~1", cwd=repo) == {repo / "second.py"}
+
+
+def test_get_changed_files_not_a_repo(tmp_path):
+    with pytest.raises(GitError):
+        get_changed_files(cwd=tmp_path)
@@ -0,0 +1,94 @@
+from pycaro.api.line_index import FirstUsageIndex
+
+SOURCE = """def before():
+    return var
+
+
+def func():
+    # var in a comment
+    text = "var in a string"
+    self.var = 1
+    print(f"{text} {var}")
+    return var
+"""
+
+
+def test_first_usage_index_skips_comments_and_strings():
+    index = FirstUsageIndex(
+        source=SOURCE,
+        function_ranges={"before": (1, 2), "func": (5, 10)},
+    )
+
+    assert index.get(function="func", name="var") == (9, '    print(f"{text} {var}")')
+    assert index.get(function="before", name="var") == (2, "    return var")
+
+
+def test_first_usage_index_attributes():
+    index = FirstUsageIndex(
+        source=SOURCE,
+        function_ranges={"func": (5, 10)},
+    )
+
+    assert index.get(function="func", name="text") == (
+        7,
+        '    text = "var in a string"',
+    )
+
+    # Only used as an attribute within the range
+    index = FirstUsageIndex(
+        source=SOURCE,
+        function_ranges={"func": (5, 8)},
+    )
+    assert index.get(function="func", name="var") == (8, "    self.var = 1")
+    assert index.get(function="func", name="unknown") is None
+    assert index.get(function="unknown", name="var") is None
+
+
+def test_first_usage_index_is_lazy():
+    index = FirstUsageIndex(
+        source=SOURCE,
+        function_ranges={"before": (1, 2), "func": (5, 10)},
+    )
+
+    assert index.get(function="before", name="var") == (2, "    return var")
+    assert index._indexed == {"before"}
+    assert index.get(function="unknown", name="var") is None
+
+
+def test_first_usage_index_without_last_line():
+    source = """@decorator(var)
+def func():
+    if cond:
+        return var
+    # var in a comment
+
+one_liner = 1
+def one_liner(): return other
+after = var + other
+
+if cond:
+    def nested(): return var
+var = 1
+"""
+    index = FirstUsageIndex(
+        source=source,
+        function_ranges={
+            "func": (1, None),
+            "one_liner": (8, None),
+            "nested": (12, None),
+        },
+    )
+
+    # Names of the decorators are not indexed, the body is read up to its end
+    assert index.get(function="func", name="var") == (4, "        return var")
+    assert index.get(function="func", name="after") is None
+    assert index.get(function="one_liner", name="other") == (
+        8,
+        "def one_liner(): return other",
+    )
+    assert index.get(function="one_liner", name="after") is None
+    assert index.get(function="nested", name="var") == (
+        12,
+        "    def nested(): return var",
+    )
+    assert index.get(function="nested", name="unknown") is None
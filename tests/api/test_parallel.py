@@ -0,0 +1,173 @@
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pycaro.api import parallel
+from pycaro.api.constants import ENGINE_IMPORT, ENGINE_STATIC
+from pycaro.api.files import BatchContext
+from pycaro.api.parallel import get_parallel_module_checker_generator
+from pycaro.api.validate import get_module_checker_generator, get_unstable_module
+
+PATHS = [
+    Path("tests/use_cases/assets/case_function.py"),
+    Path("tests/use_cases/assets/case_simple_one_liner.py"),
+    Path("tests/use_cases/assets/case_simple_var_in_main.py"),
+]
+
+
+def test_get_unstable_module_is_evaluated():
+    unstable = get_unstable_module(PATHS[1], engine=ENGINE_STATIC)
+
+    assert unstable.module_path == PATHS[1].as_posix()
+    assert isinstance(unstable.unstable_module_objects, list)
+
+
+@pytest.mark.parametrize("engine", [ENGINE_IMPORT, ENGINE_STATIC])
+def test_parallel_same_as_sequential(engine):
+    sequential = [
+        (unstable.module_path, list(unstable.unstable_module_objects))
+        for unstable in get_module_checker_generator(PATHS, engine=engine)
+    ]
+    parallel = [
+        (unstable.module_path, list(unstable.unstable_module_objects))
+        for unstable in get_parallel_module_checker_generator(
+            PATHS, jobs=2, engine=engine
+        )
+    ]
+
+    assert [path for path, _ in parallel] == [path.as_posix() for path in PATHS]
+    assert parallel == sequential
+
+
+def test_parallel_import_isolation(tmp_path, monkeypatch):
+    patching = tmp_path.joinpath("case_patch_builtins.py")
+    patching.write_text(
+        "import builtins\n\nbuiltins.var = 1\n\n\ndef do_something():\n    return var\n"
+    )
+    paths = [patching]
+    for path in PATHS:
+        paths.append(tmp_path.joinpath(path.name))
+        shutil.copy(path, paths[-1])
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    parallel = list(
+        get_parallel_module_checker_generator(
+            paths,
+            jobs=2,
+            engine=ENGINE_IMPORT,
+            context=BatchContext(root=tmp_path.resolve()),
+        )
+    )
+
+    # `var` patched into builtins by the first module did not hide the others
+    assert [unstable.module_path for unstable in parallel] == [
+        path.as_posix() for path in paths[1:]
+    ]
+
+
+def test_get_unstable_module_releases_modules():
+    loaded_before = set(sys.modules)
+
+    unstable = get_unstable_module(PATHS[0], engine=ENGINE_IMPORT, release_modules=True)
+
+    assert unstable.unstable_module_objects
+    assert set(sys.modules) - loaded_before == set()
+
+
+def test_parallel_max_memory_recycles_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(parallel, "CHECK_BATCH_SIZE", 2)
+    paths = PATHS * 3
+
+    recycled = list(
+        get_parallel_module_checker_generator(
+            paths, jobs=2, engine=ENGINE_STATIC, max_memory=1
+        )
+    )
+
+    assert [unstable.module_path for unstable in recycled] == [
+        path.as_posix() for path in paths
+    ]
+
+
+_PEAK_RSS_SCRIPT = """
+import os, resource, sys
+from pathlib import Path
+
+os.chdir(sys.argv[1])
+sys.path.insert(0, sys.argv[1])
+from pycaro.api.files import get_files
+from pycaro.api.parallel import get_parallel_module_checker_generator
+
+count = sum(
+    1
+    for _ in get_parallel_module_checker_generator(
+        get_files(["corpus"]), jobs=1, engine=sys.argv[2], max_memory=1024 ** 3
+    )
+)
+assert count == int(sys.argv[3]), count
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def _peak_rss(root: Path, modules: int, engine: str) -> int:
+    (root / ".git").mkdir(parents=True)
+    package = root / "corpus"
+    package.mkdir()
+    package.joinpath("__init__.py").write_text("")
+    for i in range(modules):
+        package.joinpath(f"module_{i}.py").write_text(
+            "".join(
+                f"def func_{j}(a):\n    b = a + {j}\n    return b + unbound_{j}\n\n"
+                for j in range(20)
+            )
+            + "DATA = list(range(5000))\n"
+        )
+
+    return int(
+        subprocess.run(
+            [sys.executable, "-c", _PEAK_RSS_SCRIPT, str(root), engine, str(modules)],
+            # Not traced by pytest-cov, which would take most of the memory
+            env={
+                **{
+                    key: value
+                    for key, value in os.environ.items()
+                    if not key.startswith("COV_CORE_")
+                },
+                "PYTHONPATH": os.getcwd(),
+            },
+            stdout=subprocess.PIPE,
+            check=True,
+        ).stdout
+    )
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="ru_maxrss is in kilobytes on linux"
+)
+@pytest.mark.parametrize("engine", [ENGINE_IMPORT, ENGINE_STATIC])
+def test_peak_memory_does_not_grow_with_corpus(tmp_path, engine):
+    small = _peak_rss(tmp_path / "small", modules=50, engine=engine)
+    large = _peak_rss(tmp_path / "large", modules=400, engine=engine)
+
+    # Before releasing checkers and modules, 400 modules took 50MB+ more. The
+    # imported modules are only released when memory is bounded
+    assert large - small < 8 * 1024
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_parallel_shared_context(jobs):
+    context = BatchContext()
+    res = [
+        unstable.module_path
+        for unstable in get_parallel_module_checker_generator(
+            PATHS, jobs=jobs, engine=ENGINE_STATIC, context=context
+        )
+    ]
+
+    assert res == [path.as_posix() for path in PATHS]
+    # Checked in this process: the directory of the modules was resolved once
+    assert len(context._directories) == (1 if jobs == 1 else 0)
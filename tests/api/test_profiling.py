@@ -0,0 +1,35 @@
+from pathlib import Path
+
+from pycaro.api import profiling
+from pycaro.api.constants import ENGINE_STATIC
+from pycaro.api.profiling import Profiler, stage, stage_hook
+from pycaro.api.validate import get_unstable_module
+from pycaro.render import StdoutSummary
+
+
+def test_stage_disabled():
+    assert stage("stage") is profiling._NULL_STAGE
+
+
+def test_stage_hook():
+    events = []
+    with stage_hook(lambda *event: events.append(event)):
+        with stage("stage", "path"):
+            pass
+
+    assert len(events) == 1
+    assert events[0][:2] == ("stage", "path")
+    assert stage("stage") is profiling._NULL_STAGE
+
+
+def test_profiler():
+    path = Path("tests/use_cases/assets/case_function.py")
+    profiler = Profiler()
+    with stage_hook(profiler):
+        unstable = get_unstable_module(path, engine=ENGINE_STATIC)
+        list(StdoutSummary().render(entries=[unstable]))
+
+    report = profiler.report(count=1)
+    assert set(report["stages"]) == {"parse", "var_names", "first_usage", "render"}
+    assert report["slowest"][0]["path"] == path.as_posix()
+    assert set(report["files"][path.as_posix()]) == set(report["stages"])
@@ -0,0 +1,99 @@
+import builtins
+import shutil
+from pathlib import Path
+
+import pytest
+
+from pycaro.api.files import BatchContext
+from pycaro.api.sandbox import (
+    get_sandboxed_module_checker_generator,
+    imap_sandboxed_unstable_modules,
+)
+
+ASSETS = Path("tests/use_cases/assets")
+
+# Modules only safe to import in a sandbox, kept out of the shared assets
+UNSAFE_MODULES = {
+    "case_hang_at_import.py": (
+        "import time\n\ntime.sleep(60)\n\n\ndef do_something():\n    return var\n"
+    ),
+    "case_import_side_effect.py": (
+        "def do_something():\n"
+        "    print(var)\n"
+        "\n"
+        "\n"
+        'raise RuntimeError("This module must not be imported")\n'
+    ),
+    "case_patch_builtins.py": (
+        "import builtins\n\nbuiltins.var = 1\n\n\ndef do_something():\n    return var\n"
+    ),
+}
+
+
+@pytest.fixture
+def project(tmp_path):
+    for name, source in UNSAFE_MODULES.items():
+        tmp_path.joinpath(name).write_text(source)
+    for name in ["case_function.py", "case_simple_one_liner.py"]:
+        shutil.copy(ASSETS / name, tmp_path / name)
+    return tmp_path
+
+
+@pytest.fixture
+def context(project):
+    return BatchContext(root=project.resolve())
+
+
+def test_sandbox_timeout(project, context):
+    path = project / "case_hang_at_import.py"
+    (unstable,) = imap_sandboxed_unstable_modules(
+        [path], jobs=1, timeout=0.5, context=context
+    )
+
+    assert unstable.module_path == path.as_posix()
+    assert unstable.unstable_module_objects == []
+    assert unstable.error == "timed out after 0.5s"
+
+
+def test_sandbox_import_error(project, context):
+    (unstable,) = imap_sandboxed_unstable_modules(
+        [project / "case_import_side_effect.py"], jobs=1, context=context
+    )
+
+    assert unstable.error == "RuntimeError: This module must not be imported"
+
+
+def test_sandbox_order_and_isolation(project, context):
+    paths = [
+        project / "case_hang_at_import.py",
+        project / "case_patch_builtins.py",
+        project / "case_function.py",
+        project / "case_simple_one_liner.py",
+    ]
+    results = list(
+        imap_sandboxed_unstable_modules(paths, jobs=2, timeout=0.5, context=context)
+    )
+
+    assert [result and result.module_path for result in results] == [
+        paths[0].as_posix(),
+        None,
+        paths[2].as_posix(),
+        paths[3].as_posix(),
+    ]
+    assert results[0].error is not None
+    assert results[2].error is None
+    assert not hasattr(builtins, "var")
+
+
+def test_sandboxed_module_checker_generator():
+    unstable_modules = list(
+        get_sandboxed_module_checker_generator(
+            [ASSETS / "case_simple_one_liner.py"], jobs=1
+        )
+    )
+
+    assert [unstable.module_path for unstable in unstable_modules] == [
+        (ASSETS / "case_simple_one_liner.py").as_posix()
+    ]
+    (unstable_module_object,) = unstable_modules[0].unstable_module_objects
+    assert unstable_module_object.module_object == "do_something"
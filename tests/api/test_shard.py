@@ -0,0 +1,119 @@
+import io
+import json
+
+import pytest
+
+from pycaro.api.files import BatchContext
+from pycaro.api.shard import Shard, merge_results, select_shard
+
+
+@pytest.fixture
+def files(tmp_path):
+    root = tmp_path.resolve()
+    paths = []
+    for i in range(40):
+        path = root.joinpath(f"pkg{i % 4}", f"module{i}.py")
+        path.parent.mkdir(exist_ok=True)
+        path.write_text("x = 1\n" * (i * 10))
+        paths.append(path)
+    return root, paths
+
+
+def test_shard_parse():
+    assert Shard.parse("2/8") == Shard(index=2, count=8)
+    for value in ["0/2", "3/2", "1", "a/b", "1/0"]:
+        with pytest.raises(ValueError):
+            Shard.parse(value)
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+def test_select_shard_partition(files, weighted):
+    root, paths = files
+
+    shards = [
+        list(
+            select_shard(
+                paths,
+                Shard(index=index, count=3),
+                context=BatchContext(root=root),
+                weighted=weighted,
+            )
+        )
+        for index in range(1, 4)
+    ]
+
+    assert sorted(path for shard in shards for path in shard) == sorted(paths)
+    assert all(shards)
+    # Order of the paths kept
+    assert all(shard == sorted(shard, key=paths.index) for shard in shards)
+
+
+def test_select_shard_stable_across_roots(files, tmp_path_factory):
+    root, paths = files
+    other_root = tmp_path_factory.mktemp("other").resolve()
+
+    relative_paths = [path.relative_to(root) for path in paths]
+    shard = Shard(index=1, count=3)
+
+    res = list(select_shard(relative_paths, shard, context=BatchContext(root=root)))
+    other = list(
+        select_shard(relative_paths, shard, context=BatchContext(root=other_root))
+    )
+
+    assert res == other
+
+
+def test_select_shard_weighted_balance(files):
+    root, paths = files
+
+    sizes = [
+        sum(
+            path.stat().st_size
+            for path in select_shard(
+                paths,
+                Shard(index=index, count=3),
+                context=BatchContext(root=root),
+                weighted=True,
+            )
+        )
+        for index in range(1, 4)
+    ]
+
+    assert max(sizes) - min(sizes) <= max(path.stat().st_size for path in paths)
+
+
+def _report(*module_paths):
+    return io.StringIO(
+        "".join(
+            json.dumps({"module_path": module_path, "unstable_module_objects": []})
+            + "\n"
+            for module_path in module_paths
+        )
+    )
+
+
+def test_merge_results():
+    res = merge_results(
+        [
+            _report("pkg/sub/b.py", "pkg/a.py"),
+            _report("pkg/b.py", "pkg/a.py"),
+            io.StringIO("\n"),
+        ]
+    )
+
+    assert [unstable.module_path for unstable in res] == [
+        "pkg/a.py",
+        "pkg/b.py",
+        "pkg/sub/b.py",
+    ]
+
+
+def test_merge_results_invalid():
+    with pytest.raises(ValueError, match="<results>:2"):
+        merge_results(
+            [
+                io.StringIO(
+                    '{"module_path": "a.py", "unstable_module_objects": []}\nnot json\n'
+                )
+            ]
+        )
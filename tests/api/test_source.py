@@ -0,0 +1,63 @@
+import pytest
+
+from pycaro.api import source
+from pycaro.api.source import SourceFile
+
+
+@pytest.fixture(params=[False, True], ids=["read", "mmap"])
+def open_source(request, monkeypatch):
+    if request.param:
+        monkeypatch.setattr(source, "SOURCE_MMAP_THRESHOLD", 1)
+
+    opened = []
+
+    def open_source(path):
+        source_file = SourceFile.open(path)
+        opened.append(source_file)
+        return source_file
+
+    yield open_source
+    for source_file in opened:
+        source_file.close()
+
+
+def test_source_file_lines(tmp_path, open_source):
+    path = tmp_path.joinpath("module.py")
+    path.write_bytes(b"a = 1\r\nb = '\xc3\xa9'\n\nc = 3")
+
+    source_file = open_source(path)
+
+    assert source_file.encoding == "utf-8"
+    assert source_file.line(2) == "b = 'é'"
+    assert source_file.line(1) == "a = 1"
+    assert source_file.line(4) == "c = 3"
+    assert source_file.line(5) == ""
+    assert source_file.segment(2, 3) == "b = 'é'\n\n"
+    assert source_file.text() == "a = 1\r\nb = 'é'\n\nc = 3"
+
+
+def test_source_file_offsets_are_lazy(tmp_path, open_source):
+    path = tmp_path.joinpath("module.py")
+    path.write_text("".join(f"x{i} = {i}\n" for i in range(1000)))
+
+    source_file = open_source(path)
+
+    assert source_file.line(10) == "x9 = 9"
+    assert len(source_file._offsets) == 11
+
+
+def test_source_file_encoding(tmp_path, open_source):
+    path = tmp_path.joinpath("module.py")
+    path.write_bytes("# -*- coding: latin-1 -*-\nname = 'é'\n".encode("latin-1"))
+    bom_path = tmp_path.joinpath("bom.py")
+    bom_path.write_bytes(b"\xef\xbb\xbfname = 1\n")
+
+    assert open_source(path).line(2) == "name = 'é'"
+    assert open_source(bom_path).line(1) == "name = 1"
+
+
+def test_source_file_from_text():
+    source_file = SourceFile.from_text("def f():\n    return 'é'\n")
+
+    assert source_file.line(2) == "    return 'é'"
+    assert source_file.text() == "def f():\n    return 'é'\n"
@@ -0,0 +1,113 @@
+from pathlib import Path
+
+from pycaro.api.static import StaticModule
+
+
+def test_static_module_names():
+    module = StaticModule(
+        path=Path("module.py"),
+        source="""
+import os.path
+from typing import List as L
+from somewhere import *
+
+CONSTANT = 1
+annotated: int
+a, (b, *c) = 1, (2, 3)
+squares = [x * x for x in range(3)]
+
+
+def func():
+    inner = 1
+
+
+class Klass:
+    attr = 1
+
+
+if __name__ == "__main__":
+    main_only = 1
+""",
+    )
+
+    assert module.names == {
+        "os",
+        "L",
+        "CONSTANT",
+        "a",
+        "b",
+        "c",
+        "squares",
+        "func",
+        "Klass",
+    }
+    assert set(module.functions.keys()) == {"func"}
+    assert module.star_imports == ["somewhere"]
+    assert module.dunder_all is None
+
+
+def test_static_module_dunder_all():
+    module = StaticModule(
+        path=Path("module.py"),
+        source="""
+__all__ = ["a"]
+__all__ += ("b",)
+__all__.append("c")
+__all__.extend(["d"])
+""",
+    )
+    assert module.dunder_all == ["a", "b", "c", "d"]
+    assert not module.dynamic_all
+
+    module = StaticModule(
+        path=Path("module.py"),
+        source="__all__ = ['a'] + other.__all__\n",
+    )
+    assert module.dynamic_all
+
+
+def test_static_module_function_code():
+    module = StaticModule(
+        path=Path("module.py"),
+        source="""
+def decorator(f):
+    return f
+
+
+@decorator
+def func():
+    return var
+
+
+func = decorator
+""",
+    )
+
+    assert set(module.functions.keys()) == {"decorator"}
+
+    module = StaticModule(
+        path=Path("module.py"),
+        source="""
+@decorator
+def func():
+    return var
+""",
+    )
+    code = module.get_function_code("func")
+    assert code.co_names == ("var",)
+
+
+def test_static_module_function_ranges():
+    module = StaticModule(
+        path=Path("module.py"),
+        source="""
+@decorator
+def func():
+    return var
+""",
+    )
+    assert module.function_ranges == {"func": (3, 4)}
+
+    # Nodes have no end line before python 3.8
+    del module.functions["func"].end_lineno
+    assert module.function_ranges == {"func": (3, None)}
@@ -0,0 +1,102 @@
+import pytest
+
+from pycaro.api.constants import ENGINE_STATIC
+from pycaro.api.files import find_project_root
+from pycaro.api.symbols import SymbolIndex
+from pycaro.api.validate import ModuleChecker
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    tmp_path.joinpath("pyproject.toml").touch()
+    package = tmp_path.joinpath("package")
+    package.mkdir()
+    package.joinpath("__init__.py").write_text("from .public import *\n")
+    package.joinpath("public.py").write_text(
+        "from .private import *\n" "import os\n" "exported = 1\n" "_private = 2\n"
+    )
+    package.joinpath("private.py").write_text(
+        "__all__ = ['listed']\nlisted = 1\nnot_listed = 2\n"
+    )
+    package.joinpath("cycle.py").write_text("from package.cycle import *\nname = 1\n")
+    package.joinpath("native.py").write_text("from math import *\n")
+
+    monkeypatch.chdir(tmp_path)
+    find_project_root.cache_clear()
+    yield tmp_path
+    find_project_root.cache_clear()
+
+
+def test_exports(project):
+    index = SymbolIndex(root=project)
+
+    assert index.exports("package.private") == {"listed"}
+    assert index.exports("package.public") == {"listed", "os", "exported"}
+    assert index.exports("package") == {"listed", "os", "exported"}
+    assert index.exports("package.cycle") == {"name"}
+
+
+def test_exports_unknown(project):
+    index = SymbolIndex(root=project)
+
+    # No python source for `math`
+    assert index.exports("package.native") is None
+    assert index.exports("does.not.exist") is None
+
+
+def test_star_import_resolved_by_static_checker(project):
+    project.joinpath("package", "user.py").write_text(
+        "from package import *\n\n\ndef f():\n    return exported + listed + missing\n"
+    )
+    checker = ModuleChecker(
+        project.joinpath("package", "user.py"),
+        engine=ENGINE_STATIC,
+        symbols=SymbolIndex(root=project),
+    )
+
+    assert not checker.unresolved_star_imports
+    assert checker.check("f") == {"missing": False}
+
+
+def test_unresolved_star_import(project):
+    project.joinpath("package", "user.py").write_text(
+        "from math import *\n\n\ndef f():\n    return pi + missing\n"
+    )
+    checker = ModuleChecker(
+        project.joinpath("package", "user.py"),
+        engine=ENGINE_STATIC,
+        symbols=SymbolIndex(root=project),
+    )
+
+    assert checker.unresolved_star_imports
+    assert checker.is_valid_name("missing")
+
+
+def test_persisted_index(project, monkeypatch):
+    cache_dir = project.joinpath(".cache")
+    index = SymbolIndex.load(cache_dir, root=project)
+    assert index.exports("package") == {"listed", "os", "exported"}
+    index.save()
+
+    reloaded = SymbolIndex.load(cache_dir, root=project)
+    monkeypatch.setattr(
+        "pycaro.api.symbols.StaticModule.from_path",
+        lambda path: pytest.fail(f"{path} parsed again"),
+    )
+    assert reloaded.exports("package") == {"listed", "os", "exported"}
+    assert reloaded.pop_updates() == {}
+
+
+def test_persisted_index_invalidated(project):
+    cache_dir = project.joinpath(".cache")
+    index = SymbolIndex.load(cache_dir, root=project)
+    index.exports("package")
+    index.save()
+
+    project.joinpath("package", "private.py").write_text(
+        "__all__ = ['listed', 'added']\nlisted = added = 1\n"
+    )
+    reloaded = SymbolIndex.load(cache_dir, root=project)
+
+    assert reloaded.exports("package") == {"listed", "added", "os", "exported"}
+    assert list(reloaded.pop_updates()) == ["package.private"]
@@ -0,0 +1,109 @@
+import builtins
+import sys
+from pathlib import Path
+
+import pytest
+
+from pycaro.api.constants import ENGINE_IMPORT, ENGINE_STATIC, ORDER_SORTED
+from pycaro.api.files import BatchContext
+from pycaro.api.validate import (
+    ModuleCollectionCheck,
+    get_unstable_module,
+)
+
+PATHS = [
+    Path("tests/use_cases/assets/case_simple_var_in_main.py"),
+    Path("tests/use_cases/assets/case_function.py"),
+    Path("tests/use_cases/assets/case_simple_one_liner.py"),
+]
+
+
+@pytest.mark.parametrize("engine", [ENGINE_IMPORT, ENGINE_STATIC])
+def test_collection_same_as_single_checks(engine):
+    expected = [get_unstable_module(path, engine=engine) for path in PATHS]
+
+    run = ModuleCollectionCheck(PATHS, engine=engine)
+    res = list(run)
+
+    assert [
+        (unstable.module_path, unstable.unstable_module_objects) for unstable in res
+    ] == [
+        (unstable.module_path, unstable.unstable_module_objects)
+        for unstable in expected
+        if unstable
+    ]
+    assert run.stats.modules == len(PATHS)
+    assert run.stats.unstable_modules == len(res)
+    assert run.stats.unstable_vars == sum(
+        len(o.unstable_vars)
+        for unstable in res
+        for o in unstable.unstable_module_objects
+    )
+    assert run.stats.module_objects >= run.stats.unstable_modules
+    assert run.stats.seconds > 0
+    assert list(run) == []
+
+
+def test_collection_sorted():
+    run = ModuleCollectionCheck(iter(PATHS), engine=ENGINE_STATIC, order=ORDER_SORTED)
+
+    assert [unstable.module_path for unstable in run] == sorted(
+        path.as_posix() for path in PATHS
+    )
+
+
+def test_collection_shares_state():
+    run = ModuleCollectionCheck(PATHS, engine=ENGINE_STATIC)
+
+    assert run.check(PATHS[0]) is not None
+    assert run.check(PATHS[1]) is not None
+    assert run.stats.modules == 2
+
+    namespace = vars(builtins)
+    names = run.builtin_names(namespace)
+    assert run.builtin_names(namespace) is names
+    namespace["_pycaro_test_builtin"] = None
+    try:
+        assert "_pycaro_test_builtin" in run.builtin_names(namespace)
+    finally:
+        del namespace["_pycaro_test_builtin"]
+
+
+def test_collection_invalid_order():
+    with pytest.raises(ValueError):
+        ModuleCollectionCheck(PATHS, order="size")
+
+
+def test_collection_imports_shared_modules_once(tmp_path, monkeypatch):
+    package = tmp_path.joinpath("pycaro_shared")
+    package.mkdir()
+    package.joinpath("__init__.py").write_text(
+        "import builtins\n\nbuiltins.shared_imports += 1\n"
+    )
+    paths = []
+    for name in ["first", "second"]:
+        package.joinpath(f"{name}.py").write_text(
+            "import pycaro_shared\n\n\ndef f():\n    return pycaro_shared\n"
+        )
+        paths.append(package.joinpath(f"{name}.py"))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(builtins, "shared_imports", 0, raising=False)
+    context = BatchContext(root=tmp_path.resolve())
+
+    names = ["pycaro_shared", "pycaro_shared.first", "pycaro_shared.second"]
+
+    try:
+        assert list(ModuleCollectionCheck(paths, context=context)) == []
+        assert builtins.shared_imports == 1
+        assert all(name in sys.modules for name in names)
+
+        for name in names:
+            del sys.modules[name]
+        run = ModuleCollectionCheck(paths, context=context, release_modules=True)
+        assert list(run) == []
+        # Imported again by the check of the second module
+        assert builtins.shared_imports == 3
+        assert not any(name in sys.modules for name in names)
+    finally:
+        for name in names:
+            sys.modules.pop(name, None)
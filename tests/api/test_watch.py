@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from pycaro.api.constants import ENGINE_STATIC
+from pycaro.api.files import find_project_root
+from pycaro.api.watch import ModuleWatcher
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    tmp_path.joinpath("pyproject.toml").touch()
+    monkeypatch.chdir(tmp_path)
+    find_project_root.cache_clear()
+    yield tmp_path
+    find_project_root.cache_clear()
+
+
+def write(path, content):
+    path.write_text(content)
+    # Make sure the signature changes, whatever the mtime resolution
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_module_watcher(project):
+    write(project.joinpath("stable.py"), "def f():\n    return 1\n")
+    write(project.joinpath("unstable.py"), "def f():\n    return var\n")
+    watcher = ModuleWatcher(src=["."], engine=ENGINE_STATIC)
+
+    changes = watcher.poll()
+    assert [change.path.name for change in changes] == ["unstable.py"]
+    assert watcher.poll() == []
+
+    # Same findings, nothing reported
+    write(project.joinpath("unstable.py"), "def f():\n    return var\n# comment\n")
+    assert watcher.poll() == []
+
+    # Broken, fixed then deleted
+    write(project.joinpath("stable.py"), "def f(:\n")
+    (change,) = watcher.poll()
+    assert change.error.startswith("SyntaxError")
+
+    write(project.joinpath("stable.py"), "def f():\n    return 1\n")
+    (change,) = watcher.poll()
+    assert change.path.name == "stable.py"
+    assert change.unstable is None
+    assert change.error is None
+
+    project.joinpath("unstable.py").unlink()
+    (change,) = watcher.poll()
+    assert change.path.name == "unstable.py"
+    assert change.deleted
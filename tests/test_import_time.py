@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BIN = Path(__file__).parent.parent.joinpath("bin", "pycaro").resolve()
+
+# Cumulated import time of `pycaro`, in microseconds, which lazy imports keep
+# around 1ms. Generous, as CI machines are slow and noisy.
+IMPORT_TIME_BUDGET = 30_000
+
+
+def _import_times(args, cwd=None):
+    """
+    Cumulated import time in microseconds of each module imported by running
+    python with `args`
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args,
+        cwd=cwd,
+        env={**os.environ, "PYTHONPATH": str(BIN.parent.parent)},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+@pytest.fixture
+def project(tmp_path):
+    tmp_path.joinpath("pyproject.toml").touch()
+    tmp_path.joinpath("module.py").write_text("def f():\n    return var\n")
+    return tmp_path
+
+
+def test_import_time_budget():
+    times = _import_times(["-c", "import pycaro"])
+
+    assert times["pycaro"] < IMPORT_TIME_BUDGET
+    assert "pycaro.api.validate" not in times
+
+
+def test_cli_lazy_imports(project):
+    times = _import_times(
+        [str(BIN), "check", "--engine", "static", "--no-cache", "module.py"], project
+    )
+
+    assert "pycaro.api.validate" in times
+    # No .gitignore file, and stdout is not a terminal
+    assert "pathspec" not in times
+    assert "termcolor" not in times
+    # Modules are checked in this process
+    assert "multiprocessing" not in times
+
+
+def test_cli_loads_optional_modules_when_used(project):
+    project.joinpath(".gitignore").write_text("build/\n")
+
+    times = _import_times(
+        [str(BIN), "check", "--engine", "static", "--no-cache", "--color", "module.py"],
+        project,
+    )
+
+    assert "pathspec" in times
+    assert "termcolor" in times
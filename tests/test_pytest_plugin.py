@@ -0,0 +1,126 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PACKAGE_ROOT = Path(__file__).parent.parent.resolve()
+
+
+@pytest.fixture
+def project(tmp_path):
+    tmp_path.joinpath("pyproject.toml").touch()
+    package = tmp_path.joinpath("pkg")
+    package.mkdir()
+    package.joinpath("__init__.py").touch()
+    # Each import of a module is logged, to tell whether it was imported again
+    for name, var in [("loaded", "var"), ("unloaded", "other_var")]:
+        package.joinpath(f"{name}.py").write_text(
+            "import os\n"
+            "\n"
+            f"with open(os.environ['IMPORTS_LOG'], 'a') as log:\n"
+            f"    log.write('{name}\\n')\n"
+            "\n"
+            "\n"
+            "def f():\n"
+            f"    return {var}\n"
+        )
+    tmp_path.joinpath("test_loaded.py").write_text(
+        "import pkg.loaded\n\n\ndef test_loaded():\n    assert pkg.loaded.f\n"
+    )
+    return tmp_path
+
+
+def _run_pytest(project, *args):
+    return subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "pycaro.pytest_plugin", "-p", "no:cov"]
+        + list(args),
+        cwd=project,
+        env={
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join([str(PACKAGE_ROOT), str(project)]),
+            "IMPORTS_LOG": str(project.joinpath("imports.log")),
+        },
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+
+def test_plugin_reports_findings(project):
+    process = _run_pytest(project, "--pycaro", "--pycaro-src", "pkg")
+
+    assert process.returncode == 1, process.stdout
+    assert "1 passed" in process.stdout
+    assert "unstable var(s) found in pkg/loaded.py" in process.stdout
+    assert "variable var at line 8" in process.stdout
+    assert "unstable var(s) found in pkg/unloaded.py" in process.stdout
+    assert "2 unstable var(s) in 2 of 3 module(s) checked" in process.stdout
+    # Only the module nothing loaded was imported by the checks
+    assert project.joinpath("imports.log").read_text().split() == [
+        "loaded",
+        "unloaded",
+    ]
+
+
+def test_plugin_disabled(project):
+    process = _run_pytest(project)
+
+    assert process.returncode == 0, process.stdout
+    assert "pycaro" not in process.stdout
+    assert project.joinpath("imports.log").read_text().split() == ["loaded"]
+
+
+def test_plugin_default_src(project):
+    process = _run_pytest(project, "--pycaro")
+
+    assert process.returncode == 1, process.stdout
+    assert "unstable var(s) found in pkg/loaded.py" in process.stdout
+    # Only the modules loaded by the session were checked
+    assert "1 unstable var(s) in 1 of 3 module(s) checked" in process.stdout
+    assert project.joinpath("imports.log").read_text().split() == ["loaded"]
+
+
+def test_plugin_never_imports_setup_and_conftest(project):
+    for path in ["setup.py", "other/conftest.py"]:
+        project.joinpath(path).parent.mkdir(exist_ok=True)
+        project.joinpath(path).write_text(
+            "import os\n"
+            "\n"
+            "with open(os.environ['IMPORTS_LOG'], 'a') as log:\n"
+            f"    log.write('{path}\\n')\n"
+            "raise SystemExit(1)\n"
+        )
+
+    process = _run_pytest(project, "--pycaro", "--pycaro-src", ".", "test_loaded.py")
+
+    assert "could not check" not in process.stdout
+    assert "1 passed" in process.stdout
+    assert project.joinpath("imports.log").read_text().split() == [
+        "loaded",
+        "unloaded",
+    ]
+
+
+def test_plugin_skips_reexported_functions(project):
+    project.joinpath("pkg", "core.py").write_text(
+        "import os\n\n\ndef helper():\n    return os.sep\n"
+    )
+    project.joinpath("pkg", "__init__.py").write_text("from pkg.core import helper\n")
+
+    process = _run_pytest(project, "--pycaro", "--pycaro-src", "pkg/__init__.py")
+
+    assert process.returncode == 0, process.stdout
+    assert "0 unstable var(s) in 0 of 1 module(s) checked" in process.stdout
+
+
+def test_plugin_reports_import_errors(project):
+    project.joinpath("pkg", "broken.py").write_text("raise RuntimeError('broken')\n")
+
+    process = _run_pytest(project, "--pycaro", "--pycaro-src", "pkg/broken.py")
+
+    assert process.returncode == 1, process.stdout
+    assert "INTERNALERROR" not in process.stdout + process.stderr
+    assert "1 passed" in process.stdout
+    assert "could not check pkg/broken.py: RuntimeError: broken" in process.stdout
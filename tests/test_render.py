@@ -1,7 +1,17 @@
+import io
+import json
+
 import pytest
 
 from pycaro.api.pycaro_types import UnstableModule, UnstableModuleObject, UnstableVar
-from pycaro.render import StdoutSummary
+from pycaro.render import (
+    CountSummary,
+    JsonLinesSummary,
+    SarifSummary,
+    StdoutSummary,
+    get_summary,
+    write_lines,
+)
 
 
 def test_stdout_summary_empty():
@@ -43,3 +53,112 @@ def test_stdout_summary_not_empty(unstable_module):
         "\x1b[36m  ↳ in method func1\x1b[0m",
         "    ↳ variable var1 at line 5: fake line for var1\x1b[0m",
     ]
+
+
+def test_stdout_summary_not_colored(unstable_module):
+    prepared_writer = StdoutSummary(colored=False)
+    lines = list(prepared_writer.render(entries=iter([unstable_module])))
+
+    assert lines == [
+        "* unstable var(s) found in path/to/module.py:",
+        "  ↳ in method func1",
+        "    ↳ variable var1 at line 5: fake line for var1",
+    ]
+
+
+def test_json_lines_summary(unstable_module):
+    lines = list(JsonLinesSummary().render(entries=iter([unstable_module])))
+
+    assert len(lines) == 1
+    assert json.loads(lines[0]) == {
+        "module_path": "path/to/module.py",
+        "unstable_module_objects": [
+            {
+                "module_object": "func1",
+                "unstable_vars": [
+                    {
+                        "var_name": "var1",
+                        "first_oc_line_no": 5,
+                        "line_preview": "fake line for var1",
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def test_sarif_summary(unstable_module):
+    log = json.loads("\n".join(SarifSummary().render(entries=iter([unstable_module]))))
+
+    (result,) = log["runs"][0]["results"]
+    assert result["ruleId"] == "unbound-variable"
+    location = result["locations"][0]["physicalLocation"]
+    assert location["artifactLocation"]["uri"] == "path/to/module.py"
+    assert location["region"]["startLine"] == 5
+
+
+def test_sarif_summary_empty():
+    log = json.loads("\n".join(SarifSummary().render(entries=None)))
+
+    assert log["runs"][0]["results"] == []
+
+
+@pytest.fixture
+def module_error():
+    return UnstableModule(
+        module_path="path/to/module.py",
+        unstable_module_objects=[],
+        error="timed out after 1s",
+    )
+
+
+def test_stdout_summary_error(module_error):
+    lines = list(StdoutSummary(colored=False).render(entries=iter([module_error])))
+
+    assert lines == ["* could not check path/to/module.py: timed out after 1s"]
+
+
+def test_json_lines_summary_error(module_error):
+    (line,) = JsonLinesSummary().render(entries=iter([module_error]))
+
+    assert UnstableModule.from_dict(json.loads(line)) == module_error
+
+
+def test_sarif_summary_error(module_error):
+    log = json.loads("\n".join(SarifSummary().render(entries=iter([module_error]))))
+
+    (result,) = log["runs"][0]["results"]
+    assert result["ruleId"] == "check-error"
+    assert result["level"] == "error"
+
+
+def test_count_summary(unstable_module, module_error):
+    entries = [unstable_module, module_error]
+
+    assert list(CountSummary().render(entries=iter(entries))) == [
+        "1 unstable var(s) in 1 method(s) of 1 module(s), 1 module(s) not checked"
+    ]
+    (line,) = get_summary(output_format="jsonl", count=True).render(entries=[])
+    assert json.loads(line) == {
+        "modules": 0,
+        "module_objects": 0,
+        "unstable_vars": 0,
+        "errors": 0,
+    }
+    with pytest.raises(ValueError):
+        get_summary(output_format="sarif", count=True)
+
+
+def test_write_lines():
+    class File(io.StringIO):
+        writes = 0
+
+        def write(self, text):
+            self.writes += 1
+            return super().write(text)
+
+    file = File()
+    write_lines((f"line {i}" for i in range(100)), file=file, buffer_size=64)
+
+    assert file.getvalue() == "".join(f"line {i}\n" for i in range(100))
+    assert 1 < file.writes < 100
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import pytest
+
+from pycaro import ModuleChecker
+from pycaro.api.constants import ENGINE_IMPORT, ENGINE_STATIC
+from pycaro.api.files import BatchContext
+
+
+@pytest.mark.parametrize(
+    "file_path",
+    [
+        "tests/use_cases/assets/case_function.py",
+        "tests/use_cases/assets/case_simple_one_liner.py",
+        "tests/use_cases/assets/case_simple_var_in_main.py",
+    ],
+)
+def test_static_engine_same_as_import(file_path):
+    imported = ModuleChecker(file_path=Path(file_path), engine=ENGINE_IMPORT)
+    static = ModuleChecker(file_path=Path(file_path), engine=ENGINE_STATIC)
+
+    assert static.module_objects == imported.module_objects
+    assert sorted(
+        static.unstable_module_objects, key=lambda o: o.module_object
+    ) == sorted(imported.unstable_module_objects, key=lambda o: o.module_object)
+
+
+def test_static_engine_does_not_import(tmp_path):
+    module = tmp_path.joinpath("case_import_side_effect.py")
+    module.write_text(
+        "def do_something():\n"
+        "    print(var)\n"
+        "\n"
+        "\n"
+        'raise RuntimeError("This module must not be imported")\n'
+    )
+    m = ModuleChecker(
+        file_path=module,
+        engine=ENGINE_STATIC,
+        context=BatchContext(root=tmp_path.resolve()),
+    )
+
+    unstable_module_objects = list(m.unstable_module_objects)
+    assert len(unstable_module_objects) == 1
+    assert unstable_module_objects[0].module_object == "do_something"
+    assert unstable_module_objects[0].unstable_vars[0].var_name == "var"
+    assert unstable_module_objects[0].unstable_vars[0].first_oc_line_no == 2
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        ModuleChecker(
+            file_path=Path("tests/use_cases/assets/case_function.py"), engine="foo"
+        )